@@ -1,6 +1,7 @@
 import streamlit as st
 from utils.auth import register_user, authenticate_user
 from utils.database import query_db
+from utils.assets import hero_image
 
 def init_session_state():
     if "user_id" not in st.session_state:
@@ -20,7 +21,7 @@ def login_form():
                 st.session_state.user_id = user_id
                 st.session_state.authenticated = True
                 st.success("Login realizado com sucesso!")
-                st.experimental_rerun()
+                st.rerun()
             else:
                 st.error("Email ou senha incorretos")
 
@@ -56,7 +57,7 @@ def main():
     init_session_state()
     
     # Cabeçalho com imagem
-    st.image("https://images.pexels.com/photos/2294361/pexels-photo-2294361.jpeg", use_column_width=True)
+    hero_image("inicio")
     st.title("Sistema de Monitoramento do Atleta")
     
     if not st.session_state.authenticated:
@@ -75,7 +76,7 @@ def main():
         if st.sidebar.button("Sair"):
             st.session_state.authenticated = False
             st.session_state.user_id = None
-            st.experimental_rerun()
+            st.rerun()
         
         st.header("Dashboard Principal")
         
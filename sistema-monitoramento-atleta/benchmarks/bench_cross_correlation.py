@@ -0,0 +1,73 @@
+"""
+Benchmark da correlação defasada: laço por defasagem (pandas) contra a
+versão por FFT de utils.cross_correlation
+
+Gera séries sintéticas de carga e prontidão (com dias sem avaliação) para
+matrizes atletas x dias e compara o tempo e o resultado das duas versões.
+Não usa o banco de dados.
+
+Uso (a partir de sistema-monitoramento-atleta/):
+    python -m benchmarks.bench_cross_correlation --athletes 1 100 --days 365 3650
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from utils.cross_correlation import MIN_PAIRS, lagged_correlation
+
+def synthetic_series(athletes, days, missing_ratio=0.2, seed=0):
+    rng = np.random.default_rng(seed)
+    loads = rng.integers(60, 240, (athletes, days)) * rng.integers(1, 11, (athletes, days))
+    loads = loads.astype(float)
+    loads[rng.random((athletes, days)) < 0.3] = 0
+    # Prontidão responde à carga do dia anterior
+    readiness = np.full((athletes, days), np.nan)
+    readiness[:, 1:] = 8 - loads[:, :-1] / 400
+    readiness += rng.normal(0, 1, (athletes, days))
+    readiness[rng.random((athletes, days)) < missing_ratio] = np.nan
+    return loads, readiness
+
+def loop_correlation(loads, readiness, max_lag):
+    result = np.full((len(loads), max_lag + 1), np.nan)
+    for athlete, (x, y) in enumerate(zip(loads, readiness)):
+        for lag in range(max_lag + 1):
+            pairs = pd.DataFrame({'x': x[:len(x) - lag], 'y': y[lag:]}).dropna()
+            if len(pairs) >= MIN_PAIRS:
+                result[athlete, lag] = pairs['x'].corr(pairs['y'])
+    return result
+
+def run(athlete_counts, day_counts, max_lag=14):
+    """
+    Returns:
+        list: Tuplas (atletas, dias, ms laço, ms FFT, maior diferença)
+    """
+    results = []
+    for athletes in athlete_counts:
+        for days in day_counts:
+            loads, readiness = synthetic_series(athletes, days)
+
+            start = time.perf_counter()
+            expected = loop_correlation(loads, readiness, max_lag)
+            loop_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            correlation, _ = lagged_correlation(loads, readiness, max_lag)
+            fft_ms = (time.perf_counter() - start) * 1000
+
+            difference = float(np.nanmax(np.abs(correlation - expected)))
+            results.append((athletes, days, loop_ms, fft_ms, difference))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede a correlação defasada por FFT")
+    parser.add_argument("--athletes", type=int, nargs="+", default=[1, 100])
+    parser.add_argument("--days", type=int, nargs="+", default=[365, 3650])
+    parser.add_argument("--max-lag", type=int, default=14)
+    args = parser.parse_args(argv)
+
+    print(f"{'atletas':>8} {'dias':>6} {'laço (ms)':>10} {'FFT (ms)':>9} {'dif. máx.':>10}")
+    for athletes, days, loop_ms, fft_ms, difference in run(args.athletes, args.days, args.max_lag):
+        print(f"{athletes:>8} {days:>6} {loop_ms:>10.1f} {fft_ms:>9.2f} {difference:>10.1e}")
+
+if __name__ == "__main__":
+    main()
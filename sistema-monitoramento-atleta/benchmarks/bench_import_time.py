@@ -0,0 +1,88 @@
+"""
+Benchmark do tempo de importação de cada página (python -X importtime)
+
+Cada página é carregada em um processo novo, sem executar a função da página
+(só os imports e as definições, o que o Streamlit paga ao abrir a página
+pela primeira vez em um processo). O total é a soma do tempo próprio de cada
+módulo relatado por -X importtime; "extra" desconta a base comum a todas as
+páginas (streamlit e pandas). Como o total varia bastante entre execuções,
+a última coluna mostra à parte o tempo gasto nas dependências pesadas que
+deveriam ser importadas só sob demanda (exportação, login).
+
+Uso (a partir de sistema-monitoramento-atleta/):
+    python -m benchmarks.bench_import_time --repeat 5
+"""
+import argparse
+import glob
+import os
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = ["app.py"] + sorted(glob.glob(os.path.join("pages", "*.py"), root_dir=APP_DIR))
+BASELINE = "import streamlit, pandas"
+# plotly.graph_objects já é importado pelo próprio streamlit, por isso não entra aqui
+HEAVY_MODULES = ["reportlab", "xlsxwriter", "bcrypt", "jwt", "plotly.subplots", "matplotlib"]
+
+LOAD_PAGE = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("page", sys.argv[1])
+spec.loader.exec_module(importlib.util.module_from_spec(spec))
+"""
+
+def import_profile(code, *args):
+    """
+    Executa o código em um processo novo com -X importtime
+
+    Returns:
+        dict: {módulo: tempo próprio em microssegundos}
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *args],
+        cwd=APP_DIR, env={**os.environ, "PYTHONPATH": APP_DIR},
+        capture_output=True, text=True, check=True
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(self_us)
+    return modules
+
+def heavy_cost(modules):
+    """
+    Returns:
+        dict: {dependência pesada: ms gastos no pacote}, só as que foram importadas
+    """
+    costs = {}
+    for root in HEAVY_MODULES:
+        package = [us for name, us in modules.items() if name == root or name.startswith(root + ".")]
+        if package:
+            costs[root] = sum(package) / 1000
+    return costs
+
+def measure(code, *args, repeat=5):
+    """
+    Returns:
+        tuple: (menor total em ms entre as repetições, módulos dessa execução)
+    """
+    runs = [import_profile(code, *args) for _ in range(repeat)]
+    best = min(runs, key=lambda modules: sum(modules.values()))
+    return sum(best.values()) / 1000, best
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de importação de cada página")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    baseline, _ = measure(BASELINE, repeat=args.repeat)
+    print(f"base (streamlit + pandas): {baseline:.0f} ms\n")
+    print(f"{'página':<22} {'total (ms)':>10} {'extra (ms)':>10}  dependências pesadas (ms)")
+    for page in PAGES:
+        total, modules = measure(LOAD_PAGE, page, repeat=args.repeat)
+        heavy = ", ".join(f"{name} {ms:.0f}" for name, ms in heavy_cost(modules).items())
+        print(f"{os.path.basename(page):<22} {total:>10.0f} {total - baseline:>10.0f}  {heavy or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark das consultas das páginas antes e depois dos índices da migração 001
+
+Cria um schema temporário (bench_indexes) com cópias vazias das tabelas de
+avaliação, popula volumes crescentes de dados sintéticos e mede a mediana do
+tempo das consultas sem índice e com os índices de migrations/001.
+O schema é removido ao final.
+
+Uso (a partir de sistema-monitoramento-atleta/, com o esquema base criado):
+    python -m benchmarks.bench_indexes --sizes 10000 100000 1000000
+"""
+import argparse
+import statistics
+import time
+from datetime import date, timedelta
+from utils.database import connection
+from utils.migrations import MIGRATIONS_DIR
+
+SCHEMA = "bench_indexes"
+TABLES = [
+    "readiness_assessment", "training_assessment", "psychological_assessment",
+    "training_session", "goal"
+]
+INDEX_MIGRATION = MIGRATIONS_DIR / "001_assessment_indexes.sql"
+
+QUERIES = {
+    "histórico (LIMIT 10)": """
+        SELECT date, readiness_score, sleep_quality, energy_level, motivation
+        FROM readiness_assessment
+        WHERE user_id = %(user_id)s
+        ORDER BY date DESC
+        LIMIT 10
+    """,
+    "dashboard (30 dias)": """
+        SELECT date, training_load, rpe, fatigue_level
+        FROM training_assessment
+        WHERE user_id = %(user_id)s AND date >= %(since)s
+        ORDER BY date DESC
+    """,
+    "relatório (período)": """
+        SELECT date, depression_score, anxiety_score, stress_score,
+               intrinsic_motivation, confidence_level, emotional_state
+        FROM psychological_assessment
+        WHERE user_id = %(user_id)s AND date BETWEEN %(since)s AND %(until)s
+        ORDER BY date
+    """,
+}
+
+def _populate(cur, rows, athletes):
+    for table in TABLES[:3]:
+        cur.execute(f"TRUNCATE {table}")
+    # Cada atleta recebe uma avaliação por dia, retrocedendo a partir de hoje
+    cur.execute("""
+        INSERT INTO readiness_assessment
+            (user_id, date, sleep_quality, energy_level, motivation, readiness_score)
+        SELECT g %% %(athletes)s, CURRENT_DATE - (g / %(athletes)s),
+               1 + g %% 10, 1 + g %% 9, 1 + g %% 8, (g %% 100) / 10.0
+        FROM generate_series(0, %(rows)s - 1) AS g
+    """, {"rows": rows, "athletes": athletes})
+    cur.execute("""
+        INSERT INTO training_assessment (user_id, date, training_load, rpe, fatigue_level)
+        SELECT g %% %(athletes)s, CURRENT_DATE - (g / %(athletes)s),
+               (g %% 600)::float, 1 + g %% 10, 1 + g %% 7
+        FROM generate_series(0, %(rows)s - 1) AS g
+    """, {"rows": rows, "athletes": athletes})
+    cur.execute("""
+        INSERT INTO psychological_assessment
+            (user_id, date, depression_score, anxiety_score, stress_score,
+             intrinsic_motivation, confidence_level, emotional_state)
+        SELECT g %% %(athletes)s, CURRENT_DATE - (g / %(athletes)s),
+               1 + g %% 10, 1 + g %% 9, 1 + g %% 8, 1 + g %% 7, 1 + g %% 6, 1 + g %% 5
+        FROM generate_series(0, %(rows)s - 1) AS g
+    """, {"rows": rows, "athletes": athletes})
+    for table in TABLES[:3]:
+        cur.execute(f"VACUUM ANALYZE {table}")
+
+def _drop_indexes(cur):
+    cur.execute("""
+        SELECT indexname FROM pg_indexes
+        WHERE schemaname = %s AND indexname LIKE 'idx\\_%%'
+    """, (SCHEMA,))
+    for (name,) in cur.fetchall():
+        cur.execute(f"DROP INDEX {SCHEMA}.{name}")
+
+def _time_queries(cur, params, repeat):
+    timings = {}
+    for label, query in QUERIES.items():
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cur.execute(query, params)
+            cur.fetchall()
+            samples.append(time.perf_counter() - start)
+        timings[label] = statistics.median(samples) * 1000
+    return timings
+
+def run(sizes, athletes=200, repeat=20):
+    """
+    Returns:
+        list: Tuplas (linhas por tabela, consulta, ms sem índice, ms com índice)
+    """
+    results = []
+    params = {
+        "user_id": athletes // 2,
+        "since": date.today() - timedelta(days=30),
+        "until": date.today(),
+    }
+
+    with connection() as conn:
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                cur.execute(f"CREATE SCHEMA {SCHEMA}")
+                cur.execute(f"SET search_path TO {SCHEMA}")
+                for table in TABLES:
+                    # Sem INCLUDING DEFAULTS para não consumir as sequências de public
+                    cur.execute(f"CREATE TABLE {table} (LIKE public.{table})")
+                    cur.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP NOT NULL")
+
+                for rows in sizes:
+                    _drop_indexes(cur)
+                    _populate(cur, rows, athletes)
+                    before = _time_queries(cur, params, repeat)
+
+                    cur.execute(INDEX_MIGRATION.read_text(encoding="utf-8"))
+                    for table in TABLES[:3]:
+                        cur.execute(f"VACUUM ANALYZE {table}")
+                    after = _time_queries(cur, params, repeat)
+
+                    for label in QUERIES:
+                        results.append((rows, label, before[label], after[label]))
+        finally:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                cur.execute("RESET search_path")
+            conn.autocommit = False
+
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o efeito dos índices compostos (user_id, date)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--athletes", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{'linhas':>10}  {'consulta':<22} {'sem índice (ms)':>16} {'com índice (ms)':>16} {'ganho':>8}")
+    for rows, label, before, after in run(args.sizes, args.athletes, args.repeat):
+        speedup = before / after if after > 0 else float("inf")
+        print(f"{rows:>10}  {label:<22} {before:>16.2f} {after:>16.2f} {speedup:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
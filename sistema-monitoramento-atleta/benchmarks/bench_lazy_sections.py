@@ -0,0 +1,75 @@
+"""
+Benchmark da renderização sob demanda das seções (utils.layout)
+
+Executa cada página com streamlit.testing (AppTest), seleciona cada seção e
+lê o tempo medido por timed_section. Com st.tabs todas as seções eram
+executadas a cada rerun, então o custo anterior de um rerun é a soma das
+seções; agora é só o da seção visível.
+
+"fria" é a primeira visita à seção com o cache de dados vazio (inclui as
+consultas); "quente" é um rerun seguinte, já com os dados em cache.
+
+Uso (a partir de sistema-monitoramento-atleta/, com o banco configurado):
+    python -m benchmarks.bench_lazy_sections --user-id 1
+"""
+import argparse
+import os
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+from utils.layout import SECTION_TIMINGS_KEY
+
+PAGES = {
+    "pages/1_Prontidão.py": ("Prontidão", "readiness_section"),
+    "pages/2_Treino.py": ("Treino", "training_section"),
+    "pages/3_Psicológico.py": ("Psicológico", "psychological_section"),
+    "pages/4_Dashboard.py": ("Dashboard", "dashboard_section"),
+    "pages/5_Relatórios.py": ("Relatórios", "reports_section"),
+}
+
+def _section_ms(app, page, section):
+    return app.session_state[SECTION_TIMINGS_KEY][(page, section)]
+
+def measure_page(path, page, key, user_id):
+    """
+    Returns:
+        list: Tuplas (seção, ms fria, ms quente)
+    """
+    app = AppTest.from_file(os.path.abspath(path), default_timeout=120)
+    app.session_state['authenticated'] = True
+    app.session_state['user_id'] = user_id
+    app.run()
+    selector = next(radio for radio in app.radio if radio.key == key)
+
+    results = []
+    for section in selector.options:
+        st.cache_data.clear()
+        next(radio for radio in app.radio if radio.key == key).set_value(section).run()
+        cold = _section_ms(app, page, section)
+        app.run()
+        warm = _section_ms(app, page, section)
+        results.append((section, cold, warm))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede o tempo de cada seção das páginas por rerun")
+    parser.add_argument("--user-id", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    for path, (page, key) in PAGES.items():
+        results = measure_page(path, page, key, args.user_id)
+        print(f"\n{page}")
+        print(f"{'seção':<22} {'fria (ms)':>10} {'quente (ms)':>12}")
+        for section, cold, warm in results:
+            print(f"{section:<22} {cold:>10.1f} {warm:>12.1f}")
+
+        # Com abas, cada rerun pagava todas as seções; agora paga só a visível
+        eager_cold = sum(cold for _, cold, _ in results)
+        eager_warm = sum(warm for _, _, warm in results)
+        lazy_cold = sum(cold for _, cold, _ in results) / len(results)
+        lazy_warm = sum(warm for _, _, warm in results) / len(results)
+        print(f"{'todas (abas)':<22} {eager_cold:>10.1f} {eager_warm:>12.1f}")
+        print(f"{'economia por rerun':<22} {eager_cold - lazy_cold:>10.1f} {eager_warm - lazy_warm:>12.1f}"
+              "  (média sobre a seção visível)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark das métricas de carga: funções escalares de training_utils contra
+a versão vetorizada de utils.load_series
+
+Gera temporadas sintéticas (com dias de descanso), calcula carga aguda,
+crônica, ACWR, monotonia e strain de cada dia chamando as funções escalares
+janela a janela e compara com uma única passada de load_metrics_series.
+Não usa o banco de dados.
+
+Uso (a partir de sistema-monitoramento-atleta/):
+    python -m benchmarks.bench_load_metrics --days 365 3650 36500
+"""
+import argparse
+import time
+import numpy as np
+from utils.load_series import load_metrics_series
+from utils.training_utils import (
+    ACUTE_WINDOW_DAYS, CHRONIC_WINDOW_DAYS,
+    calculate_acute_load, calculate_chronic_load, calculate_acwr,
+    calculate_monotony, calculate_strain
+)
+
+def synthetic_season(days, rest_ratio=0.3, seed=0):
+    rng = np.random.default_rng(seed)
+    loads = rng.integers(60, 240, days) * rng.integers(1, 11, days)
+    loads[rng.random(days) < rest_ratio] = 0
+    return loads.astype(float)
+
+def scalar_metrics(loads):
+    # Uma janela por dia, no formato de lista de dicionários das funções originais
+    padded = [0.0] * (CHRONIC_WINDOW_DAYS - 1) + list(loads)
+    rows = []
+    for i in range(len(loads)):
+        chronic_days = [{'training_load': load} for load in padded[i:i + CHRONIC_WINDOW_DAYS]]
+        week = chronic_days[-ACUTE_WINDOW_DAYS:]
+        acute = calculate_acute_load(week)
+        # Média diária da janela completa (com zeros) vezes 7 = média semanal
+        chronic = calculate_chronic_load(chronic_days) * ACUTE_WINDOW_DAYS
+        monotony = calculate_monotony(week)
+        rows.append((acute, chronic, calculate_acwr(acute, chronic),
+                     monotony, calculate_strain(acute, monotony)))
+    return np.array(rows)
+
+def run(sizes, repeat=3):
+    """
+    Returns:
+        list: Tuplas (dias, ms escalar, ms vetorizado, maior diferença absoluta)
+    """
+    results = []
+    columns = ['acute_load', 'chronic_load', 'acwr', 'monotony', 'strain']
+    for days in sizes:
+        loads = synthetic_season(days)
+
+        scalar_times, vector_times = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            expected = scalar_metrics(loads)
+            scalar_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            actual = load_metrics_series(loads)[columns].to_numpy()
+            vector_times.append(time.perf_counter() - start)
+
+        # Diferença relativa à magnitude de cada métrica (strain chega a milhares)
+        scale = np.maximum(np.abs(expected), 1.0)
+        error = float(np.max(np.abs(actual - expected) / scale))
+        results.append((days, min(scalar_times) * 1000, min(vector_times) * 1000, error))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara as métricas de carga escalares e vetorizadas")
+    parser.add_argument("--days", type=int, nargs="+", default=[365, 3650, 36500])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'dias':>8} {'escalar (ms)':>14} {'vetorizado (ms)':>16} {'ganho':>8} {'erro rel.':>10}")
+    for days, scalar_ms, vector_ms, error in run(args.days, args.repeat):
+        speedup = scalar_ms / vector_ms if vector_ms > 0 else float("inf")
+        print(f"{days:>8} {scalar_ms:>14.1f} {vector_ms:>16.2f} {speedup:>7.0f}x {error:>10.1e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark do job noturno (utils.nightly) com diferentes números de processos
+
+Troca o bloco do job por uma versão sintética: as linhas do tempo são geradas
+em cada processo e nada é lido ou gravado no banco, de modo que o resultado
+mede o cálculo das métricas e o custo de distribuir os blocos entre processos.
+
+Uso (a partir de sistema-monitoramento-atleta/):
+    python -m benchmarks.bench_nightly --athletes 5000 --workers 1 2 4 8
+"""
+import argparse
+import os
+from datetime import date
+import numpy as np
+import pandas as pd
+from utils.nightly import CHUNK_SIZE, PSYCHOLOGICAL_COLUMNS, compute_chunk_rows, run_nightly
+from utils.training_utils import CHRONIC_WINDOW_DAYS
+
+def synthetic_timeline(user_ids, as_of):
+    """
+    Linhas do tempo sintéticas (determinísticas por bloco), para medir o job sem banco
+
+    Returns:
+        DataFrame: Mesmo formato de utils.nightly.BATCH_TIMELINE_QUERY para as colunas usadas
+    """
+    rng = np.random.default_rng(user_ids[0])
+    days = pd.date_range(end=pd.Timestamp(as_of), periods=CHRONIC_WINDOW_DAYS)
+    size = len(user_ids) * len(days)
+
+    def scores(missing):
+        values = rng.integers(1, 11, size).astype(float)
+        values[rng.random(size) < missing] = np.nan
+        return values
+
+    loads = (rng.integers(60, 240, size) * rng.integers(1, 11, size)).astype(float)
+    loads[rng.random(size) < 0.3] = 0
+    timeline = pd.DataFrame({
+        'user_id': np.repeat(user_ids, len(days)),
+        'date': np.tile(days, len(user_ids)),
+        'readiness_score': scores(0.2),
+        'training_load': loads,
+        'fatigue_level': np.where(loads > 0, scores(0), np.nan),
+    })
+    for column in PSYCHOLOGICAL_COLUMNS:
+        timeline[column] = scores(0.5)
+    return timeline
+
+def synthetic_chunk(user_ids, as_of):
+    # Substitui utils.nightly._process_chunk nos processos: mesmo cálculo, sem banco
+    return len(compute_chunk_rows(synthetic_timeline(user_ids, as_of), as_of))
+
+def run(athletes, worker_counts, chunk_size=CHUNK_SIZE):
+    """
+    Returns:
+        list: Tuplas (processos, segundos, atletas/s)
+    """
+    results = []
+    for workers in worker_counts:
+        result = run_nightly(date.today(), workers, chunk_size, athletes=list(range(1, athletes + 1)),
+                             process_chunk=synthetic_chunk)
+        results.append((workers, result['seconds'], result['rate']))
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede a escala do job noturno com o número de processos")
+    parser.add_argument("--athletes", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    print(f"{args.athletes} atletas sintéticos, {os.cpu_count()} CPU(s)")
+    print(f"{'processos':>9} {'tempo (s)':>10} {'atletas/s':>10} {'aceleração':>11}")
+    results = run(args.athletes, args.workers, args.chunk_size)
+    baseline = results[0][1]
+    for workers, seconds, rate in results:
+        print(f"{workers:>9} {seconds:>10.2f} {rate:>10.0f} {baseline / seconds:>10.2f}x")
+
+if __name__ == "__main__":
+    main()
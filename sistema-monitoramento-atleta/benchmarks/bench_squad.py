@@ -0,0 +1,128 @@
+"""
+Benchmark da tabela de equipe (utils.squad) com centenas de atletas
+
+Cria um schema temporário (bench_squad) com cópias vazias das tabelas, um
+squad com N atletas e um histórico diário sintético, e mede a mediana do
+tempo da consulta única (athlete_timeline via LATERAL) mais o cálculo
+vetorizado das métricas. O schema é removido ao final.
+
+Uso (a partir de sistema-monitoramento-atleta/, com as migrações aplicadas):
+    python -m benchmarks.bench_squad --athletes 100 500 1000
+"""
+import argparse
+import statistics
+import time
+from datetime import date
+from utils.database import _build_frame, connection
+from utils.migrations import MIGRATIONS_DIR
+from utils.squad import SQUAD_TIMELINE_QUERY, compute_squad_metrics
+from utils.training_utils import CHRONIC_WINDOW_DAYS
+
+SCHEMA = "bench_squad"
+TABLES = [
+    "athlete_users", "readiness_assessment", "training_assessment",
+    "psychological_assessment", "training_session", "goal",
+    "squad", "squad_member"
+]
+INDEX_MIGRATION = MIGRATIONS_DIR / "001_assessment_indexes.sql"
+
+def _populate(cur, athletes, days):
+    for table in TABLES:
+        cur.execute(f"TRUNCATE {table}")
+    cur.execute("""
+        INSERT INTO athlete_users (id, email, password_hash, name, is_admin)
+        SELECT g, 'atleta' || g || '@bench', '\\x00', 'Atleta ' || g, FALSE
+        FROM generate_series(1, %(athletes)s) AS g
+    """, {"athletes": athletes})
+    cur.execute("INSERT INTO squad (id, name, coach_id) VALUES (1, 'Bench', 1)")
+    cur.execute("""
+        INSERT INTO squad_member (squad_id, user_id, status)
+        SELECT 1, g, 'accepted' FROM generate_series(1, %(athletes)s) AS g
+    """, {"athletes": athletes})
+
+    # Uma avaliação por dia e atleta; cerca de 1 em 4 dias sem treino
+    history = """
+        FROM generate_series(1, %(athletes)s) AS a,
+             generate_series(0, %(days)s - 1) AS d
+    """
+    params = {"athletes": athletes, "days": days}
+    cur.execute(f"""
+        INSERT INTO readiness_assessment (user_id, date, sleep_quality, energy_level, readiness_score)
+        SELECT a, CURRENT_DATE - d, 1 + (a + d) %% 10, 1 + (a * d) %% 10, ((a + 3 * d) %% 100) / 10.0
+        {history}
+    """, params)
+    cur.execute(f"""
+        INSERT INTO training_assessment (user_id, date, training_load, rpe, fatigue_level)
+        SELECT a, CURRENT_DATE - d, ((a * 7 + d * 13) %% 600)::float, 1 + (a + d) %% 10, 1 + (a + 2 * d) %% 10
+        {history}
+        WHERE (a + d) %% 4 <> 0
+    """, params)
+    cur.execute(f"""
+        INSERT INTO psychological_assessment (user_id, date, anxiety_score, stress_score, confidence_level)
+        SELECT a, CURRENT_DATE - d, 1 + (a + d) %% 10, 1 + (a + 5 * d) %% 10, 1 + (a * 3 + d) %% 10
+        {history}
+    """, params)
+    for table in TABLES:
+        cur.execute(f"VACUUM ANALYZE {table}")
+
+def _time_squad(cur, repeat):
+    as_of = date.today()
+    start_date = date.fromordinal(as_of.toordinal() - (CHRONIC_WINDOW_DAYS - 1))
+    query_ms, metrics_ms = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cur.execute(SQUAD_TIMELINE_QUERY, (start_date, as_of, 1))
+        timeline = _build_frame(cur.description, cur.fetchall())
+        fetched = time.perf_counter()
+        compute_squad_metrics(timeline)
+        finished = time.perf_counter()
+        query_ms.append((fetched - start) * 1000)
+        metrics_ms.append((finished - fetched) * 1000)
+    return statistics.median(query_ms), statistics.median(metrics_ms)
+
+def run(sizes, days=120, repeat=5):
+    """
+    Returns:
+        list: Tuplas (atletas, ms da consulta, ms das métricas)
+    """
+    results = []
+    with connection() as conn:
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                cur.execute(f"CREATE SCHEMA {SCHEMA}")
+                # athlete_timeline (public) resolve as tabelas pelo search_path
+                cur.execute(f"SET search_path TO {SCHEMA}, public")
+                for table in TABLES:
+                    # Sem INCLUDING DEFAULTS para não consumir as sequências de public
+                    cur.execute(f"CREATE TABLE {SCHEMA}.{table} (LIKE public.{table})")
+                for table in TABLES[1:6]:
+                    cur.execute(f"ALTER TABLE {SCHEMA}.{table} ALTER COLUMN id DROP NOT NULL")
+                cur.execute(INDEX_MIGRATION.read_text(encoding="utf-8"))
+                cur.execute("ALTER TABLE squad_member ADD PRIMARY KEY (squad_id, user_id)")
+
+                for athletes in sizes:
+                    _populate(cur, athletes, days)
+                    query_ms, metrics_ms = _time_squad(cur, repeat)
+                    results.append((athletes, query_ms, metrics_ms))
+        finally:
+            with conn.cursor() as cur:
+                cur.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+                cur.execute("RESET search_path")
+            conn.autocommit = False
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mede a tabela de equipe para squads grandes")
+    parser.add_argument("--athletes", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'atletas':>8} {'consulta (ms)':>14} {'métricas (ms)':>14} {'total (ms)':>11}")
+    for athletes, query_ms, metrics_ms in run(args.athletes, args.days, args.repeat):
+        print(f"{athletes:>8} {query_ms:>14.1f} {metrics_ms:>14.1f} {query_ms + metrics_ms:>11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+-- Índices compostos (user_id, date DESC) para as consultas das páginas,
+-- que sempre filtram pelo atleta e ordenam/filtram pela data.
+-- As colunas em INCLUDE cobrem as consultas do Dashboard e dos históricos,
+-- permitindo index-only scans (PostgreSQL 11+).
+
+CREATE INDEX IF NOT EXISTS idx_readiness_assessment_user_date
+    ON readiness_assessment (user_id, date DESC)
+    INCLUDE (readiness_score, sleep_quality, energy_level, motivation);
+
+CREATE INDEX IF NOT EXISTS idx_training_assessment_user_date
+    ON training_assessment (user_id, date DESC)
+    INCLUDE (training_load, rpe, fatigue_level);
+
+CREATE INDEX IF NOT EXISTS idx_psychological_assessment_user_date
+    ON psychological_assessment (user_id, date DESC)
+    INCLUDE (stress_score, anxiety_score, confidence_level, emotional_state);
+
+CREATE INDEX IF NOT EXISTS idx_training_session_user_date
+    ON training_session (user_id, date DESC);
+
+-- goal não tem coluna date; o prazo da meta é target_date
+CREATE INDEX IF NOT EXISTS idx_goal_user_target_date
+    ON goal (user_id, target_date);
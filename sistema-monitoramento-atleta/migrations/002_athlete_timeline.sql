@@ -0,0 +1,106 @@
+-- Linha do tempo diária de um atleta, alinhada por data entre os três domínios.
+-- Cada dia do intervalo aparece uma única vez: métricas subjetivas são a média
+-- do dia (NULL se não houve avaliação) e a carga/duração de treino é a soma do
+-- dia (0 em dias de descanso).
+
+CREATE OR REPLACE FUNCTION athlete_timeline(p_user_id INTEGER, p_start DATE, p_end DATE)
+RETURNS TABLE (
+    date DATE,
+    readiness_score DOUBLE PRECISION,
+    sleep_quality DOUBLE PRECISION,
+    sleep_duration DOUBLE PRECISION,
+    stress_level DOUBLE PRECISION,
+    muscle_soreness DOUBLE PRECISION,
+    energy_level DOUBLE PRECISION,
+    motivation DOUBLE PRECISION,
+    nutrition_quality DOUBLE PRECISION,
+    hydration DOUBLE PRECISION,
+    training_sessions INTEGER,
+    training_load DOUBLE PRECISION,
+    training_duration DOUBLE PRECISION,
+    rpe DOUBLE PRECISION,
+    fatigue_level DOUBLE PRECISION,
+    performance_feeling DOUBLE PRECISION,
+    depression_score DOUBLE PRECISION,
+    anxiety_score DOUBLE PRECISION,
+    stress_score DOUBLE PRECISION,
+    intrinsic_motivation DOUBLE PRECISION,
+    extrinsic_motivation DOUBLE PRECISION,
+    amotivation DOUBLE PRECISION,
+    flow_score DOUBLE PRECISION,
+    confidence_level DOUBLE PRECISION,
+    focus_ability DOUBLE PRECISION,
+    emotional_state DOUBLE PRECISION,
+    pre_competition_anxiety DOUBLE PRECISION,
+    satisfaction_with_training DOUBLE PRECISION,
+    team_cohesion DOUBLE PRECISION
+)
+LANGUAGE sql STABLE AS $$
+    WITH days AS (
+        SELECT generate_series(p_start, p_end, INTERVAL '1 day')::date AS day
+    ),
+    readiness AS (
+        SELECT r.date AS day,
+               AVG(r.readiness_score) AS readiness_score,
+               AVG(r.sleep_quality) AS sleep_quality,
+               AVG(r.sleep_duration) AS sleep_duration,
+               AVG(r.stress_level) AS stress_level,
+               AVG(r.muscle_soreness) AS muscle_soreness,
+               AVG(r.energy_level) AS energy_level,
+               AVG(r.motivation) AS motivation,
+               AVG(r.nutrition_quality) AS nutrition_quality,
+               AVG(r.hydration) AS hydration
+        FROM readiness_assessment r
+        WHERE r.user_id = p_user_id AND r.date BETWEEN p_start AND p_end
+        GROUP BY r.date
+    ),
+    training AS (
+        SELECT t.date AS day,
+               COUNT(*) AS training_sessions,
+               SUM(t.training_load) AS training_load,
+               SUM(t.training_duration) AS training_duration,
+               AVG(t.rpe) AS rpe,
+               AVG(t.fatigue_level) AS fatigue_level,
+               AVG(t.performance_feeling) AS performance_feeling
+        FROM training_assessment t
+        WHERE t.user_id = p_user_id AND t.date BETWEEN p_start AND p_end
+        GROUP BY t.date
+    ),
+    psychological AS (
+        SELECT p.date AS day,
+               AVG(p.depression_score) AS depression_score,
+               AVG(p.anxiety_score) AS anxiety_score,
+               AVG(p.stress_score) AS stress_score,
+               AVG(p.intrinsic_motivation) AS intrinsic_motivation,
+               AVG(p.extrinsic_motivation) AS extrinsic_motivation,
+               AVG(p.amotivation) AS amotivation,
+               AVG(p.flow_score) AS flow_score,
+               AVG(p.confidence_level) AS confidence_level,
+               AVG(p.focus_ability) AS focus_ability,
+               AVG(p.emotional_state) AS emotional_state,
+               AVG(p.pre_competition_anxiety) AS pre_competition_anxiety,
+               AVG(p.satisfaction_with_training) AS satisfaction_with_training,
+               AVG(p.team_cohesion) AS team_cohesion
+        FROM psychological_assessment p
+        WHERE p.user_id = p_user_id AND p.date BETWEEN p_start AND p_end
+        GROUP BY p.date
+    )
+    SELECT d.day,
+           r.readiness_score, r.sleep_quality, r.sleep_duration, r.stress_level,
+           r.muscle_soreness, r.energy_level, r.motivation, r.nutrition_quality,
+           r.hydration,
+           COALESCE(t.training_sessions, 0)::integer,
+           COALESCE(t.training_load, 0),
+           COALESCE(t.training_duration, 0),
+           t.rpe, t.fatigue_level, t.performance_feeling,
+           p.depression_score, p.anxiety_score, p.stress_score,
+           p.intrinsic_motivation, p.extrinsic_motivation, p.amotivation,
+           p.flow_score, p.confidence_level, p.focus_ability,
+           p.emotional_state, p.pre_competition_anxiety,
+           p.satisfaction_with_training, p.team_cohesion
+    FROM days d
+    LEFT JOIN readiness r ON r.day = d.day
+    LEFT JOIN training t ON t.day = d.day
+    LEFT JOIN psychological p ON p.day = d.day
+    ORDER BY d.day
+$$;
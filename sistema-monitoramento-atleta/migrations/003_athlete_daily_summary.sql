@@ -0,0 +1,225 @@
+-- Resumo diário por atleta, mantido incrementalmente por triggers.
+-- Guarda somas e contagens (não médias) para que qualquer intervalo possa ser
+-- agregado de forma exata somando poucas linhas pré-agregadas.
+
+CREATE TABLE IF NOT EXISTS athlete_daily_summary (
+    user_id INTEGER NOT NULL REFERENCES athlete_users(id),
+    date DATE NOT NULL,
+    readiness_n INTEGER NOT NULL DEFAULT 0,
+    readiness_score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    readiness_score_n INTEGER NOT NULL DEFAULT 0,
+    sleep_quality_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    sleep_quality_n INTEGER NOT NULL DEFAULT 0,
+    energy_level_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    energy_level_n INTEGER NOT NULL DEFAULT 0,
+    training_sessions INTEGER NOT NULL DEFAULT 0,
+    training_load_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    training_duration_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    rpe_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    rpe_n INTEGER NOT NULL DEFAULT 0,
+    psychological_n INTEGER NOT NULL DEFAULT 0,
+    stress_score_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    stress_score_n INTEGER NOT NULL DEFAULT 0,
+    intrinsic_motivation_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    intrinsic_motivation_n INTEGER NOT NULL DEFAULT 0,
+    confidence_level_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+    confidence_level_n INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, date)
+);
+
+-- Recalcula a parte de cada domínio apenas para os dias (user_id, date) afetados
+
+CREATE OR REPLACE FUNCTION refresh_readiness_daily_summary(p_user_ids INTEGER[], p_dates DATE[])
+RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO athlete_daily_summary AS s (
+        user_id, date, readiness_n,
+        readiness_score_sum, readiness_score_n,
+        sleep_quality_sum, sleep_quality_n,
+        energy_level_sum, energy_level_n
+    )
+    SELECT k.user_id, k.date, COUNT(r.id),
+           COALESCE(SUM(r.readiness_score), 0), COUNT(r.readiness_score),
+           COALESCE(SUM(r.sleep_quality), 0), COUNT(r.sleep_quality),
+           COALESCE(SUM(r.energy_level), 0), COUNT(r.energy_level)
+    FROM unnest(p_user_ids, p_dates) AS k(user_id, date)
+    LEFT JOIN readiness_assessment r ON r.user_id = k.user_id AND r.date = k.date
+    GROUP BY k.user_id, k.date
+    ON CONFLICT (user_id, date) DO UPDATE SET
+        readiness_n = EXCLUDED.readiness_n,
+        readiness_score_sum = EXCLUDED.readiness_score_sum,
+        readiness_score_n = EXCLUDED.readiness_score_n,
+        sleep_quality_sum = EXCLUDED.sleep_quality_sum,
+        sleep_quality_n = EXCLUDED.sleep_quality_n,
+        energy_level_sum = EXCLUDED.energy_level_sum,
+        energy_level_n = EXCLUDED.energy_level_n,
+        updated_at = CURRENT_TIMESTAMP;
+END $$;
+
+CREATE OR REPLACE FUNCTION refresh_training_daily_summary(p_user_ids INTEGER[], p_dates DATE[])
+RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO athlete_daily_summary AS s (
+        user_id, date, training_sessions,
+        training_load_sum, training_duration_sum,
+        rpe_sum, rpe_n
+    )
+    SELECT k.user_id, k.date, COUNT(t.id),
+           COALESCE(SUM(t.training_load), 0), COALESCE(SUM(t.training_duration), 0),
+           COALESCE(SUM(t.rpe), 0), COUNT(t.rpe)
+    FROM unnest(p_user_ids, p_dates) AS k(user_id, date)
+    LEFT JOIN training_assessment t ON t.user_id = k.user_id AND t.date = k.date
+    GROUP BY k.user_id, k.date
+    ON CONFLICT (user_id, date) DO UPDATE SET
+        training_sessions = EXCLUDED.training_sessions,
+        training_load_sum = EXCLUDED.training_load_sum,
+        training_duration_sum = EXCLUDED.training_duration_sum,
+        rpe_sum = EXCLUDED.rpe_sum,
+        rpe_n = EXCLUDED.rpe_n,
+        updated_at = CURRENT_TIMESTAMP;
+END $$;
+
+CREATE OR REPLACE FUNCTION refresh_psychological_daily_summary(p_user_ids INTEGER[], p_dates DATE[])
+RETURNS void LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO athlete_daily_summary AS s (
+        user_id, date, psychological_n,
+        stress_score_sum, stress_score_n,
+        intrinsic_motivation_sum, intrinsic_motivation_n,
+        confidence_level_sum, confidence_level_n
+    )
+    SELECT k.user_id, k.date, COUNT(p.id),
+           COALESCE(SUM(p.stress_score), 0), COUNT(p.stress_score),
+           COALESCE(SUM(p.intrinsic_motivation), 0), COUNT(p.intrinsic_motivation),
+           COALESCE(SUM(p.confidence_level), 0), COUNT(p.confidence_level)
+    FROM unnest(p_user_ids, p_dates) AS k(user_id, date)
+    LEFT JOIN psychological_assessment p ON p.user_id = k.user_id AND p.date = k.date
+    GROUP BY k.user_id, k.date
+    ON CONFLICT (user_id, date) DO UPDATE SET
+        psychological_n = EXCLUDED.psychological_n,
+        stress_score_sum = EXCLUDED.stress_score_sum,
+        stress_score_n = EXCLUDED.stress_score_n,
+        intrinsic_motivation_sum = EXCLUDED.intrinsic_motivation_sum,
+        intrinsic_motivation_n = EXCLUDED.intrinsic_motivation_n,
+        confidence_level_sum = EXCLUDED.confidence_level_sum,
+        confidence_level_n = EXCLUDED.confidence_level_n,
+        updated_at = CURRENT_TIMESTAMP;
+END $$;
+
+CREATE OR REPLACE FUNCTION prune_daily_summary(p_user_ids INTEGER[], p_dates DATE[])
+RETURNS void LANGUAGE sql AS $$
+    DELETE FROM athlete_daily_summary s
+    USING unnest(p_user_ids, p_dates) AS k(user_id, date)
+    WHERE s.user_id = k.user_id AND s.date = k.date
+      AND s.readiness_n = 0 AND s.training_sessions = 0 AND s.psychological_n = 0;
+$$;
+
+-- Triggers por comando (não por linha): uma importação em lote recalcula cada
+-- dia afetado uma única vez. As tabelas de transição new_rows/old_rows trazem
+-- as linhas alteradas pelo comando.
+
+CREATE OR REPLACE FUNCTION trg_athlete_daily_summary()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    v_user_ids INTEGER[];
+    v_dates DATE[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (SELECT DISTINCT user_id, date FROM new_rows WHERE user_id IS NOT NULL) k;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (SELECT DISTINCT user_id, date FROM old_rows WHERE user_id IS NOT NULL) k;
+    ELSE
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (
+            SELECT user_id, date FROM new_rows WHERE user_id IS NOT NULL
+            UNION
+            SELECT user_id, date FROM old_rows WHERE user_id IS NOT NULL
+        ) k;
+    END IF;
+
+    IF v_user_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    IF TG_TABLE_NAME = 'readiness_assessment' THEN
+        PERFORM refresh_readiness_daily_summary(v_user_ids, v_dates);
+    ELSIF TG_TABLE_NAME = 'training_assessment' THEN
+        PERFORM refresh_training_daily_summary(v_user_ids, v_dates);
+    ELSE
+        PERFORM refresh_psychological_daily_summary(v_user_ids, v_dates);
+    END IF;
+    PERFORM prune_daily_summary(v_user_ids, v_dates);
+
+    RETURN NULL;
+END $$;
+
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY['readiness_assessment', 'training_assessment', 'psychological_assessment'] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', v_table || '_summary_ins', v_table);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', v_table || '_summary_upd', v_table);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON %I', v_table || '_summary_del', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON %I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION trg_athlete_daily_summary()',
+            v_table || '_summary_ins', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON %I REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION trg_athlete_daily_summary()',
+            v_table || '_summary_upd', v_table);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON %I REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION trg_athlete_daily_summary()',
+            v_table || '_summary_del', v_table);
+    END LOOP;
+END $$;
+
+-- Carga inicial a partir do histórico existente
+SELECT refresh_readiness_daily_summary(array_agg(user_id), array_agg(date))
+FROM (SELECT DISTINCT user_id, date FROM readiness_assessment WHERE user_id IS NOT NULL) k;
+SELECT refresh_training_daily_summary(array_agg(user_id), array_agg(date))
+FROM (SELECT DISTINCT user_id, date FROM training_assessment WHERE user_id IS NOT NULL) k;
+SELECT refresh_psychological_daily_summary(array_agg(user_id), array_agg(date))
+FROM (SELECT DISTINCT user_id, date FROM psychological_assessment WHERE user_id IS NOT NULL) k;
+
+-- Agregados semanais (semana iniciando na segunda-feira) e mensais
+CREATE OR REPLACE VIEW athlete_weekly_summary AS
+SELECT user_id, date_trunc('week', date)::date AS period_start,
+       SUM(readiness_n) AS readiness_n,
+       SUM(readiness_score_sum) AS readiness_score_sum, SUM(readiness_score_n) AS readiness_score_n,
+       SUM(sleep_quality_sum) AS sleep_quality_sum, SUM(sleep_quality_n) AS sleep_quality_n,
+       SUM(energy_level_sum) AS energy_level_sum, SUM(energy_level_n) AS energy_level_n,
+       SUM(training_sessions) AS training_sessions,
+       SUM(training_load_sum) AS training_load_sum,
+       SUM(training_duration_sum) AS training_duration_sum,
+       SUM(rpe_sum) AS rpe_sum, SUM(rpe_n) AS rpe_n,
+       SUM(psychological_n) AS psychological_n,
+       SUM(stress_score_sum) AS stress_score_sum, SUM(stress_score_n) AS stress_score_n,
+       SUM(intrinsic_motivation_sum) AS intrinsic_motivation_sum,
+       SUM(intrinsic_motivation_n) AS intrinsic_motivation_n,
+       SUM(confidence_level_sum) AS confidence_level_sum, SUM(confidence_level_n) AS confidence_level_n
+FROM athlete_daily_summary
+GROUP BY user_id, date_trunc('week', date);
+
+CREATE OR REPLACE VIEW athlete_monthly_summary AS
+SELECT user_id, date_trunc('month', date)::date AS period_start,
+       SUM(readiness_n) AS readiness_n,
+       SUM(readiness_score_sum) AS readiness_score_sum, SUM(readiness_score_n) AS readiness_score_n,
+       SUM(sleep_quality_sum) AS sleep_quality_sum, SUM(sleep_quality_n) AS sleep_quality_n,
+       SUM(energy_level_sum) AS energy_level_sum, SUM(energy_level_n) AS energy_level_n,
+       SUM(training_sessions) AS training_sessions,
+       SUM(training_load_sum) AS training_load_sum,
+       SUM(training_duration_sum) AS training_duration_sum,
+       SUM(rpe_sum) AS rpe_sum, SUM(rpe_n) AS rpe_n,
+       SUM(psychological_n) AS psychological_n,
+       SUM(stress_score_sum) AS stress_score_sum, SUM(stress_score_n) AS stress_score_n,
+       SUM(intrinsic_motivation_sum) AS intrinsic_motivation_sum,
+       SUM(intrinsic_motivation_n) AS intrinsic_motivation_n,
+       SUM(confidence_level_sum) AS confidence_level_sum, SUM(confidence_level_n) AS confidence_level_n
+FROM athlete_daily_summary
+GROUP BY user_id, date_trunc('month', date);
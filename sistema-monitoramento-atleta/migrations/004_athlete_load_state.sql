@@ -0,0 +1,28 @@
+-- Estado de carga por atleta para ACWR, monotonia e strain em O(1).
+-- daily_loads guarda a carga total de cada um dos últimos 28 dias, do mais
+-- recente (last_date) para o mais antigo; dias sem treino valem 0.
+
+CREATE TABLE IF NOT EXISTS athlete_load_state (
+    user_id INTEGER PRIMARY KEY REFERENCES athlete_users(id),
+    last_date DATE NOT NULL,
+    daily_loads DOUBLE PRECISION[] NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Carga inicial a partir do resumo diário (migrations/003)
+INSERT INTO athlete_load_state (user_id, last_date, daily_loads)
+SELECT m.user_id, m.last_date,
+       ARRAY(
+           SELECT COALESCE(s.training_load_sum, 0)
+           FROM generate_series(0, 27) AS k
+           LEFT JOIN athlete_daily_summary s
+                  ON s.user_id = m.user_id AND s.date = m.last_date - k
+           ORDER BY k
+       )
+FROM (
+    SELECT user_id, MAX(date) AS last_date
+    FROM athlete_daily_summary
+    WHERE training_sessions > 0
+    GROUP BY user_id
+) m
+ON CONFLICT (user_id) DO NOTHING;
@@ -0,0 +1,18 @@
+-- Equipes (squads) de atletas acompanhadas por um treinador
+
+CREATE TABLE IF NOT EXISTS squad (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    coach_id INTEGER NOT NULL REFERENCES athlete_users(id),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS squad_member (
+    squad_id INTEGER NOT NULL REFERENCES squad(id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES athlete_users(id),
+    joined_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (squad_id, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_squad_coach ON squad (coach_id);
+CREATE INDEX IF NOT EXISTS idx_squad_member_user ON squad_member (user_id);
@@ -0,0 +1,18 @@
+-- Momentos acumulados (Welford) por atleta, domínio e período, para
+-- matrizes de correlação em O(k²) sem reler o histórico.
+-- bucket é 'all' (histórico completo) ou o mês 'YYYY-MM'; comoments guarda a
+-- matriz k x k de somas de co-desvios, linha a linha, na ordem de columns.
+-- As linhas são criadas sob demanda por utils/moments.py (ou com
+-- python -m utils.moments --rebuild-all).
+
+CREATE TABLE IF NOT EXISTS assessment_moments (
+    user_id INTEGER NOT NULL REFERENCES athlete_users(id),
+    domain VARCHAR(32) NOT NULL,
+    bucket VARCHAR(7) NOT NULL,
+    columns TEXT[] NOT NULL,
+    n BIGINT NOT NULL DEFAULT 0,
+    means DOUBLE PRECISION[] NOT NULL,
+    comoments DOUBLE PRECISION[] NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, domain, bucket)
+);
@@ -0,0 +1,31 @@
+-- Linha de base por atleta e métrica para detectar quedas atípicas (utils/anomaly.py).
+-- mean e variance são médias móveis exponenciais, atualizadas a cada avaliação;
+-- n conta as avaliações já incorporadas (aquecimento da linha de base).
+-- As linhas são criadas por utils/anomaly.py na primeira leitura de cada
+-- atleta (ou com python -m utils.anomaly --rebuild-all).
+
+CREATE TABLE IF NOT EXISTS athlete_baseline (
+    user_id INTEGER NOT NULL REFERENCES athlete_users(id),
+    metric VARCHAR(50) NOT NULL,
+    n INTEGER NOT NULL DEFAULT 0,
+    mean DOUBLE PRECISION,
+    variance DOUBLE PRECISION,
+    last_date DATE,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, metric)
+);
+
+-- Avaliações sinalizadas, com a linha de base vigente antes de cada uma
+CREATE TABLE IF NOT EXISTS assessment_anomaly (
+    user_id INTEGER NOT NULL REFERENCES athlete_users(id),
+    metric VARCHAR(50) NOT NULL,
+    date DATE NOT NULL,
+    value DOUBLE PRECISION NOT NULL,
+    baseline_mean DOUBLE PRECISION NOT NULL,
+    baseline_std DOUBLE PRECISION NOT NULL,
+    z_score DOUBLE PRECISION NOT NULL,
+    PRIMARY KEY (user_id, metric, date)
+);
+
+CREATE INDEX IF NOT EXISTS idx_assessment_anomaly_user_date
+    ON assessment_anomaly (user_id, date);
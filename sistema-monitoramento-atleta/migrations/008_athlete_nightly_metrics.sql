@@ -0,0 +1,27 @@
+-- Métricas derivadas pré-calculadas por atleta e dia pelo job noturno
+-- (python -m utils.nightly). Cada bloco de atletas é gravado e confirmado
+-- separadamente: uma execução interrompida continua de onde parou.
+
+CREATE TABLE IF NOT EXISTS athlete_nightly_metrics (
+    user_id INTEGER NOT NULL REFERENCES athlete_users(id),
+    as_of DATE NOT NULL,
+    readiness_score DOUBLE PRECISION,
+    readiness_interpretation VARCHAR(50),
+    acute_load DOUBLE PRECISION,
+    chronic_load DOUBLE PRECISION,
+    acwr DOUBLE PRECISION,
+    acwr_zone VARCHAR(50),
+    monotony DOUBLE PRECISION,
+    strain DOUBLE PRECISION,
+    psychological_status VARCHAR(50),
+    stress_status VARCHAR(50),
+    next_training_type VARCHAR(50),
+    next_training_intensity VARCHAR(50),
+    next_training_duration INTEGER,
+    interventions TEXT[],
+    computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (user_id, as_of)
+);
+
+CREATE INDEX IF NOT EXISTS idx_athlete_nightly_metrics_as_of
+    ON athlete_nightly_metrics (as_of);
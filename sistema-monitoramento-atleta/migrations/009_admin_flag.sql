@@ -0,0 +1,5 @@
+-- Administradores veem o diagnóstico do banco em Configurações.
+-- Ninguém é administrador por padrão; conceda com:
+--     UPDATE athlete_users SET is_admin = TRUE WHERE email = '...';
+
+ALTER TABLE athlete_users ADD COLUMN IF NOT EXISTS is_admin BOOLEAN NOT NULL DEFAULT FALSE;
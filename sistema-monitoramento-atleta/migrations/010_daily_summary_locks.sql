@@ -0,0 +1,61 @@
+-- Serializa o recálculo do resumo diário por (user_id, date).
+-- Sem a trava, dois comandos concorrentes no mesmo dia recontam as linhas
+-- cada um com o seu snapshot, sem enxergar a linha ainda não confirmada do
+-- outro, e o último a gravar apaga a avaliação do primeiro. Com a trava, o
+-- segundo espera o primeiro confirmar e recalcula já vendo as duas linhas
+-- (cada comando do trigger usa um snapshot novo em READ COMMITTED).
+
+CREATE OR REPLACE FUNCTION lock_daily_summary_keys(p_user_ids INTEGER[], p_dates DATE[])
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    v_key INTEGER;
+BEGIN
+    -- Sempre na mesma ordem, para que lotes sobrepostos não entrem em deadlock
+    FOR v_key IN
+        SELECT DISTINCT hashtext(k.user_id::text || ':' || k.date::text) AS key
+        FROM unnest(p_user_ids, p_dates) AS k(user_id, date)
+        ORDER BY key
+    LOOP
+        PERFORM pg_advisory_xact_lock(v_key);
+    END LOOP;
+END $$;
+
+CREATE OR REPLACE FUNCTION trg_athlete_daily_summary()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    v_user_ids INTEGER[];
+    v_dates DATE[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (SELECT DISTINCT user_id, date FROM new_rows WHERE user_id IS NOT NULL) k;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (SELECT DISTINCT user_id, date FROM old_rows WHERE user_id IS NOT NULL) k;
+    ELSE
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (
+            SELECT user_id, date FROM new_rows WHERE user_id IS NOT NULL
+            UNION
+            SELECT user_id, date FROM old_rows WHERE user_id IS NOT NULL
+        ) k;
+    END IF;
+
+    IF v_user_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Liberada só no fim da transação
+    PERFORM lock_daily_summary_keys(v_user_ids, v_dates);
+
+    IF TG_TABLE_NAME = 'readiness_assessment' THEN
+        PERFORM refresh_readiness_daily_summary(v_user_ids, v_dates);
+    ELSIF TG_TABLE_NAME = 'training_assessment' THEN
+        PERFORM refresh_training_daily_summary(v_user_ids, v_dates);
+    ELSE
+        PERFORM refresh_psychological_daily_summary(v_user_ids, v_dates);
+    END IF;
+    PERFORM prune_daily_summary(v_user_ids, v_dates);
+
+    RETURN NULL;
+END $$;
@@ -0,0 +1,100 @@
+-- Estado de carga (migrations/004) mantido pelo mesmo trigger do resumo diário.
+-- Antes a página de treino atualizava athlete_load_state em outra transação,
+-- depois do INSERT já confirmado: uma falha ali deixava o treino gravado sem
+-- carga, e importações e exclusões dependiam de uma reconstrução manual.
+-- Agora qualquer comando em training_assessment recalcula, na mesma
+-- transação, a janela de 28 dias dos atletas afetados a partir do resumo
+-- diário (28 leituras por atleta, sem depender do tamanho do histórico).
+-- Atletas sem nenhum treino restante perdem a linha de estado.
+
+CREATE OR REPLACE FUNCTION refresh_load_state(p_user_ids INTEGER[])
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    v_user_id INTEGER;
+BEGIN
+    -- Um recálculo por atleta de cada vez: o segundo espera o primeiro
+    -- confirmar e já lê o resumo diário atualizado por ele
+    FOR v_user_id IN SELECT DISTINCT u FROM unnest(p_user_ids) AS u ORDER BY u LOOP
+        PERFORM pg_advisory_xact_lock(hashtext('athlete_load_state'), v_user_id);
+    END LOOP;
+
+    DELETE FROM athlete_load_state st
+    WHERE st.user_id = ANY(p_user_ids)
+      AND NOT EXISTS (
+          SELECT 1 FROM athlete_daily_summary s
+          WHERE s.user_id = st.user_id AND s.training_sessions > 0
+      );
+
+    INSERT INTO athlete_load_state (user_id, last_date, daily_loads, updated_at)
+    SELECT m.user_id, m.last_date,
+           ARRAY(
+               SELECT COALESCE(s.training_load_sum, 0)
+               FROM generate_series(0, 27) AS k
+               LEFT JOIN athlete_daily_summary s
+                      ON s.user_id = m.user_id AND s.date = m.last_date - k
+               ORDER BY k
+           ),
+           CURRENT_TIMESTAMP
+    FROM (
+        SELECT user_id, MAX(date) AS last_date
+        FROM athlete_daily_summary
+        WHERE user_id = ANY(p_user_ids) AND training_sessions > 0
+        GROUP BY user_id
+    ) m
+    ON CONFLICT (user_id) DO UPDATE SET
+        last_date = EXCLUDED.last_date,
+        daily_loads = EXCLUDED.daily_loads,
+        updated_at = EXCLUDED.updated_at;
+END $$;
+
+CREATE OR REPLACE FUNCTION trg_athlete_daily_summary()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    v_user_ids INTEGER[];
+    v_dates DATE[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (SELECT DISTINCT user_id, date FROM new_rows WHERE user_id IS NOT NULL) k;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (SELECT DISTINCT user_id, date FROM old_rows WHERE user_id IS NOT NULL) k;
+    ELSE
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (
+            SELECT user_id, date FROM new_rows WHERE user_id IS NOT NULL
+            UNION
+            SELECT user_id, date FROM old_rows WHERE user_id IS NOT NULL
+        ) k;
+    END IF;
+
+    IF v_user_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Liberada só no fim da transação (migrations/010)
+    PERFORM lock_daily_summary_keys(v_user_ids, v_dates);
+
+    IF TG_TABLE_NAME = 'readiness_assessment' THEN
+        PERFORM refresh_readiness_daily_summary(v_user_ids, v_dates);
+    ELSIF TG_TABLE_NAME = 'training_assessment' THEN
+        PERFORM refresh_training_daily_summary(v_user_ids, v_dates);
+    ELSE
+        PERFORM refresh_psychological_daily_summary(v_user_ids, v_dates);
+    END IF;
+    PERFORM prune_daily_summary(v_user_ids, v_dates);
+
+    -- O estado de carga lê o resumo diário, por isso vem depois dele
+    IF TG_TABLE_NAME = 'training_assessment' THEN
+        PERFORM refresh_load_state(v_user_ids);
+    END IF;
+
+    RETURN NULL;
+END $$;
+
+-- Alinha os estados existentes, incluindo os de atletas sem treinos restantes
+SELECT refresh_load_state(ARRAY(
+    SELECT user_id FROM athlete_load_state
+    UNION
+    SELECT user_id FROM athlete_daily_summary WHERE training_sessions > 0
+));
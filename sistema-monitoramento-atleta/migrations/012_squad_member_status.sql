@@ -0,0 +1,8 @@
+-- Convites de equipe: o treinador convida pelo email e o atleta só entra na
+-- equipe (e tem seus dados exibidos ao treinador) depois de aceitar.
+-- Vínculos criados antes desta migração não tiveram consentimento e voltam a
+-- ser convites pendentes.
+
+ALTER TABLE squad_member ADD COLUMN IF NOT EXISTS status VARCHAR(20) NOT NULL DEFAULT 'pending'
+    CHECK (status IN ('pending', 'accepted'));
+ALTER TABLE squad_member ADD COLUMN IF NOT EXISTS accepted_at TIMESTAMP;
@@ -0,0 +1,127 @@
+-- Último dia de treino do estado de carga (migrations/011) sem reler o histórico.
+-- Antes, cada comando em training_assessment recalculava last_date com
+-- MAX(date) ... GROUP BY user_id sobre todo o resumo diário do atleta, o que
+-- cresce com o histórico. Agora o trigger passa os dias tocados: last_date é
+-- o maior entre o já guardado e os dias tocados que ainda têm treino. Só
+-- quando o comando remove o treino do último dia (ou o atleta ainda não tem
+-- estado) o dia é buscado com ORDER BY date DESC LIMIT 1, que percorre a
+-- chave (user_id, date) a partir do fim. A janela continua sendo 28 leituras.
+-- Sem p_dates (reparos manuais em utils/load_state.py), faz sempre a busca.
+
+DROP FUNCTION IF EXISTS refresh_load_state(INTEGER[]);
+
+CREATE OR REPLACE FUNCTION refresh_load_state(p_user_ids INTEGER[], p_dates DATE[] DEFAULT NULL)
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    v_user_id INTEGER;
+    v_last_date DATE;
+    v_touched_last DATE;
+    v_lost_last BOOLEAN;
+BEGIN
+    -- Um recálculo por atleta de cada vez: o segundo espera o primeiro
+    -- confirmar e já lê o resumo diário atualizado por ele
+    FOR v_user_id IN SELECT DISTINCT u FROM unnest(p_user_ids) AS u ORDER BY u LOOP
+        PERFORM pg_advisory_xact_lock(hashtext('athlete_load_state'), v_user_id);
+    END LOOP;
+
+    FOR v_user_id IN SELECT DISTINCT u FROM unnest(p_user_ids) AS u ORDER BY u LOOP
+        SELECT last_date INTO v_last_date FROM athlete_load_state WHERE user_id = v_user_id;
+        v_touched_last := NULL;
+        v_lost_last := TRUE;
+
+        IF p_dates IS NOT NULL AND v_last_date IS NOT NULL THEN
+            SELECT MAX(k.date) INTO v_touched_last
+            FROM unnest(p_user_ids, p_dates) AS k(user_id, date)
+            JOIN athlete_daily_summary s ON s.user_id = k.user_id AND s.date = k.date
+            WHERE k.user_id = v_user_id AND s.training_sessions > 0;
+
+            -- O último dia guardado só deixa de valer se foi tocado e perdeu o treino
+            v_lost_last := EXISTS (
+                SELECT 1 FROM unnest(p_user_ids, p_dates) AS k(user_id, date)
+                WHERE k.user_id = v_user_id AND k.date = v_last_date
+            ) AND NOT EXISTS (
+                SELECT 1 FROM athlete_daily_summary s
+                WHERE s.user_id = v_user_id AND s.date = v_last_date AND s.training_sessions > 0
+            );
+        END IF;
+
+        IF v_lost_last THEN
+            SELECT s.date INTO v_last_date
+            FROM athlete_daily_summary s
+            WHERE s.user_id = v_user_id AND s.training_sessions > 0
+            ORDER BY s.date DESC
+            LIMIT 1;
+        ELSE
+            v_last_date := GREATEST(v_last_date, v_touched_last);
+        END IF;
+
+        -- Atletas sem nenhum treino restante perdem a linha de estado
+        IF v_last_date IS NULL THEN
+            DELETE FROM athlete_load_state WHERE user_id = v_user_id;
+            CONTINUE;
+        END IF;
+
+        INSERT INTO athlete_load_state (user_id, last_date, daily_loads, updated_at)
+        VALUES (
+            v_user_id, v_last_date,
+            ARRAY(
+                SELECT COALESCE(s.training_load_sum, 0)
+                FROM generate_series(0, 27) AS k
+                LEFT JOIN athlete_daily_summary s
+                       ON s.user_id = v_user_id AND s.date = v_last_date - k
+                ORDER BY k
+            ),
+            CURRENT_TIMESTAMP
+        )
+        ON CONFLICT (user_id) DO UPDATE SET
+            last_date = EXCLUDED.last_date,
+            daily_loads = EXCLUDED.daily_loads,
+            updated_at = EXCLUDED.updated_at;
+    END LOOP;
+END $$;
+
+CREATE OR REPLACE FUNCTION trg_athlete_daily_summary()
+RETURNS trigger LANGUAGE plpgsql AS $$
+DECLARE
+    v_user_ids INTEGER[];
+    v_dates DATE[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (SELECT DISTINCT user_id, date FROM new_rows WHERE user_id IS NOT NULL) k;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (SELECT DISTINCT user_id, date FROM old_rows WHERE user_id IS NOT NULL) k;
+    ELSE
+        SELECT array_agg(user_id), array_agg(date) INTO v_user_ids, v_dates
+        FROM (
+            SELECT user_id, date FROM new_rows WHERE user_id IS NOT NULL
+            UNION
+            SELECT user_id, date FROM old_rows WHERE user_id IS NOT NULL
+        ) k;
+    END IF;
+
+    IF v_user_ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Liberada só no fim da transação (migrations/010)
+    PERFORM lock_daily_summary_keys(v_user_ids, v_dates);
+
+    IF TG_TABLE_NAME = 'readiness_assessment' THEN
+        PERFORM refresh_readiness_daily_summary(v_user_ids, v_dates);
+    ELSIF TG_TABLE_NAME = 'training_assessment' THEN
+        PERFORM refresh_training_daily_summary(v_user_ids, v_dates);
+    ELSE
+        PERFORM refresh_psychological_daily_summary(v_user_ids, v_dates);
+    END IF;
+    PERFORM prune_daily_summary(v_user_ids, v_dates);
+
+    -- O estado de carga lê o resumo diário, por isso vem depois dele; os dias
+    -- tocados dispensam a busca do último dia de treino
+    IF TG_TABLE_NAME = 'training_assessment' THEN
+        PERFORM refresh_load_state(v_user_ids, v_dates);
+    END IF;
+
+    RETURN NULL;
+END $$;
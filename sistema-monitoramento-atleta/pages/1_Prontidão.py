@@ -1,8 +1,12 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
-from utils.database import query_db
+from utils.database import connection, invalidate_cache
 from utils.readiness_utils import calculate_readiness_score, interpret_readiness_score
+from utils.moments import CORRELATION_WINDOWS, record_assessment_moments
+from utils.anomaly import describe_anomaly, record_assessment_anomalies
+from utils import page_data
+from utils.layout import section_selector, timed_section
+from utils.assets import hero_image
 
 def check_authentication():
     if "authenticated" not in st.session_state or not st.session_state.authenticated:
@@ -18,113 +22,136 @@ def save_readiness_assessment(data):
     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
     """
     try:
-        query_db(query, (
-            st.session_state.user_id,
-            data['date'],
-            data['sleep_quality'],
-            data['sleep_duration'],
-            data['stress_level'],
-            data['muscle_soreness'],
-            data['energy_level'],
-            data['motivation'],
-            data['nutrition_quality'],
-            data['hydration'],
-            data['readiness_score'],
-            data['notes']
-        ))
+        with connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (
+                    st.session_state.user_id,
+                    data['date'],
+                    data['sleep_quality'],
+                    data['sleep_duration'],
+                    data['stress_level'],
+                    data['muscle_soreness'],
+                    data['energy_level'],
+                    data['motivation'],
+                    data['nutrition_quality'],
+                    data['hydration'],
+                    data['readiness_score'],
+                    data['notes']
+                ))
+                # Momentos e linha de base na mesma transação do INSERT: a avaliação nunca fica sem eles
+                record_assessment_moments(cur, st.session_state.user_id, 'readiness', data)
+                flags = record_assessment_anomalies(cur, st.session_state.user_id, 'readiness', data)
+            conn.commit()
+        invalidate_cache('readiness_assessment', st.session_state.user_id)
+        page_data.invalidate(st.session_state.user_id)
+        # Comparação com a linha de base do próprio atleta
+        for flag in flags:
+            st.warning(describe_anomaly(flag))
         return True
     except Exception as e:
         st.error(f"Erro ao salvar avaliação: {str(e)}")
         return False
 
 def get_user_assessments():
-    query = """
-    SELECT date, readiness_score, sleep_quality, energy_level, motivation
-    FROM readiness_assessment
-    WHERE user_id = %s
-    ORDER BY date DESC
-    LIMIT 10
-    """
-    return query_db(query, (st.session_state.user_id,))
+    # Em cache por atleta: as seções e os reruns dos widgets não voltam ao banco
+    return page_data.readiness_history(st.session_state.user_id)
 
-def prontidao_page():
-    check_authentication()
-    
-    st.image("https://images.pexels.com/photos/864939/pexels-photo-864939.jpeg", use_column_width=True)
-    st.title("Módulo de Prontidão")
-    
-    tab1, tab2, tab3 = st.tabs(["Nova Avaliação", "Histórico", "Análise"])
-    
-    with tab1:
-        st.subheader("Nova Avaliação de Prontidão")
-        with st.form("readiness_form"):
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                date = st.date_input("Data", datetime.now())
-                sleep_quality = st.slider("Qualidade do Sono (1-10)", 1, 10, 5)
-                sleep_duration = st.number_input("Duração do Sono (horas)", 0, 24, 8)
-                stress_level = st.slider("Nível de Estresse (1-10)", 1, 10, 5)
-                muscle_soreness = st.slider("Dor Muscular (1-10)", 1, 10, 5)
-            
-            with col2:
-                energy_level = st.slider("Nível de Energia (1-10)", 1, 10, 5)
-                motivation = st.slider("Motivação (1-10)", 1, 10, 5)
-                nutrition_quality = st.slider("Qualidade da Nutrição (1-10)", 1, 10, 5)
-                hydration = st.slider("Hidratação (1-10)", 1, 10, 5)
+@st.fragment
+def readiness_form():
+    # Fragmento: enviar o formulário reexecuta só este bloco, não a página
+    st.subheader("Nova Avaliação de Prontidão")
+    with st.form("readiness_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            date = st.date_input("Data", datetime.now())
+            sleep_quality = st.slider("Qualidade do Sono (1-10)", 1, 10, 5)
+            sleep_duration = st.number_input("Duração do Sono (horas)", 0, 24, 8)
+            stress_level = st.slider("Nível de Estresse (1-10)", 1, 10, 5)
+            muscle_soreness = st.slider("Dor Muscular (1-10)", 1, 10, 5)
+        
+        with col2:
+            energy_level = st.slider("Nível de Energia (1-10)", 1, 10, 5)
+            motivation = st.slider("Motivação (1-10)", 1, 10, 5)
+            nutrition_quality = st.slider("Qualidade da Nutrição (1-10)", 1, 10, 5)
+            hydration = st.slider("Hidratação (1-10)", 1, 10, 5)
+        
+        notes = st.text_area("Observações")
+        submit = st.form_submit_button("Salvar Avaliação")
+        
+        if submit:
+            data = {
+                'date': date,
+                'sleep_quality': sleep_quality,
+                'sleep_duration': sleep_duration,
+                'stress_level': stress_level,
+                'muscle_soreness': muscle_soreness,
+                'energy_level': energy_level,
+                'motivation': motivation,
+                'nutrition_quality': nutrition_quality,
+                'hydration': hydration,
+                'notes': notes
+            }
             
-            notes = st.text_area("Observações")
-            submit = st.form_submit_button("Salvar Avaliação")
+            # Calcular score de prontidão
+            data['readiness_score'] = calculate_readiness_score(data)
             
-            if submit:
-                data = {
-                    'date': date,
-                    'sleep_quality': sleep_quality,
-                    'sleep_duration': sleep_duration,
-                    'stress_level': stress_level,
-                    'muscle_soreness': muscle_soreness,
-                    'energy_level': energy_level,
-                    'motivation': motivation,
-                    'nutrition_quality': nutrition_quality,
-                    'hydration': hydration,
-                    'notes': notes
-                }
-                
-                # Calcular score de prontidão
-                data['readiness_score'] = calculate_readiness_score(data)
+            if save_readiness_assessment(data):
+                st.success("Avaliação salva com sucesso!")
+                st.markdown(f"### Score de Prontidão: {data['readiness_score']:.1f}/10")
+                st.info(f"Interpretação: {interpret_readiness_score(data['readiness_score'])}")
+    
+    # Histórico recente no mesmo fragmento: após salvar, é atualizado sem reexecutar a página
+    recent = get_user_assessments()
+    if not recent.empty:
+        st.markdown("### Últimas Avaliações")
+        st.dataframe(recent.head(5))
+
+@st.fragment
+def readiness_sections():
+    # Fragmento: trocar de seção ou mexer nos widgets dela não reexecuta o cabeçalho
+    # Só a seção visível é executada (st.tabs executaria todas a cada rerun)
+    section = section_selector(["Nova Avaliação", "Histórico", "Análise"], key="readiness_section")
+    
+    with timed_section("Prontidão", section):
+        if section == "Nova Avaliação":
+            readiness_form()
+        elif section == "Histórico":
+            st.subheader("Histórico de Avaliações")
+            df = get_user_assessments()
+            if not df.empty:
+                st.line_chart(df.set_index('date')['readiness_score'])
+                st.dataframe(df)
+            else:
+                st.info("Nenhuma avaliação registrada ainda.")
+        
+        elif section == "Análise":
+            st.subheader("Análise de Tendências")
+            df = get_user_assessments()
+            if not df.empty:
+                st.markdown("### Correlações")
+                # Correlações a partir dos momentos acumulados, sem reler o histórico
+                window = st.selectbox("Período", list(CORRELATION_WINDOWS), key="readiness_correlation_window")
+                correlations = page_data.correlation_matrix(
+                    st.session_state.user_id, 'readiness', CORRELATION_WINDOWS[window], datetime.now().date()
+                )
+                st.write("Correlação entre diferentes métricas:")
+                st.write(correlations)
+                st.caption(f"Baseado em {correlations.attrs['n']} avaliações completas")
                 
-                if save_readiness_assessment(data):
-                    st.success("Avaliação salva com sucesso!")
-                    st.markdown(f"### Score de Prontidão: {data['readiness_score']:.1f}/10")
-                    st.info(f"Interpretação: {interpret_readiness_score(data['readiness_score'])}")
+                st.markdown("### Médias Semanais")
+                weekly_avg = df.resample('W', on='date')['readiness_score'].mean()
+                st.line_chart(weekly_avg)
+            else:
+                st.info("Dados insuficientes para análise.")
+
+def prontidao_page():
+    check_authentication()
     
-    with tab2:
-        st.subheader("Histórico de Avaliações")
-        assessments = get_user_assessments()
-        if assessments:
-            df = pd.DataFrame(assessments)
-            st.line_chart(df.set_index('date')['readiness_score'])
-            st.dataframe(df)
-        else:
-            st.info("Nenhuma avaliação registrada ainda.")
+    hero_image("prontidao")
+    st.title("Módulo de Prontidão")
     
-    with tab3:
-        st.subheader("Análise de Tendências")
-        assessments = get_user_assessments()
-        if assessments:
-            df = pd.DataFrame(assessments)
-            
-            st.markdown("### Correlações")
-            correlation_data = df[['sleep_quality', 'energy_level', 'motivation', 'readiness_score']]
-            st.write("Correlação entre diferentes métricas:")
-            st.write(correlation_data.corr())
-            
-            st.markdown("### Médias Semanais")
-            df['date'] = pd.to_datetime(df['date'])
-            weekly_avg = df.resample('W', on='date')['readiness_score'].mean()
-            st.line_chart(weekly_avg)
-        else:
-            st.info("Dados insuficientes para análise.")
+    readiness_sections()
 
 if __name__ == "__main__":
     prontidao_page()
@@ -1,8 +1,12 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime
-from utils.database import query_db
+from datetime import datetime, timedelta
+from utils.database import connection, invalidate_cache
 from utils.training_utils import calculate_training_load
+from utils.moments import CORRELATION_WINDOWS, record_assessment_moments
+from utils.anomaly import describe_anomaly, record_assessment_anomalies
+from utils import page_data
+from utils.layout import section_selector, timed_section
+from utils.assets import hero_image
 
 def check_authentication():
     if "authenticated" not in st.session_state or not st.session_state.authenticated:
@@ -17,134 +21,170 @@ def save_training_assessment(data):
     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
     """
     try:
-        query_db(query, (
-            st.session_state.user_id,
-            data['date'],
-            data['training_load'],
-            data['training_duration'],
-            data['rpe'],
-            data['intensity_zone'],
-            data['training_type'],
-            data['fatigue_level'],
-            data['performance_feeling'],
-            data['notes']
-        ))
+        with connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (
+                    st.session_state.user_id,
+                    data['date'],
+                    data['training_load'],
+                    data['training_duration'],
+                    data['rpe'],
+                    data['intensity_zone'],
+                    data['training_type'],
+                    data['fatigue_level'],
+                    data['performance_feeling'],
+                    data['notes']
+                ))
+                # Momentos e linha de base na mesma transação do INSERT: a avaliação nunca fica sem eles
+                record_assessment_moments(cur, st.session_state.user_id, 'training', data)
+                flags = record_assessment_anomalies(cur, st.session_state.user_id, 'training', data)
+            conn.commit()
+        invalidate_cache('training_assessment', st.session_state.user_id)
+        page_data.invalidate(st.session_state.user_id)
+        # Comparação com a linha de base do próprio atleta
+        for flag in flags:
+            st.warning(describe_anomaly(flag))
         return True
     except Exception as e:
         st.error(f"Erro ao salvar treino: {str(e)}")
         return False
 
 def get_user_training_history():
-    query = """
-    SELECT date, training_load, training_duration, rpe, training_type, fatigue_level
-    FROM training_assessment
-    WHERE user_id = %s
-    ORDER BY date DESC
-    LIMIT 10
-    """
-    return query_db(query, (st.session_state.user_id,))
+    # Em cache por atleta: as seções e os reruns dos widgets não voltam ao banco
+    return page_data.training_history(st.session_state.user_id)
 
-def treino_page():
-    check_authentication()
-    
-    st.image("https://images.pexels.com/photos/841130/pexels-photo-841130.jpeg", use_column_width=True)
-    st.title("Módulo de Treino")
-    
-    tab1, tab2, tab3 = st.tabs(["Novo Treino", "Histórico", "Análise"])
-    
-    with tab1:
-        st.subheader("Registro de Treino")
-        with st.form("training_form"):
-            col1, col2 = st.columns(2)
+@st.fragment
+def training_form():
+    # Fragmento: enviar o formulário reexecuta só este bloco, não a página
+    st.subheader("Registro de Treino")
+    with st.form("training_form"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            date = st.date_input("Data", datetime.now())
+            training_type = st.selectbox(
+                "Tipo de Treino",
+                ["Força", "Resistência", "Velocidade", "Técnico", "Tático", "Recuperação"]
+            )
+            training_duration = st.number_input("Duração (minutos)", 0, 480, 60)
+            rpe = st.slider("Percepção de Esforço (RPE) (1-10)", 1, 10, 5)
+        
+        with col2:
+            intensity_zone = st.selectbox(
+                "Zona de Intensidade",
+                ["Z1 - Recuperação", "Z2 - Base", "Z3 - Moderado", "Z4 - Limiar", "Z5 - Máximo"]
+            )
+            fatigue_level = st.slider("Nível de Fadiga (1-10)", 1, 10, 5)
+            performance_feeling = st.slider("Sensação de Performance (1-10)", 1, 10, 5)
+        
+        notes = st.text_area("Observações do Treino")
+        submit = st.form_submit_button("Salvar Treino")
+        
+        if submit:
+            # Calcular carga de treino (Training Load)
+            training_load = calculate_training_load(training_duration, rpe)
             
-            with col1:
-                date = st.date_input("Data", datetime.now())
-                training_type = st.selectbox(
-                    "Tipo de Treino",
-                    ["Força", "Resistência", "Velocidade", "Técnico", "Tático", "Recuperação"]
-                )
-                training_duration = st.number_input("Duração (minutos)", 0, 480, 60)
-                rpe = st.slider("Percepção de Esforço (RPE) (1-10)", 1, 10, 5)
+            data = {
+                'date': date,
+                'training_type': training_type,
+                'training_duration': training_duration,
+                'rpe': rpe,
+                'intensity_zone': intensity_zone,
+                'fatigue_level': fatigue_level,
+                'performance_feeling': performance_feeling,
+                'training_load': training_load,
+                'notes': notes
+            }
             
-            with col2:
-                intensity_zone = st.selectbox(
-                    "Zona de Intensidade",
-                    ["Z1 - Recuperação", "Z2 - Base", "Z3 - Moderado", "Z4 - Limiar", "Z5 - Máximo"]
+            if save_training_assessment(data):
+                st.success("Treino registrado com sucesso!")
+                st.markdown(f"### Carga de Treino: {training_load:.1f} UA")
+                
+                if training_load > 500:
+                    st.warning("Atenção: Carga de treino elevada. Considere um período adequado de recuperação.")
+    
+    # Histórico recente no mesmo fragmento: após salvar, é atualizado sem reexecutar a página
+    recent = get_user_training_history()
+    if not recent.empty:
+        st.markdown("### Últimos Treinos")
+        st.dataframe(recent.head(5))
+
+@st.fragment
+def training_sections():
+    # Fragmento: trocar de seção ou mexer nos widgets dela não reexecuta o cabeçalho
+    # Só a seção visível é executada (st.tabs executaria todas a cada rerun)
+    section = section_selector(["Novo Treino", "Histórico", "Análise"], key="training_section")
+    
+    with timed_section("Treino", section):
+        if section == "Novo Treino":
+            training_form()
+        elif section == "Histórico":
+            st.subheader("Histórico de Treinos")
+            df = get_user_training_history()
+            if not df.empty:
+                # Gráfico de carga de treino
+                st.markdown("### Carga de Treino ao Longo do Tempo")
+                st.line_chart(df.set_index('date')['training_load'])
+                
+                # Distribuição dos tipos de treino
+                st.markdown("### Distribuição dos Tipos de Treino")
+                training_type_dist = df['training_type'].value_counts()
+                st.bar_chart(training_type_dist)
+                
+                # Tabela detalhada
+                st.markdown("### Registros Detalhados")
+                st.dataframe(df)
+            else:
+                st.info("Nenhum treino registrado ainda.")
+        
+        elif section == "Análise":
+            st.subheader("Análise de Treinos")
+            df = get_user_training_history()
+            if not df.empty:
+                # Carga de treino semanal
+                st.markdown("### Carga Semanal")
+                weekly_load = df.resample('W', on='date')['training_load'].sum()
+                st.line_chart(weekly_load)
+                
+                # Correlação entre variáveis
+                st.markdown("### Correlações")
+                # Correlações a partir dos momentos acumulados, sem reler o histórico
+                window = st.selectbox("Período", list(CORRELATION_WINDOWS), key="training_correlation_window")
+                correlations = page_data.correlation_matrix(
+                    st.session_state.user_id, 'training', CORRELATION_WINDOWS[window], datetime.now().date()
                 )
-                fatigue_level = st.slider("Nível de Fadiga (1-10)", 1, 10, 5)
-                performance_feeling = st.slider("Sensação de Performance (1-10)", 1, 10, 5)
-            
-            notes = st.text_area("Observações do Treino")
-            submit = st.form_submit_button("Salvar Treino")
-            
-            if submit:
-                # Calcular carga de treino (Training Load)
-                training_load = calculate_training_load(training_duration, rpe)
+                st.write("Correlação entre métricas de treino:")
+                st.write(correlations)
+                st.caption(f"Baseado em {correlations.attrs['n']} avaliações completas")
                 
-                data = {
-                    'date': date,
-                    'training_type': training_type,
-                    'training_duration': training_duration,
-                    'rpe': rpe,
-                    'intensity_zone': intensity_zone,
-                    'fatigue_level': fatigue_level,
-                    'performance_feeling': performance_feeling,
-                    'training_load': training_load,
-                    'notes': notes
-                }
+                # Média de RPE por tipo de treino
+                st.markdown("### RPE Médio por Tipo de Treino")
+                avg_rpe = df.groupby('training_type')['rpe'].mean()
+                st.bar_chart(avg_rpe)
                 
-                if save_training_assessment(data):
-                    st.success("Treino registrado com sucesso!")
-                    st.markdown(f"### Carga de Treino: {training_load:.1f} UA")
-                    
-                    if training_load > 500:
-                        st.warning("Atenção: Carga de treino elevada. Considere um período adequado de recuperação.")
+                # ACWR diário dos últimos 90 dias, calculado em uma passada vetorizada
+                st.markdown("### ACWR (últimos 90 dias)")
+                today = datetime.now().date()
+                load_history = page_data.load_metrics_history(st.session_state.user_id, today - timedelta(days=90), today)
+                st.line_chart(load_history[['acwr', 'acwr_ewma']].rename(
+                    columns={'acwr': 'Média móvel', 'acwr_ewma': 'EWMA'}
+                ))
+                st.markdown("### Monotonia e Strain")
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.line_chart(load_history['monotony'])
+                with col2:
+                    st.line_chart(load_history['strain'])
+            else:
+                st.info("Dados insuficientes para análise.")
+
+def treino_page():
+    check_authentication()
     
-    with tab2:
-        st.subheader("Histórico de Treinos")
-        training_history = get_user_training_history()
-        if training_history:
-            df = pd.DataFrame(training_history)
-            
-            # Gráfico de carga de treino
-            st.markdown("### Carga de Treino ao Longo do Tempo")
-            st.line_chart(df.set_index('date')['training_load'])
-            
-            # Distribuição dos tipos de treino
-            st.markdown("### Distribuição dos Tipos de Treino")
-            training_type_dist = df['training_type'].value_counts()
-            st.bar_chart(training_type_dist)
-            
-            # Tabela detalhada
-            st.markdown("### Registros Detalhados")
-            st.dataframe(df)
-        else:
-            st.info("Nenhum treino registrado ainda.")
+    hero_image("treino")
+    st.title("Módulo de Treino")
     
-    with tab3:
-        st.subheader("Análise de Treinos")
-        training_history = get_user_training_history()
-        if training_history:
-            df = pd.DataFrame(training_history)
-            
-            # Carga de treino semanal
-            st.markdown("### Carga Semanal")
-            df['date'] = pd.to_datetime(df['date'])
-            weekly_load = df.resample('W', on='date')['training_load'].sum()
-            st.line_chart(weekly_load)
-            
-            # Correlação entre variáveis
-            st.markdown("### Correlações")
-            correlation_data = df[['training_load', 'rpe', 'fatigue_level', 'performance_feeling']]
-            st.write("Correlação entre métricas de treino:")
-            st.write(correlation_data.corr())
-            
-            # Média de RPE por tipo de treino
-            st.markdown("### RPE Médio por Tipo de Treino")
-            avg_rpe = df.groupby('training_type')['rpe'].mean()
-            st.bar_chart(avg_rpe)
-        else:
-            st.info("Dados insuficientes para análise.")
+    training_sections()
 
 if __name__ == "__main__":
     treino_page()
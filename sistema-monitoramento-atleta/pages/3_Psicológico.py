@@ -1,8 +1,12 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime
-from utils.database import query_db
-from utils.psychological_utils import calculate_psychological_status
+from utils.database import connection, invalidate_cache
+from utils.psychological_utils import calculate_psychological_status, classify_psychological_history
+from utils.moments import CORRELATION_WINDOWS, record_assessment_moments
+from utils.anomaly import describe_anomaly, record_assessment_anomalies
+from utils import page_data
+from utils.layout import section_selector, timed_section
+from utils.assets import hero_image
 
 def check_authentication():
     if "authenticated" not in st.session_state or not st.session_state.authenticated:
@@ -20,163 +24,193 @@ def save_psychological_assessment(data):
     VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
     """
     try:
-        query_db(query, (
-            st.session_state.user_id,
-            data['date'],
-            data['depression_score'],
-            data['anxiety_score'],
-            data['stress_score'],
-            data['intrinsic_motivation'],
-            data['extrinsic_motivation'],
-            data['amotivation'],
-            data['flow_score'],
-            data['confidence_level'],
-            data['focus_ability'],
-            data['emotional_state'],
-            data['pre_competition_anxiety'],
-            data['satisfaction_with_training'],
-            data['team_cohesion'],
-            data['notes']
-        ))
+        with connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (
+                    st.session_state.user_id,
+                    data['date'],
+                    data['depression_score'],
+                    data['anxiety_score'],
+                    data['stress_score'],
+                    data['intrinsic_motivation'],
+                    data['extrinsic_motivation'],
+                    data['amotivation'],
+                    data['flow_score'],
+                    data['confidence_level'],
+                    data['focus_ability'],
+                    data['emotional_state'],
+                    data['pre_competition_anxiety'],
+                    data['satisfaction_with_training'],
+                    data['team_cohesion'],
+                    data['notes']
+                ))
+                # Momentos e linha de base na mesma transação do INSERT: a avaliação nunca fica sem eles
+                record_assessment_moments(cur, st.session_state.user_id, 'psychological', data)
+                flags = record_assessment_anomalies(cur, st.session_state.user_id, 'psychological', data)
+            conn.commit()
+        invalidate_cache('psychological_assessment', st.session_state.user_id)
+        page_data.invalidate(st.session_state.user_id)
+        # Comparação com a linha de base do próprio atleta
+        for flag in flags:
+            st.warning(describe_anomaly(flag))
         return True
     except Exception as e:
         st.error(f"Erro ao salvar avaliação: {str(e)}")
         return False
 
 def get_user_psychological_history():
-    query = """
-    SELECT date, depression_score, anxiety_score, stress_score,
-           intrinsic_motivation, confidence_level, emotional_state
-    FROM psychological_assessment
-    WHERE user_id = %s
-    ORDER BY date DESC
-    LIMIT 10
-    """
-    return query_db(query, (st.session_state.user_id,))
+    # Em cache por atleta: as seções e os reruns dos widgets não voltam ao banco
+    return page_data.psychological_history(st.session_state.user_id)
 
-def psicologico_page():
-    check_authentication()
-    
-    st.image("https://images.pexels.com/photos/3755761/pexels-photo-3755761.jpeg", use_column_width=True)
-    st.title("Módulo Psicológico")
+@st.fragment
+def psychological_form():
+    # Fragmento: enviar o formulário reexecuta só este bloco, não a página
+    st.subheader("Avaliação Psicológica")
+    with st.form("psychological_form"):
+        date = st.date_input("Data", datetime.now())
+        
+        st.markdown("### Estado Emocional e Estresse")
+        col1, col2 = st.columns(2)
+        with col1:
+            depression_score = st.slider("Nível de Depressão (1-10)", 1, 10, 1)
+            anxiety_score = st.slider("Nível de Ansiedade (1-10)", 1, 10, 1)
+            stress_score = st.slider("Nível de Estresse (1-10)", 1, 10, 1)
+        with col2:
+            emotional_state = st.slider("Estado Emocional (1-10)", 1, 10, 5)
+            pre_competition_anxiety = st.slider("Ansiedade Pré-competição (1-10)", 1, 10, 1)
+        
+        st.markdown("### Motivação e Foco")
+        col3, col4 = st.columns(2)
+        with col3:
+            intrinsic_motivation = st.slider("Motivação Intrínseca (1-10)", 1, 10, 5)
+            extrinsic_motivation = st.slider("Motivação Extrínseca (1-10)", 1, 10, 5)
+            amotivation = st.slider("Desmotivação (1-10)", 1, 10, 1)
+        with col4:
+            flow_score = st.slider("Estado de Flow (1-10)", 1, 10, 5)
+            focus_ability = st.slider("Capacidade de Foco (1-10)", 1, 10, 5)
+        
+        st.markdown("### Performance e Equipe")
+        col5, col6 = st.columns(2)
+        with col5:
+            confidence_level = st.slider("Nível de Confiança (1-10)", 1, 10, 5)
+            satisfaction_with_training = st.slider("Satisfação com Treinos (1-10)", 1, 10, 5)
+        with col6:
+            team_cohesion = st.slider("Coesão com a Equipe (1-10)", 1, 10, 5)
+        
+        notes = st.text_area("Observações Adicionais")
+        submit = st.form_submit_button("Salvar Avaliação")
+        
+        if submit:
+            data = {
+                'date': date,
+                'depression_score': depression_score,
+                'anxiety_score': anxiety_score,
+                'stress_score': stress_score,
+                'intrinsic_motivation': intrinsic_motivation,
+                'extrinsic_motivation': extrinsic_motivation,
+                'amotivation': amotivation,
+                'flow_score': flow_score,
+                'confidence_level': confidence_level,
+                'focus_ability': focus_ability,
+                'emotional_state': emotional_state,
+                'pre_competition_anxiety': pre_competition_anxiety,
+                'satisfaction_with_training': satisfaction_with_training,
+                'team_cohesion': team_cohesion,
+                'notes': notes
+            }
+            
+            if save_psychological_assessment(data):
+                st.success("Avaliação psicológica salva com sucesso!")
+                
+                # Calcular e mostrar status psicológico geral
+                status = calculate_psychological_status(data)
+                st.markdown(f"### Status Psicológico Geral: {status}")
+                
+                # Alertas baseados nos scores
+                if stress_score > 7 or anxiety_score > 7 or depression_score > 7:
+                    st.warning("Níveis elevados de estresse/ansiedade/depressão detectados. Considere consultar um profissional.")
     
-    tab1, tab2, tab3 = st.tabs(["Nova Avaliação", "Histórico", "Análise"])
+    # Histórico recente no mesmo fragmento: após salvar, é atualizado sem reexecutar a página
+    recent = get_user_psychological_history()
+    if not recent.empty:
+        st.markdown("### Últimas Avaliações")
+        st.dataframe(recent.head(5))
+
+@st.fragment
+def psychological_sections():
+    # Fragmento: trocar de seção ou mexer nos widgets dela não reexecuta o cabeçalho
+    # Só a seção visível é executada (st.tabs executaria todas a cada rerun)
+    section = section_selector(["Nova Avaliação", "Histórico", "Análise"], key="psychological_section")
     
-    with tab1:
-        st.subheader("Avaliação Psicológica")
-        with st.form("psychological_form"):
-            date = st.date_input("Data", datetime.now())
-            
-            st.markdown("### Estado Emocional e Estresse")
-            col1, col2 = st.columns(2)
-            with col1:
-                depression_score = st.slider("Nível de Depressão (1-10)", 1, 10, 1)
-                anxiety_score = st.slider("Nível de Ansiedade (1-10)", 1, 10, 1)
-                stress_score = st.slider("Nível de Estresse (1-10)", 1, 10, 1)
-            with col2:
-                emotional_state = st.slider("Estado Emocional (1-10)", 1, 10, 5)
-                pre_competition_anxiety = st.slider("Ansiedade Pré-competição (1-10)", 1, 10, 1)
-            
-            st.markdown("### Motivação e Foco")
-            col3, col4 = st.columns(2)
-            with col3:
-                intrinsic_motivation = st.slider("Motivação Intrínseca (1-10)", 1, 10, 5)
-                extrinsic_motivation = st.slider("Motivação Extrínseca (1-10)", 1, 10, 5)
-                amotivation = st.slider("Desmotivação (1-10)", 1, 10, 1)
-            with col4:
-                flow_score = st.slider("Estado de Flow (1-10)", 1, 10, 5)
-                focus_ability = st.slider("Capacidade de Foco (1-10)", 1, 10, 5)
-            
-            st.markdown("### Performance e Equipe")
-            col5, col6 = st.columns(2)
-            with col5:
-                confidence_level = st.slider("Nível de Confiança (1-10)", 1, 10, 5)
-                satisfaction_with_training = st.slider("Satisfação com Treinos (1-10)", 1, 10, 5)
-            with col6:
-                team_cohesion = st.slider("Coesão com a Equipe (1-10)", 1, 10, 5)
-            
-            notes = st.text_area("Observações Adicionais")
-            submit = st.form_submit_button("Salvar Avaliação")
-            
-            if submit:
-                data = {
-                    'date': date,
-                    'depression_score': depression_score,
-                    'anxiety_score': anxiety_score,
-                    'stress_score': stress_score,
-                    'intrinsic_motivation': intrinsic_motivation,
-                    'extrinsic_motivation': extrinsic_motivation,
-                    'amotivation': amotivation,
-                    'flow_score': flow_score,
-                    'confidence_level': confidence_level,
-                    'focus_ability': focus_ability,
-                    'emotional_state': emotional_state,
-                    'pre_competition_anxiety': pre_competition_anxiety,
-                    'satisfaction_with_training': satisfaction_with_training,
-                    'team_cohesion': team_cohesion,
-                    'notes': notes
-                }
+    with timed_section("Psicológico", section):
+        if section == "Nova Avaliação":
+            psychological_form()
+        elif section == "Histórico":
+            st.subheader("Histórico de Avaliações")
+            df = get_user_psychological_history()
+            if not df.empty:
+                # Gráfico de tendências emocionais
+                st.markdown("### Tendências Emocionais")
+                emotional_data = df[['date', 'depression_score', 'anxiety_score', 'stress_score']]
+                st.line_chart(emotional_data.set_index('date'))
                 
-                if save_psychological_assessment(data):
-                    st.success("Avaliação psicológica salva com sucesso!")
-                    
-                    # Calcular e mostrar status psicológico geral
-                    status = calculate_psychological_status(data)
-                    st.markdown(f"### Status Psicológico Geral: {status}")
-                    
-                    # Alertas baseados nos scores
-                    if stress_score > 7 or anxiety_score > 7 or depression_score > 7:
-                        st.warning("Níveis elevados de estresse/ansiedade/depressão detectados. Considere consultar um profissional.")
+                # Gráfico de motivação
+                st.markdown("### Nível de Motivação e Confiança")
+                motivation_data = df[['date', 'intrinsic_motivation', 'confidence_level']]
+                st.line_chart(motivation_data.set_index('date'))
+                
+                # Status de todo o histórico, classificado de uma vez
+                st.markdown("### Status ao Longo do Tempo")
+                status = classify_psychological_history(df)
+                st.line_chart(status[['score_psicológico', 'score_competição']].set_index(df['date']))
+                
+                # Tabela detalhada
+                st.markdown("### Registros Detalhados")
+                st.dataframe(df[['date']].join(
+                    status[['status_psicológico', 'status_estresse', 'perfil_motivacional', 'prontidão_competição']]
+                ).join(df.drop(columns='date')))
+            else:
+                st.info("Nenhuma avaliação psicológica registrada ainda.")
+        
+        elif section == "Análise":
+            st.subheader("Análise Psicológica")
+            df = get_user_psychological_history()
+            if not df.empty:
+                # Correlações entre variáveis
+                st.markdown("### Correlações")
+                # Correlações a partir dos momentos acumulados, sem reler o histórico
+                window = st.selectbox("Período", list(CORRELATION_WINDOWS), key="psychological_correlation_window")
+                correlations = page_data.correlation_matrix(
+                    st.session_state.user_id, 'psychological', CORRELATION_WINDOWS[window], datetime.now().date()
+                )
+                st.write("Correlação entre métricas psicológicas:")
+                st.write(correlations)
+                st.caption(f"Baseado em {correlations.attrs['n']} avaliações completas")
+                
+                # Médias semanais do estado emocional
+                st.markdown("### Médias Semanais - Estado Emocional")
+                weekly_emotional = df.resample('W', on='date')['emotional_state'].mean()
+                st.line_chart(weekly_emotional)
+                
+                # Distribuição dos níveis de estresse
+                st.markdown("### Distribuição dos Níveis de Estresse")
+                stress_dist = df['stress_score'].value_counts().sort_index()
+                st.bar_chart(stress_dist)
+                
+                # Frequência de cada status psicológico
+                st.markdown("### Distribuição do Status Psicológico")
+                status_dist = classify_psychological_history(df)['status_psicológico'].value_counts(sort=False)
+                st.bar_chart(status_dist)
+            else:
+                st.info("Dados insuficientes para análise.")
+
+def psicologico_page():
+    check_authentication()
     
-    with tab2:
-        st.subheader("Histórico de Avaliações")
-        psychological_history = get_user_psychological_history()
-        if psychological_history:
-            df = pd.DataFrame(psychological_history)
-            
-            # Gráfico de tendências emocionais
-            st.markdown("### Tendências Emocionais")
-            emotional_data = df[['date', 'depression_score', 'anxiety_score', 'stress_score']]
-            st.line_chart(emotional_data.set_index('date'))
-            
-            # Gráfico de motivação
-            st.markdown("### Nível de Motivação e Confiança")
-            motivation_data = df[['date', 'intrinsic_motivation', 'confidence_level']]
-            st.line_chart(motivation_data.set_index('date'))
-            
-            # Tabela detalhada
-            st.markdown("### Registros Detalhados")
-            st.dataframe(df)
-        else:
-            st.info("Nenhuma avaliação psicológica registrada ainda.")
+    hero_image("psicologico")
+    st.title("Módulo Psicológico")
     
-    with tab3:
-        st.subheader("Análise Psicológica")
-        psychological_history = get_user_psychological_history()
-        if psychological_history:
-            df = pd.DataFrame(psychological_history)
-            
-            # Correlações entre variáveis
-            st.markdown("### Correlações")
-            correlation_data = df[[
-                'depression_score', 'anxiety_score', 'stress_score',
-                'intrinsic_motivation', 'confidence_level', 'emotional_state'
-            ]]
-            st.write("Correlação entre métricas psicológicas:")
-            st.write(correlation_data.corr())
-            
-            # Médias semanais do estado emocional
-            st.markdown("### Médias Semanais - Estado Emocional")
-            df['date'] = pd.to_datetime(df['date'])
-            weekly_emotional = df.resample('W', on='date')['emotional_state'].mean()
-            st.line_chart(weekly_emotional)
-            
-            # Distribuição dos níveis de estresse
-            st.markdown("### Distribuição dos Níveis de Estresse")
-            stress_dist = df['stress_score'].value_counts().sort_index()
-            st.bar_chart(stress_dist)
-        else:
-            st.info("Dados insuficientes para análise.")
+    psychological_sections()
 
 if __name__ == "__main__":
     psicologico_page()
@@ -1,8 +1,10 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
-from utils.database import query_db
-from utils.visualization import plot_weekly_metrics
+from utils import page_data
+from utils.anomaly import WARMUP_ASSESSMENTS, describe_anomaly
+from utils.layout import section_selector, timed_section
+from utils.training_utils import ACWR_ZONES
+from utils.assets import hero_image
 
 def check_authentication():
     if "authenticated" not in st.session_state or not st.session_state.authenticated:
@@ -11,46 +13,89 @@ def check_authentication():
 
 def get_recent_metrics():
     # Últimos 30 dias de dados
-    thirty_days_ago = datetime.now() - timedelta(days=30)
-    
-    readiness_query = """
-    SELECT date, readiness_score, sleep_quality, energy_level
-    FROM readiness_assessment
-    WHERE user_id = %s AND date >= %s
-    ORDER BY date DESC
-    """
-    
-    training_query = """
-    SELECT date, training_load, rpe, fatigue_level
-    FROM training_assessment
-    WHERE user_id = %s AND date >= %s
-    ORDER BY date DESC
-    """
-    
-    psychological_query = """
-    SELECT date, stress_score, anxiety_score, confidence_level, emotional_state
-    FROM psychological_assessment
-    WHERE user_id = %s AND date >= %s
-    ORDER BY date DESC
-    """
-    
-    readiness_data = query_db(readiness_query, (st.session_state.user_id, thirty_days_ago))
-    training_data = query_db(training_query, (st.session_state.user_id, thirty_days_ago))
-    psychological_data = query_db(psychological_query, (st.session_state.user_id, thirty_days_ago))
-    
-    return readiness_data, training_data, psychological_data
+    # Data (sem hora) para que os parâmetros se repitam entre reruns e o cache seja aproveitado
+    thirty_days_ago = (datetime.now() - timedelta(days=30)).date()
+    return page_data.recent_assessments(st.session_state.user_id, thirty_days_ago)
+
+def get_recent_timeline():
+    # Mesma janela de 30 dias, com os três domínios já alinhados por dia
+    today = datetime.now().date()
+    return page_data.timeline(st.session_state.user_id, today - timedelta(days=30), today)
+
+def calculate_weekly_load():
+    # Últimos 7 dias (incluindo hoje), lidos do resumo diário
+    today = datetime.now().date()
+    summary = page_data.summary_metrics(st.session_state.user_id, today - timedelta(days=6), today)
+    return summary.get('carga_total', 0)
+
+@st.fragment
+def render_trends(readiness_data, training_data):
+    # Prontidão e Carga (fragmento: trocar o período redesenha só estes gráficos)
+    st.markdown("### Prontidão vs Carga de Treino")
+    period = st.radio("Período", ["Últimos 7 dias", "Últimos 30 dias"],
+                      key="dashboard_trend_period", horizontal=True)
+
+    if readiness_data.empty or training_data.empty:
+        st.info(f"Dados insuficientes para mostrar tendências dos {period.lower()}.")
+        return
+
+    df_readiness = readiness_data
+    df_training = training_data
+    if period == "Últimos 7 dias":
+        seven_days_ago = datetime.now() - timedelta(days=7)
+        df_readiness = df_readiness[df_readiness['date'] >= seven_days_ago]
+        df_training = df_training[df_training['date'] >= seven_days_ago]
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.line_chart(df_readiness.set_index('date')['readiness_score'])
+    with col2:
+        st.line_chart(df_training.set_index('date')['training_load'])
+
+def render_psychological(psychological_data):
+    st.markdown("### Métricas Psicológicas")
+    if not psychological_data.empty:
+        metrics = ['stress_score', 'anxiety_score', 'confidence_level', 'emotional_state']
+        st.line_chart(psychological_data.set_index('date')[metrics])
+    else:
+        st.info("Dados psicológicos insuficientes para análise.")
+
+def render_correlations(readiness_data, training_data, psychological_data):
+    st.markdown("### Análise de Correlações")
+    if readiness_data.empty or training_data.empty or psychological_data.empty:
+        st.info("Dados insuficientes para análise de correlações.")
+        return
+
+    # A linha do tempo só é lida quando esta seção está visível
+    df_timeline = get_recent_timeline()
+
+    # Selecionar métricas principais para correlação
+    correlation_metrics = [
+        'readiness_score', 'sleep_quality', 'energy_level',
+        'training_load', 'fatigue_level',
+        'stress_score', 'confidence_level'
+    ]
+
+    st.write("Matriz de Correlação entre Métricas Principais:")
+    st.write(df_timeline[correlation_metrics].corr())
 
-def calculate_weekly_load(training_data):
-    if not training_data:
-        return 0
-    df = pd.DataFrame(training_data)
-    df['date'] = pd.to_datetime(df['date'])
-    return df['training_load'].sum()
+@st.fragment
+def dashboard_sections(readiness_data, training_data, psychological_data):
+    # Fragmento: trocar de seção não reexecuta a visão geral, a carga e os alertas
+    section = section_selector(["Tendências", "Métricas Psicológicas", "Correlações"], key="dashboard_section")
+    
+    with timed_section("Dashboard", section):
+        if section == "Tendências":
+            render_trends(readiness_data, training_data)
+        elif section == "Métricas Psicológicas":
+            render_psychological(psychological_data)
+        elif section == "Correlações":
+            render_correlations(readiness_data, training_data, psychological_data)
 
 def dashboard_page():
     check_authentication()
     
-    st.image("https://images.pexels.com/photos/1552242/pexels-photo-1552242.jpeg", use_column_width=True)
+    hero_image("dashboard")
     st.title("Dashboard")
     
     # Obter dados recentes
@@ -62,8 +107,8 @@ def dashboard_page():
     
     # Última prontidão
     with col1:
-        latest_readiness = readiness_data[0] if readiness_data else None
-        readiness_score = latest_readiness['readiness_score'] if latest_readiness else "N/A"
+        latest_readiness = readiness_data.iloc[0] if not readiness_data.empty else None
+        readiness_score = latest_readiness['readiness_score'] if latest_readiness is not None else "N/A"
         st.metric(
             label="Última Prontidão",
             value=f"{readiness_score}/10" if readiness_score != "N/A" else "N/A"
@@ -71,7 +116,7 @@ def dashboard_page():
     
     # Carga semanal
     with col2:
-        weekly_load = calculate_weekly_load(training_data)
+        weekly_load = calculate_weekly_load()
         st.metric(
             label="Carga Semanal",
             value=f"{weekly_load:.0f} UA"
@@ -79,8 +124,8 @@ def dashboard_page():
     
     # Estado psicológico
     with col3:
-        latest_psych = psychological_data[0] if psychological_data else None
-        emotional_state = latest_psych['emotional_state'] if latest_psych else "N/A"
+        latest_psych = psychological_data.iloc[0] if not psychological_data.empty else None
+        emotional_state = latest_psych['emotional_state'] if latest_psych is not None else "N/A"
         st.metric(
             label="Estado Emocional",
             value=f"{emotional_state}/10" if emotional_state != "N/A" else "N/A"
@@ -88,120 +133,63 @@ def dashboard_page():
     
     # Nível de fadiga
     with col4:
-        latest_training = training_data[0] if training_data else None
-        fatigue = latest_training['fatigue_level'] if latest_training else "N/A"
+        latest_training = training_data.iloc[0] if not training_data.empty else None
+        fatigue = latest_training['fatigue_level'] if latest_training is not None else "N/A"
         st.metric(
             label="Nível de Fadiga",
             value=f"{fatigue}/10" if fatigue != "N/A" else "N/A"
         )
     
-    # Gráficos de tendências
-    st.markdown("## Tendências")
-    
-    # Prontidão e Carga
-    st.markdown("### Prontidão vs Carga de Treino")
-    tab1, tab2 = st.tabs(["Últimos 7 dias", "Últimos 30 dias"])
-    
-    with tab1:
-        if readiness_data and training_data:
-            df_readiness = pd.DataFrame(readiness_data)
-            df_training = pd.DataFrame(training_data)
-            
-            df_readiness['date'] = pd.to_datetime(df_readiness['date'])
-            df_training['date'] = pd.to_datetime(df_training['date'])
-            
-            # Filtrar últimos 7 dias
-            seven_days_ago = datetime.now() - timedelta(days=7)
-            df_readiness = df_readiness[df_readiness['date'] >= seven_days_ago]
-            df_training = df_training[df_training['date'] >= seven_days_ago]
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.line_chart(df_readiness.set_index('date')['readiness_score'])
-            with col2:
-                st.line_chart(df_training.set_index('date')['training_load'])
-        else:
-            st.info("Dados insuficientes para mostrar tendências dos últimos 7 dias.")
-    
-    with tab2:
-        if readiness_data and training_data:
-            df_readiness = pd.DataFrame(readiness_data)
-            df_training = pd.DataFrame(training_data)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.line_chart(df_readiness.set_index('date')['readiness_score'])
-            with col2:
-                st.line_chart(df_training.set_index('date')['training_load'])
-        else:
-            st.info("Dados insuficientes para mostrar tendências dos últimos 30 dias.")
-    
-    # Estado Psicológico
-    st.markdown("### Métricas Psicológicas")
-    if psychological_data:
-        df_psych = pd.DataFrame(psychological_data)
-        df_psych['date'] = pd.to_datetime(df_psych['date'])
-        
-        metrics = ['stress_score', 'anxiety_score', 'confidence_level', 'emotional_state']
-        st.line_chart(df_psych.set_index('date')[metrics])
-    else:
-        st.info("Dados psicológicos insuficientes para análise.")
-    
-    # Correlações
-    st.markdown("## Análise de Correlações")
-    if readiness_data and training_data and psychological_data:
-        # Preparar dados
-        df_readiness = pd.DataFrame(readiness_data)
-        df_training = pd.DataFrame(training_data)
-        df_psych = pd.DataFrame(psychological_data)
-        
-        # Mesclar dataframes na data
-        df_readiness['date'] = pd.to_datetime(df_readiness['date'])
-        df_training['date'] = pd.to_datetime(df_training['date'])
-        df_psych['date'] = pd.to_datetime(df_psych['date'])
-        
-        df_merged = pd.merge(df_readiness, df_training, on='date', how='outer')
-        df_merged = pd.merge(df_merged, df_psych, on='date', how='outer')
+    # Carga de treino (estado persistido, sem reler o histórico)
+    st.markdown("## Carga de Treino")
+    load_metrics = page_data.load_metrics(st.session_state.user_id, datetime.now().date())
+    if load_metrics is not None:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("ACWR", f"{load_metrics['acwr']:.2f}")
+        with col2:
+            st.metric("Monotonia", f"{load_metrics['monotonia']:.2f}")
+        with col3:
+            st.metric("Strain", f"{load_metrics['strain']:.0f}")
         
-        # Selecionar métricas principais para correlação
-        correlation_metrics = [
-            'readiness_score', 'sleep_quality', 'energy_level',
-            'training_load', 'fatigue_level',
-            'stress_score', 'confidence_level'
-        ]
-        
-        correlation_matrix = df_merged[correlation_metrics].corr()
-        
-        st.write("Matriz de Correlação entre Métricas Principais:")
-        st.write(correlation_matrix)
+        message = f"**{load_metrics['zona']}**: {load_metrics['recomendação']}"
+        if load_metrics['zona'] == "Zona Segura":
+            st.success(message)
+        elif load_metrics['zona'] == "Subcarga":
+            st.info(message)
+        else:
+            st.warning(message)
     else:
-        st.info("Dados insuficientes para análise de correlações.")
+        st.info("Registre treinos para acompanhar ACWR, monotonia e strain.")
     
     # Alertas e Recomendações
     st.markdown("## Alertas e Recomendações")
     
-    alerts = []
-    
-    # Verificar prontidão baixa
-    if latest_readiness and latest_readiness['readiness_score'] < 5:
-        alerts.append("⚠️ Prontidão baixa detectada. Considere reduzir a intensidade do próximo treino.")
-    
-    # Verificar carga de treino alta
-    if weekly_load > 1000:
-        alerts.append("⚠️ Carga de treino semanal elevada. Recomenda-se período de recuperação.")
+    # Quedas e aumentos atípicos em relação à linha de base do próprio atleta
+    alerts = [describe_anomaly(flag) for flag in page_data.recent_anomalies(st.session_state.user_id, datetime.now().date())]
     
-    # Verificar estado psicológico
-    if latest_psych:
-        if latest_psych['stress_score'] > 7:
-            alerts.append("⚠️ Nível de estresse elevado. Considere técnicas de relaxamento.")
-        if latest_psych['anxiety_score'] > 7:
-            alerts.append("⚠️ Nível de ansiedade elevado. Recomenda-se consulta com psicólogo esportivo.")
+    # Carga aguda muito acima da crônica (ACWR), em vez de um limite fixo de carga semanal
+    if load_metrics is not None and load_metrics['zona'] == ACWR_ZONES[-1]:
+        alerts.append(f"⚠️ ACWR de {load_metrics['acwr']:.2f}: carga da semana muito acima do habitual. "
+                      "Recomenda-se período de recuperação.")
     
     if alerts:
         for alert in alerts:
             st.warning(alert)
     else:
         st.success("Nenhum alerta importante no momento. Continue com o planejamento normal.")
+    
+    warming_up = page_data.warming_up_metrics(st.session_state.user_id)
+    if warming_up:
+        st.caption(
+            "Linha de base em formação (alertas a partir de "
+            f"{WARMUP_ASSESSMENTS} avaliações): "
+            + ", ".join(f"{label} ({n})" for label, n in warming_up.items())
+        )
+    
+    # Seções de análise: só a selecionada consulta dados e desenha gráficos
+    st.markdown("## Análises")
+    dashboard_sections(readiness_data, training_data, psychological_data)
 
 if __name__ == "__main__":
     dashboard_page()
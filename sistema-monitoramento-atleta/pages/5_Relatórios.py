@@ -1,9 +1,13 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
-from utils.database import query_db
-from utils.export import export_to_excel, export_to_pdf
-from utils.visualization import plot_weekly_metrics
+from utils.database import query_db_iter
+from utils import page_data
+from utils.page_data import READINESS_QUERY, TRAINING_QUERY, PSYCHOLOGICAL_QUERY
+from utils.cross_correlation import LAG_RESPONSES, MAX_LAG_DAYS, timeline_lagged_correlation
+from utils.layout import section_selector, timed_section
+from utils.psychological_utils import classify_stress_anxiety, suggest_psychological_interventions_bulk
+from utils.training_utils import classify_acwr
+from utils.assets import hero_image
 
 def check_authentication():
     if "authenticated" not in st.session_state or not st.session_state.authenticated:
@@ -11,68 +15,160 @@ def check_authentication():
         st.stop()
 
 def get_data_by_date_range(start_date, end_date):
-    readiness_query = """
-    SELECT date, readiness_score, sleep_quality, sleep_duration, 
-           stress_level, muscle_soreness, energy_level, motivation,
-           nutrition_quality, hydration, notes
-    FROM readiness_assessment
-    WHERE user_id = %s AND date BETWEEN %s AND %s
-    ORDER BY date
-    """
-    
-    training_query = """
-    SELECT date, training_load, training_duration, rpe, 
-           intensity_zone, training_type, fatigue_level,
-           performance_feeling, notes
-    FROM training_assessment
-    WHERE user_id = %s AND date BETWEEN %s AND %s
-    ORDER BY date
-    """
-    
-    psychological_query = """
-    SELECT date, depression_score, anxiety_score, stress_score,
-           intrinsic_motivation, extrinsic_motivation, amotivation,
-           flow_score, confidence_level, focus_ability,
-           emotional_state, pre_competition_anxiety,
-           satisfaction_with_training, team_cohesion, notes
-    FROM psychological_assessment
-    WHERE user_id = %s AND date BETWEEN %s AND %s
-    ORDER BY date
-    """
-    
-    readiness_data = query_db(readiness_query, (st.session_state.user_id, start_date, end_date))
-    training_data = query_db(training_query, (st.session_state.user_id, start_date, end_date))
-    psychological_data = query_db(psychological_query, (st.session_state.user_id, start_date, end_date))
-    
-    return readiness_data, training_data, psychological_data
+    return page_data.assessments_in_range(st.session_state.user_id, start_date, end_date)
 
-def calculate_summary_metrics(readiness_data, training_data, psychological_data):
-    summary = {}
-    
-    if readiness_data:
-        df_readiness = pd.DataFrame(readiness_data)
-        summary['média_prontidão'] = df_readiness['readiness_score'].mean()
-        summary['média_sono'] = df_readiness['sleep_quality'].mean()
-        summary['média_energia'] = df_readiness['energy_level'].mean()
-    
-    if training_data:
-        df_training = pd.DataFrame(training_data)
-        summary['carga_total'] = df_training['training_load'].sum()
-        summary['média_rpe'] = df_training['rpe'].mean()
-        summary['total_minutos'] = df_training['training_duration'].sum()
+def stream_data_by_date_range(start_date, end_date):
+    # Cursores no servidor: as linhas são lidas em blocos durante a exportação
+    params = (st.session_state.user_id, start_date, end_date)
+    return (
+        query_db_iter(READINESS_QUERY, params),
+        query_db_iter(TRAINING_QUERY, params),
+        query_db_iter(PSYCHOLOGICAL_QUERY, params)
+    )
+
+@st.fragment
+def export_section(start_date, end_date, readiness_data, training_data, psychological_data, summary):
+    # Fragmento: os botões de exportação não reexecutam os gráficos da página
+    col1, col2 = st.columns(2)
     
-    if psychological_data:
-        df_psych = pd.DataFrame(psychological_data)
-        summary['média_estresse'] = df_psych['stress_score'].mean()
-        summary['média_motivação'] = df_psych['intrinsic_motivation'].mean()
-        summary['média_confiança'] = df_psych['confidence_level'].mean()
+    with col1:
+        if st.button("Exportar para Excel"):
+            # utils.export (xlsxwriter, reportlab) só é carregado ao exportar
+            from utils.export import export_to_excel
+            try:
+                excel_file = export_to_excel(*stream_data_by_date_range(start_date, end_date))
+                st.download_button(
+                    label="Baixar Excel",
+                    data=excel_file,
+                    file_name=f"relatorio_{start_date}_{end_date}.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                )
+            except Exception as e:
+                st.error(f"Erro ao exportar para Excel: {str(e)}")
     
-    return summary
+    with col2:
+        if st.button("Exportar para PDF"):
+            from utils.export import export_to_pdf
+            try:
+                pdf_file = export_to_pdf(readiness_data, training_data, psychological_data, summary)
+                st.download_button(
+                    label="Baixar PDF",
+                    data=pdf_file,
+                    file_name=f"relatorio_{start_date}_{end_date}.pdf",
+                    mime="application/pdf"
+                )
+            except Exception as e:
+                st.error(f"Erro ao exportar para PDF: {str(e)}")
+
+@st.fragment
+def report_sections(start_date, end_date, readiness_data, training_data, psychological_data):
+    # Fragmento: trocar de seção ou mover o slider não reexecuta o resumo do período
+    section = section_selector(
+        ["Prontidão", "Treino", "Psicológico", "Recomendações", "Análises Avançadas"],
+        key="reports_section"
+    )
+    
+    with timed_section("Relatórios", section):
+        if section == "Prontidão":
+            if not readiness_data.empty:
+                df_readiness = readiness_data
+                
+                st.markdown("### Tendências de Prontidão")
+                st.line_chart(df_readiness.set_index('date')['readiness_score'])
+                
+                st.markdown("### Componentes da Prontidão")
+                components = ['sleep_quality', 'energy_level', 'motivation']
+                st.line_chart(df_readiness.set_index('date')[components])
+            else:
+                st.info("Sem dados de prontidão para o período selecionado.")
+        elif section == "Treino":
+            if not training_data.empty:
+                df_training = training_data
+                
+                st.markdown("### Carga de Treino")
+                st.line_chart(df_training.set_index('date')['training_load'])
+                
+                st.markdown("### Distribuição por Tipo de Treino")
+                training_dist = df_training['training_type'].value_counts()
+                st.bar_chart(training_dist)
+            else:
+                st.info("Sem dados de treino para o período selecionado.")
+        elif section == "Psicológico":
+            if not psychological_data.empty:
+                df_psych = psychological_data
+                
+                st.markdown("### Indicadores Psicológicos")
+                indicators = ['stress_score', 'anxiety_score', 'confidence_level']
+                st.line_chart(df_psych.set_index('date')[indicators])
+                
+                st.markdown("### Motivação ao Longo do Tempo")
+                motivation = ['intrinsic_motivation', 'extrinsic_motivation', 'amotivation']
+                st.line_chart(df_psych.set_index('date')[motivation])
+            else:
+                st.info("Sem dados psicológicos para o período selecionado.")
+        elif section == "Recomendações":
+            # As mesmas regras da avaliação individual, aplicadas ao período inteiro
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("### Dias por Zona de ACWR")
+                load_history = page_data.load_metrics_history(st.session_state.user_id, start_date, end_date)
+                st.bar_chart(classify_acwr(load_history['acwr']).value_counts(sort=False))
+            
+            with col2:
+                if not psychological_data.empty:
+                    st.markdown("### Nível de Estresse e Ansiedade")
+                    st.bar_chart(classify_stress_anxiety(psychological_data).value_counts(sort=False))
+                else:
+                    st.info("Sem dados psicológicos para o período selecionado.")
+            
+            if not psychological_data.empty:
+                st.markdown("### Intervenções Mais Indicadas")
+                interventions = suggest_psychological_interventions_bulk(psychological_data).explode()
+                st.dataframe(interventions.value_counts().rename_axis('Intervenção').rename('Avaliações'))
+        elif section == "Análises Avançadas":
+            if not readiness_data.empty and not training_data.empty and not psychological_data.empty:
+                # Correlações sobre a linha do tempo diária, com as métricas alinhadas pela data
+                st.markdown("### Matriz de Correlação")
+                df_timeline = page_data.timeline(st.session_state.user_id, start_date, end_date)
+                metrics = {
+                    'readiness_score': 'Prontidão',
+                    'training_load': 'Carga de Treino',
+                    'stress_score': 'Estresse',
+                    'intrinsic_motivation': 'Motivação',
+                    'confidence_level': 'Confiança'
+                }
+                
+                correlation_df = df_timeline[list(metrics)].rename(columns=metrics)
+                st.write(correlation_df.corr())
+                
+                # Correlação da carga de um dia com as respostas dos dias seguintes
+                st.markdown("### Correlação Defasada: Carga de Treino → Respostas")
+                max_lag = st.slider("Defasagem máxima (dias)", 1, 14, MAX_LAG_DAYS)
+                lagged = timeline_lagged_correlation(df_timeline, 'training_load', list(LAG_RESPONSES), max_lag)
+                st.bar_chart(lagged.rename(columns=LAG_RESPONSES))
+                st.caption("Defasagem k: correlação entre a carga do dia t e a resposta do dia t + k.")
+                
+                # Tendências semanais a partir do resumo diário
+                st.markdown("### Tendências Semanais")
+                weekly = page_data.period_summary(st.session_state.user_id, start_date, end_date, 'week')
+                weekly_readiness = weekly['readiness_score']
+                weekly_load = weekly['training_load']
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown("#### Prontidão Média Semanal")
+                    st.line_chart(weekly_readiness)
+                with col2:
+                    st.markdown("#### Carga Semanal")
+                    st.line_chart(weekly_load)
+            else:
+                st.info("Dados insuficientes para análises avançadas.")
 
 def relatorios_page():
     check_authentication()
     
-    st.image("https://images.pexels.com/photos/669577/pexels-photo-669577.jpeg", use_column_width=True)
+    hero_image("relatorios")
     st.title("Relatórios e Análises")
     
     # Seleção de período
@@ -92,7 +188,7 @@ def relatorios_page():
     
     # Métricas resumidas
     st.markdown("## Resumo do Período")
-    summary = calculate_summary_metrics(readiness_data, training_data, psychological_data)
+    summary = page_data.summary_metrics(st.session_state.user_id, start_date, end_date)
     
     if summary:
         col1, col2, col3 = st.columns(3)
@@ -115,123 +211,13 @@ def relatorios_page():
             if 'média_motivação' in summary:
                 st.metric("Média Motivação", f"{summary['média_motivação']:.1f}/10")
     
-    # Visualizações
-    st.markdown("## Visualizações")
-    
-    tab1, tab2, tab3 = st.tabs(["Prontidão", "Treino", "Psicológico"])
-    
-    with tab1:
-        if readiness_data:
-            df_readiness = pd.DataFrame(readiness_data)
-            df_readiness['date'] = pd.to_datetime(df_readiness['date'])
-            
-            st.markdown("### Tendências de Prontidão")
-            st.line_chart(df_readiness.set_index('date')['readiness_score'])
-            
-            st.markdown("### Componentes da Prontidão")
-            components = ['sleep_quality', 'energy_level', 'motivation']
-            st.line_chart(df_readiness.set_index('date')[components])
-        else:
-            st.info("Sem dados de prontidão para o período selecionado.")
-    
-    with tab2:
-        if training_data:
-            df_training = pd.DataFrame(training_data)
-            df_training['date'] = pd.to_datetime(df_training['date'])
-            
-            st.markdown("### Carga de Treino")
-            st.line_chart(df_training.set_index('date')['training_load'])
-            
-            st.markdown("### Distribuição por Tipo de Treino")
-            training_dist = df_training['training_type'].value_counts()
-            st.bar_chart(training_dist)
-        else:
-            st.info("Sem dados de treino para o período selecionado.")
-    
-    with tab3:
-        if psychological_data:
-            df_psych = pd.DataFrame(psychological_data)
-            df_psych['date'] = pd.to_datetime(df_psych['date'])
-            
-            st.markdown("### Indicadores Psicológicos")
-            indicators = ['stress_score', 'anxiety_score', 'confidence_level']
-            st.line_chart(df_psych.set_index('date')[indicators])
-            
-            st.markdown("### Motivação ao Longo do Tempo")
-            motivation = ['intrinsic_motivation', 'extrinsic_motivation', 'amotivation']
-            st.line_chart(df_psych.set_index('date')[motivation])
-        else:
-            st.info("Sem dados psicológicos para o período selecionado.")
-    
     # Exportação
     st.markdown("## Exportar Dados")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        if st.button("Exportar para Excel"):
-            try:
-                excel_file = export_to_excel(readiness_data, training_data, psychological_data)
-                st.download_button(
-                    label="Baixar Excel",
-                    data=excel_file,
-                    file_name=f"relatorio_{start_date}_{end_date}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
-            except Exception as e:
-                st.error(f"Erro ao exportar para Excel: {str(e)}")
-    
-    with col2:
-        if st.button("Exportar para PDF"):
-            try:
-                pdf_file = export_to_pdf(readiness_data, training_data, psychological_data, summary)
-                st.download_button(
-                    label="Baixar PDF",
-                    data=pdf_file,
-                    file_name=f"relatorio_{start_date}_{end_date}.pdf",
-                    mime="application/pdf"
-                )
-            except Exception as e:
-                st.error(f"Erro ao exportar para PDF: {str(e)}")
-    
-    # Análises Avançadas
-    st.markdown("## Análises Avançadas")
+    export_section(start_date, end_date, readiness_data, training_data, psychological_data, summary)
     
-    if readiness_data and training_data and psychological_data:
-        # Converter para DataFrames
-        df_readiness = pd.DataFrame(readiness_data)
-        df_training = pd.DataFrame(training_data)
-        df_psych = pd.DataFrame(psychological_data)
-        
-        # Correlações
-        st.markdown("### Matriz de Correlação")
-        metrics = {
-            'Prontidão': df_readiness['readiness_score'],
-            'Carga de Treino': df_training['training_load'],
-            'Estresse': df_psych['stress_score'],
-            'Motivação': df_psych['intrinsic_motivation'],
-            'Confiança': df_psych['confidence_level']
-        }
-        
-        correlation_df = pd.DataFrame(metrics)
-        st.write(correlation_df.corr())
-        
-        # Tendências semanais
-        st.markdown("### Tendências Semanais")
-        df_readiness['date'] = pd.to_datetime(df_readiness['date'])
-        weekly_readiness = df_readiness.resample('W', on='date')['readiness_score'].mean()
-        
-        df_training['date'] = pd.to_datetime(df_training['date'])
-        weekly_load = df_training.resample('W', on='date')['training_load'].sum()
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("#### Prontidão Média Semanal")
-            st.line_chart(weekly_readiness)
-        with col2:
-            st.markdown("#### Carga Semanal")
-            st.line_chart(weekly_load)
-    else:
-        st.info("Dados insuficientes para análises avançadas.")
+    # Seções de análise: só a selecionada consulta dados e desenha gráficos
+    st.markdown("## Visualizações e Análises")
+    report_sections(start_date, end_date, readiness_data, training_data, psychological_data)
 
 if __name__ == "__main__":
     relatorios_page()
@@ -1,6 +1,51 @@
 import streamlit as st
+import pandas as pd
+from utils.auth import is_admin
+from utils.database import get_pool_stats, get_cache_stats, get_query_stats, get_slow_queries, reset_query_stats
+from utils.layout import get_section_timings
+
+def check_authentication():
+    if "authenticated" not in st.session_state or not st.session_state.authenticated:
+        st.warning("Você precisa fazer login para acessar esta página.")
+        st.stop()
+
+def render_diagnostics():
+    # Estado do pool, SQL das consultas e estatísticas globais do processo
+    st.subheader("Diagnóstico do Banco de Dados")
+    with st.expander("Desempenho das consultas"):
+        pool = get_pool_stats()
+        cache = get_cache_stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Conexões em uso", f"{pool['in_use']}/{pool['max_size']}")
+        col2.metric("Conexões ociosas", pool['idle'])
+        col3.metric("Espera média no pool", f"{pool['avg_wait'] * 1000:.1f} ms")
+        col4.metric("Acertos no cache", f"{cache['hit_rate']:.0%}")
+
+        stats = get_query_stats()
+        if stats:
+            st.markdown("### Consultas por tempo total")
+            st.dataframe(pd.DataFrame(stats))
+        else:
+            st.info("Nenhuma consulta registrada ainda.")
+
+        slow = get_slow_queries()
+        if slow:
+            st.markdown("### Consultas lentas")
+            df_slow = pd.DataFrame(slow)
+            df_slow['timestamp'] = pd.to_datetime(df_slow['timestamp'], unit='s')
+            st.dataframe(df_slow)
+
+        timings = get_section_timings()
+        if timings:
+            st.markdown("### Tempo de renderização das seções")
+            st.dataframe(pd.DataFrame(timings))
+
+        if st.button("Zerar estatísticas"):
+            reset_query_stats()
 
 def configuracoes_page():
+    check_authentication()
+
     st.title("Configurações do Usuário")
     st.subheader("Perfil")
     # Dados pessoais aqui
@@ -14,5 +59,9 @@ def configuracoes_page():
     st.subheader("Dados e Privacidade")
     # Gestão de informações aqui
 
+    # O diagnóstico expõe SQL e estado global do processo: só para administradores
+    if is_admin(st.session_state.user_id):
+        render_diagnostics()
+
 if __name__ == "__main__":
     configuracoes_page()
@@ -0,0 +1,99 @@
+import streamlit as st
+from utils.squad import (
+    get_coach_squads, create_squad, add_squad_member, get_squad_table,
+    get_pending_invitations, get_athlete_squads, get_pending_members,
+    respond_to_invitation, remove_squad_member
+)
+
+def check_authentication():
+    if "authenticated" not in st.session_state or not st.session_state.authenticated:
+        st.warning("Você precisa fazer login para acessar esta página.")
+        st.stop()
+
+def render_invitations():
+    # O treinador só vê os dados do atleta depois que ele aceita o convite
+    invitations = get_pending_invitations(st.session_state.user_id)
+    if invitations:
+        st.markdown("### Convites")
+        for invitation in invitations:
+            col1, col2, col3 = st.columns([4, 1, 1])
+            col1.write(
+                f"**{invitation['coach']}** convidou você para a equipe **{invitation['squad']}**. "
+                "Ao aceitar, o treinador passa a ver sua prontidão, carga de treino, estresse e ansiedade."
+            )
+            if col2.button("Aceitar", key=f"accept_{invitation['squad_id']}"):
+                respond_to_invitation(invitation['squad_id'], st.session_state.user_id, True)
+                st.rerun()
+            if col3.button("Recusar", key=f"decline_{invitation['squad_id']}"):
+                respond_to_invitation(invitation['squad_id'], st.session_state.user_id, False)
+                st.rerun()
+
+    memberships = get_athlete_squads(st.session_state.user_id)
+    if memberships:
+        with st.expander("Equipes das quais faço parte"):
+            for membership in memberships:
+                col1, col2 = st.columns([5, 1])
+                col1.write(f"{membership['squad']} (treinador: {membership['coach']})")
+                if col2.button("Sair", key=f"leave_{membership['squad_id']}"):
+                    remove_squad_member(membership['squad_id'], st.session_state.user_id)
+                    st.rerun()
+
+def equipe_page():
+    check_authentication()
+
+    st.title("Equipe")
+
+    render_invitations()
+
+    squads = get_coach_squads(st.session_state.user_id)
+
+    with st.expander("Gerenciar equipes", expanded=not squads):
+        with st.form("squad_form"):
+            name = st.text_input("Nome da nova equipe")
+            if st.form_submit_button("Criar equipe") and name:
+                create_squad(name, st.session_state.user_id)
+                st.success(f"Equipe '{name}' criada!")
+                squads = get_coach_squads(st.session_state.user_id)
+
+        if squads:
+            with st.form("member_form"):
+                squad_names = {squad['name']: squad['id'] for squad in squads}
+                target = st.selectbox("Equipe", list(squad_names))
+                email = st.text_input("Email do atleta")
+                if st.form_submit_button("Convidar atleta") and email:
+                    if add_squad_member(squad_names[target], st.session_state.user_id, email):
+                        st.success("Convite enviado! O atleta aparece na equipe depois de aceitar.")
+                    else:
+                        st.error("Nenhum atleta registrado com este email")
+
+    if not squads:
+        st.info("Crie uma equipe para acompanhar seus atletas.")
+        return
+
+    selected = st.selectbox("Equipe", [squad['name'] for squad in squads], key="selected_squad")
+    squad_id = next(squad['id'] for squad in squads if squad['name'] == selected)
+
+    pending = get_pending_members(squad_id)
+    if pending:
+        st.caption(f"Convites pendentes: {', '.join(pending)}")
+
+    # Métricas de todos os atletas em uma única consulta
+    squad = get_squad_table(squad_id)
+    if squad.empty:
+        st.info("Nenhum atleta aceitou o convite para esta equipe ainda.")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Atletas", len(squad))
+    col2.metric("Com alertas", int((squad['n_alertas'] > 0).sum()))
+    col3.metric("ACWR médio", f"{squad['acwr'].mean():.2f}")
+
+    st.markdown("### Atletas por Prioridade")
+    table = squad.drop(columns='n_alertas').assign(alertas=squad['alertas'].str.join(", "))
+    st.dataframe(table, hide_index=True)
+
+    st.markdown("### Distribuição por Zona de ACWR")
+    st.bar_chart(squad['zona_acwr'].value_counts(sort=False))
+
+if __name__ == "__main__":
+    equipe_page()
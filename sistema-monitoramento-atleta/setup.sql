@@ -1,3 +1,6 @@
+-- Esquema base. Depois de criá-lo, aplique as migrações versionadas em migrations/:
+--     python -m utils.migrations
+
 -- Table: athlete_users
 CREATE TABLE IF NOT EXISTS athlete_users (
     id SERIAL PRIMARY KEY,
@@ -0,0 +1,58 @@
+"""
+Linha de base exponencial (utils.anomaly): versão em lote contra o registro online
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from utils.anomaly import (
+    MIN_STD, WARMUP_ASSESSMENTS, Z_THRESHOLD,
+    anomaly_score, baseline_series, baseline_std, is_anomaly, update_baseline
+)
+
+def _online(values):
+    # O que record_assessment_anomalies faz avaliação a avaliação
+    n, mean, variance = 0, 0.0, 0.0
+    rows = []
+    for value in values:
+        rows.append((n, mean, baseline_std(variance), anomaly_score(n, mean, variance, value)))
+        n, mean, variance = update_baseline(n, mean, variance, value)
+    return rows
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_batch_baseline_matches_online_updates(seed):
+    rng = np.random.default_rng(seed)
+    values = pd.Series(rng.integers(1, 11, 80).astype(float))
+    values[40] = 1.0  # uma queda no meio do histórico
+    series = baseline_series(values)
+
+    for position, (n, mean, std, z_score) in enumerate(_online(values)):
+        row = series.iloc[position]
+        assert row['n'] == n
+        if n == 0:
+            continue
+        assert row['mean'] == pytest.approx(mean)
+        assert row['std'] == pytest.approx(std)
+        if z_score is None:
+            assert np.isnan(row['z_score'])
+        else:
+            assert row['z_score'] == pytest.approx(z_score)
+
+def test_no_scores_during_warmup():
+    series = baseline_series(pd.Series([5.0, 9.0, 1.0, 5.0, 9.0, 1.0, 5.0, 9.0, 1.0]))
+    assert series['z_score'].iloc[:WARMUP_ASSESSMENTS].isna().all()
+    assert series['z_score'].iloc[WARMUP_ASSESSMENTS:].notna().all()
+    assert anomaly_score(WARMUP_ASSESSMENTS - 1, 5.0, 1.0, 1.0) is None
+
+def test_constant_history_uses_minimum_std():
+    series = baseline_series(pd.Series([7.0] * 10 + [6.0]))
+    assert series['std'].iloc[-1] == MIN_STD
+    assert series['z_score'].iloc[-1] == pytest.approx(-1.0 / MIN_STD)
+
+def test_anomaly_direction_and_threshold():
+    # readiness_score: ruim é cair; fatigue_level: ruim é subir
+    assert is_anomaly('readiness_score', -Z_THRESHOLD)
+    assert not is_anomaly('readiness_score', Z_THRESHOLD)
+    assert not is_anomaly('readiness_score', -Z_THRESHOLD + 0.01)
+    assert is_anomaly('fatigue_level', Z_THRESHOLD)
+    assert not is_anomaly('fatigue_level', -3.0)
+    assert not is_anomaly('fatigue_level', None)
@@ -0,0 +1,78 @@
+"""
+Correlação defasada por FFT (utils.cross_correlation) contra np.correlate e um laço direto
+"""
+import numpy as np
+import pytest
+from utils.cross_correlation import lagged_correlation
+
+MAX_LAG = 7
+
+def _series(length=120, seed=18, missing=0.0):
+    rng = np.random.default_rng(seed)
+    x = rng.integers(0, 600, length).astype(float)
+    # y responde a x com 2 dias de atraso, mais ruído
+    y = np.concatenate((np.full(2, 300.0), x[:-2])) * -0.01 + rng.normal(7, 1, length)
+    x[rng.random(length) < missing] = np.nan
+    y[rng.random(length) < missing] = np.nan
+    return x, y
+
+def _pearson_from_sums(n, sx, sy, sxy, sxx, syy):
+    return (n * sxy - sx * sy) / np.sqrt((n * sxx - sx ** 2) * (n * syy - sy ** 2))
+
+def test_complete_series_match_np_correlate():
+    x, y = _series()
+    length = len(x)
+    correlation, pairs = lagged_correlation(x, y, MAX_LAG)
+
+    # Σ_t x[t] * y[t + k] nas posições T-1+k da correlação completa
+    sum_xy = np.correlate(y, x, 'full')[length - 1:length + MAX_LAG]
+    for k in range(MAX_LAG + 1):
+        xk, yk = x[:length - k], y[k:]
+        expected = _pearson_from_sums(length - k, xk.sum(), yk.sum(), sum_xy[k], (xk * xk).sum(), (yk * yk).sum())
+        assert pairs[k] == length - k
+        assert correlation[k] == pytest.approx(expected, abs=1e-9)
+
+    # O atraso simulado aparece como a correlação mais forte
+    assert np.argmax(np.abs(correlation)) == 2
+
+@pytest.mark.parametrize("missing", [0.1, 0.4])
+def test_missing_days_match_direct_loop(missing):
+    x, y = _series(missing=missing, seed=int(missing * 100))
+    length = len(x)
+    correlation, pairs = lagged_correlation(x, y, MAX_LAG, min_pairs=10)
+
+    for k in range(MAX_LAG + 1):
+        xk, yk = x[:length - k], y[k:]
+        valid = ~np.isnan(xk) & ~np.isnan(yk)
+        assert pairs[k] == valid.sum()
+        expected = np.corrcoef(xk[valid], yk[valid])[0, 1] if valid.sum() >= 10 else np.nan
+        assert correlation[k] == pytest.approx(expected, abs=1e-9, nan_ok=True)
+
+def test_matrix_rows_match_single_series():
+    rows = [_series(length=60, seed=seed, missing=0.2) for seed in range(5)]
+    x = np.vstack([row[0] for row in rows])
+    y = np.vstack([row[1] for row in rows])
+    correlation, pairs = lagged_correlation(x, y, MAX_LAG, min_pairs=5)
+
+    for index, (xi, yi) in enumerate(rows):
+        expected, expected_pairs = lagged_correlation(xi, yi, MAX_LAG, min_pairs=5)
+        np.testing.assert_allclose(correlation[index], expected, atol=1e-9)
+        np.testing.assert_array_equal(pairs[index], expected_pairs)
+
+def test_too_few_pairs_or_constant_series_are_nan():
+    x, y = _series(length=30)
+    correlation, pairs = lagged_correlation(x, y, MAX_LAG, min_pairs=25)
+    assert np.isnan(correlation[pairs < 25]).all()
+    assert not np.isnan(correlation[pairs >= 25]).any()
+
+    correlation, _ = lagged_correlation(np.full(30, 4.0), y, MAX_LAG, min_pairs=5)
+    assert np.isnan(correlation).all()
+
+def test_max_lag_is_limited_by_series_length():
+    correlation, pairs = lagged_correlation(np.arange(4.0), np.arange(4.0), max_lag=10, min_pairs=2)
+    assert pairs.tolist() == [4, 3, 2, 1]
+    assert correlation[:3] == pytest.approx([1.0, 1.0, 1.0])
+
+def test_shapes_must_match():
+    with pytest.raises(ValueError):
+        lagged_correlation(np.zeros(10), np.zeros(11))
@@ -0,0 +1,67 @@
+"""
+Séries de carga (utils.load_series) contra as funções escalares de training_utils
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from utils.load_series import daily_load_series, load_metrics_series
+from utils.load_state import compute_load_metrics
+from utils.training_utils import (
+    ACUTE_WINDOW_DAYS, CHRONIC_WINDOW_DAYS,
+    calculate_acute_load, calculate_acwr, calculate_monotony, calculate_strain
+)
+
+def _daily_loads(days=90, seed=0):
+    rng = np.random.default_rng(seed)
+    loads = rng.integers(60, 240, days) * rng.integers(1, 11, days)
+    loads[rng.random(days) < 0.3] = 0
+    return loads.astype(float)
+
+def _scalar_metrics(values, day):
+    # Janelas terminando em `day`, com zeros antes do início da série
+    padded = np.concatenate((np.zeros(CHRONIC_WINDOW_DAYS), values))
+    end = day + CHRONIC_WINDOW_DAYS + 1
+    week = [{'training_load': load} for load in padded[end - ACUTE_WINDOW_DAYS:end]]
+    acute = calculate_acute_load(week)
+    chronic = padded[end - CHRONIC_WINDOW_DAYS:end].sum() / (CHRONIC_WINDOW_DAYS / ACUTE_WINDOW_DAYS)
+    monotony = calculate_monotony(week)
+    return acute, chronic, calculate_acwr(acute, chronic), monotony, calculate_strain(acute, monotony)
+
+def test_load_metrics_series_matches_scalar_functions():
+    values = _daily_loads()
+    series = load_metrics_series(values)
+
+    for day in range(len(values)):
+        acute, chronic, acwr, monotony, strain = _scalar_metrics(values, day)
+        row = series.iloc[day]
+        assert row['acute_load'] == pytest.approx(acute)
+        assert row['chronic_load'] == pytest.approx(chronic)
+        assert row['acwr'] == pytest.approx(acwr)
+        assert row['monotony'] == pytest.approx(monotony)
+        assert row['strain'] == pytest.approx(strain)
+
+def test_load_metrics_series_matches_persisted_window():
+    # Último dia da série == métricas de athlete_load_state (janela do mais recente ao mais antigo)
+    values = _daily_loads(seed=1)
+    last = load_metrics_series(values).iloc[-1]
+    state = compute_load_metrics(values[::-1][:CHRONIC_WINDOW_DAYS].tolist())
+
+    assert last['acute_load'] == pytest.approx(state['carga_aguda'])
+    assert last['chronic_load'] == pytest.approx(state['carga_crônica'])
+    assert last['acwr'] == pytest.approx(state['acwr'])
+    assert last['monotony'] == pytest.approx(state['monotonia'])
+    assert last['strain'] == pytest.approx(state['strain'])
+
+def test_rest_days_have_zero_ratios():
+    series = load_metrics_series(np.zeros(10))
+    assert (series[['acwr', 'acwr_ewma', 'monotony', 'strain']] == 0).all().all()
+
+def test_daily_load_series_sums_sessions_and_fills_rest_days():
+    training = pd.DataFrame({
+        'date': pd.to_datetime(['2024-01-01', '2024-01-01', '2024-01-04']),
+        'training_load': [100, 50, 200],
+    })
+    daily = daily_load_series(training, end_date='2024-01-05')
+
+    assert daily.index[0] == pd.Timestamp('2024-01-01')
+    assert daily.tolist() == [150.0, 0.0, 0.0, 200.0, 0.0]
@@ -0,0 +1,64 @@
+"""
+Momentos acumulados (Welford e combinação de Chan) contra numpy
+"""
+import numpy as np
+import pytest
+from utils.moments import _empty, merge_moments, moments_to_correlation, welford_update
+
+COLUMNS = ['a', 'b', 'c', 'd']
+
+@pytest.fixture
+def observations():
+    rng = np.random.default_rng(17)
+    base = rng.normal(5, 2, (200, 1))
+    # Colunas correlacionadas entre si, com uma escala bem diferente
+    return np.hstack([base, base * 0.5 + rng.normal(0, 1, (200, 1)),
+                      rng.normal(7, 1, (200, 1)), base * 100 + rng.normal(0, 50, (200, 1))])
+
+def _accumulate(rows):
+    moments = _empty(rows.shape[1])
+    for x in rows:
+        moments = welford_update(*moments, x)
+    return moments
+
+def test_welford_matches_numpy(observations):
+    n, mean, comoments = _accumulate(observations)
+
+    assert n == len(observations)
+    np.testing.assert_allclose(mean, observations.mean(axis=0))
+    np.testing.assert_allclose(comoments / n, np.cov(observations, rowvar=False, bias=True))
+
+@pytest.mark.parametrize("splits", [[1], [50, 120], [10, 11, 150, 199]])
+def test_merge_of_parts_matches_whole(observations, splits):
+    merged = _empty(observations.shape[1])
+    for part in np.split(observations, splits):
+        merged = merge_moments(merged, _accumulate(part))
+    n, mean, comoments = _accumulate(observations)
+
+    assert merged[0] == n
+    np.testing.assert_allclose(merged[1], mean)
+    np.testing.assert_allclose(merged[2], comoments)
+
+def test_merge_with_empty_is_identity(observations):
+    moments = _accumulate(observations[:20])
+    assert merge_moments(_empty(4), moments) is moments
+    assert merge_moments(moments, _empty(4)) is moments
+
+def test_correlation_matches_corrcoef(observations):
+    correlation = moments_to_correlation(_accumulate(observations), COLUMNS)
+
+    assert correlation.attrs['n'] == len(observations)
+    np.testing.assert_allclose(correlation.to_numpy(), np.corrcoef(observations, rowvar=False))
+
+def test_constant_metric_has_no_correlation(observations):
+    rows = observations[:30].copy()
+    rows[:, 2] = 4.0
+    correlation = moments_to_correlation(_accumulate(rows), COLUMNS)
+
+    assert correlation['c'].isna().all()
+    assert correlation.loc['c'].isna().all()
+    assert correlation.loc['a', 'a'] == 1.0
+
+def test_single_observation_has_no_correlation(observations):
+    correlation = moments_to_correlation(_accumulate(observations[:1]), COLUMNS)
+    assert correlation.isna().all().all()
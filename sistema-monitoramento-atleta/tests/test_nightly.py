@@ -0,0 +1,57 @@
+"""
+Métricas do job noturno (utils.nightly) contra as versões vetorizadas
+"""
+from datetime import date
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.bench_nightly import synthetic_timeline
+from utils.load_series import load_metrics_series
+from utils.nightly import RESULT_COLUMNS, compute_athlete_metrics
+from utils.squad import compute_squad_metrics
+
+USER_IDS = list(range(1, 31))
+AS_OF = date(2024, 5, 1)
+
+@pytest.fixture
+def timeline():
+    return synthetic_timeline(USER_IDS, AS_OF)
+
+@pytest.fixture
+def nightly(timeline):
+    return pd.DataFrame(
+        [compute_athlete_metrics(group) for _, group in timeline.groupby('user_id')],
+        index=pd.Index(USER_IDS, name='user_id'), columns=RESULT_COLUMNS[2:]
+    )
+
+def test_load_metrics_match_load_series(timeline, nightly):
+    for user_id, group in timeline.groupby('user_id'):
+        last = load_metrics_series(group['training_load'].fillna(0).to_numpy()).iloc[-1]
+        row = nightly.loc[user_id]
+        assert row['acute_load'] == pytest.approx(last['acute_load'])
+        assert row['chronic_load'] == pytest.approx(last['chronic_load'])
+        assert row['acwr'] == pytest.approx(last['acwr'])
+        assert row['monotony'] == pytest.approx(last['monotony'])
+        assert row['strain'] == pytest.approx(last['strain'])
+
+def test_metrics_match_squad_table(timeline, nightly):
+    # A tabela da equipe calcula as mesmas métricas para todos os atletas de uma vez
+    squad = compute_squad_metrics(timeline.assign(name=timeline['user_id'].map(str))).loc[USER_IDS]
+
+    np.testing.assert_allclose(nightly['acwr'].to_numpy(float), squad['acwr'].to_numpy(float))
+    np.testing.assert_allclose(nightly['monotony'].to_numpy(float), squad['monotonia'].to_numpy(float))
+    assert nightly['acwr_zone'].tolist() == squad['zona_acwr'].astype(str).tolist()
+    np.testing.assert_allclose(nightly['readiness_score'].to_numpy(float),
+                               squad['prontidão_atual'].to_numpy(float))
+    assert nightly['stress_status'].tolist() == squad['status_estresse'].astype(str).tolist()
+
+def test_athlete_without_assessments(timeline):
+    empty = timeline[timeline['user_id'] == USER_IDS[0]].copy()
+    empty.loc[:, empty.columns.difference(['user_id', 'date'])] = np.nan
+    result = dict(zip(RESULT_COLUMNS[2:], compute_athlete_metrics(empty)))
+
+    assert result['readiness_score'] is None
+    assert result['acute_load'] == 0
+    assert result['acwr'] == 0
+    assert result['psychological_status'] is None
+    assert result['next_training_type'] == "Normal"
@@ -0,0 +1,66 @@
+"""
+Classificadores psicológicos vetorizados contra as versões por avaliação
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from utils.psychological_utils import (
+    COMPETITION_READINESS_WEIGHTS, NEGATIVE_INDICATORS, POSITIVE_INDICATORS,
+    analyze_motivation, calculate_psychological_status, calculate_psychological_statuses,
+    classify_motivation, classify_psychological_history, classify_stress_anxiety,
+    evaluate_competition_readiness, evaluate_competition_readiness_scores,
+    interpret_stress_anxiety
+)
+
+COLUMNS = sorted(set(POSITIVE_INDICATORS) | set(NEGATIVE_INDICATORS) | set(COMPETITION_READINESS_WEIGHTS)
+                 | {'intrinsic_motivation', 'extrinsic_motivation', 'amotivation'})
+
+@pytest.fixture
+def assessments():
+    rng = np.random.default_rng(14)
+    data = pd.DataFrame(rng.integers(1, 11, (300, len(COLUMNS))).astype(float), columns=COLUMNS)
+    # Campos não preenchidos: as funções escalares recebem o dicionário sem a chave
+    data = data.mask(rng.random(data.shape) < 0.1)
+    # Extremos, para que todas as faixas apareçam
+    best = {column: 1.0 if column in NEGATIVE_INDICATORS else 10.0 for column in COLUMNS}
+    worst = {column: 10.0 if column in NEGATIVE_INDICATORS else 1.0 for column in COLUMNS}
+    return pd.concat([data, pd.DataFrame([best, worst])], ignore_index=True)
+
+def _records(data):
+    return [{key: value for key, value in row.items() if pd.notna(value)}
+            for row in data.to_dict('records')]
+
+def test_psychological_statuses_match_scalar(assessments):
+    expected = [calculate_psychological_status(record) for record in _records(assessments)]
+    assert calculate_psychological_statuses(assessments).astype(str).tolist() == expected
+
+def test_stress_anxiety_matches_scalar(assessments):
+    # A versão vetorizada conta campo vazio como 5, o mesmo padrão do .get das páginas
+    expected = [
+        interpret_stress_anxiety(record['stress_score'], record['anxiety_score'])['status']
+        for record in assessments.fillna(5).to_dict('records')
+    ]
+    assert classify_stress_anxiety(assessments).astype(str).tolist() == expected
+
+def test_motivation_matches_scalar(assessments):
+    expected = [
+        analyze_motivation(record['intrinsic_motivation'], record['extrinsic_motivation'],
+                           record['amotivation'])['perfil']
+        for record in assessments.fillna(5).to_dict('records')
+    ]
+    assert classify_motivation(assessments).astype(str).tolist() == expected
+
+def test_competition_readiness_matches_scalar(assessments):
+    result = evaluate_competition_readiness_scores(assessments)
+    for record, (score, status) in zip(_records(assessments), result.itertuples(index=False)):
+        expected = evaluate_competition_readiness(record)
+        assert score == pytest.approx(expected['score'])
+        assert status == expected['status']
+
+def test_history_keeps_index_and_categories(assessments):
+    subset = assessments.iloc[::3]
+    history = classify_psychological_history(subset)
+
+    assert history.index.equals(subset.index)
+    assert history['status_psicológico'].cat.ordered
+    assert history['status_estresse'].cat.ordered
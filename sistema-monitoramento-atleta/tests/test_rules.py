@@ -0,0 +1,130 @@
+"""
+Motor de regras (utils.rules) contra as cadeias if/elif que ele substituiu
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from utils.rules import RuleSet
+from utils.training_utils import ACWR_ZONES, classify_acwr, interpret_acwr, suggest_next_training
+from utils.psychological_utils import (
+    STRESS_ANXIETY_LEVELS, classify_stress_anxiety, interpret_stress_anxiety,
+    suggest_psychological_interventions, suggest_psychological_interventions_bulk
+)
+
+# Cadeias originais (antes do RuleSet), reduzidas ao rótulo de cada ramo
+
+def legacy_acwr_zone(acwr):
+    if acwr < 0.8:
+        return "Subcarga"
+    elif 0.8 <= acwr <= 1.3:
+        return "Zona Segura"
+    elif 1.3 < acwr <= 1.5:
+        return "Zona de Alerta"
+    else:
+        return "Zona de Perigo"
+
+def legacy_stress_status(stress_score, anxiety_score):
+    combined_score = (stress_score + anxiety_score) / 2
+    if combined_score >= 8:
+        return "Crítico"
+    elif combined_score >= 6:
+        return "Elevado"
+    elif combined_score >= 4:
+        return "Moderado"
+    else:
+        return "Normal"
+
+def legacy_next_training_type(recent_data):
+    if not recent_data:
+        return "Moderado"
+    readiness = recent_data.get('readiness_score', 7)
+    fatigue = recent_data.get('fatigue_level', 5)
+    if readiness < 5 or fatigue > 7:
+        return "Recuperação"
+    elif readiness >= 8:
+        return "Intenso"
+    else:
+        return "Normal"
+
+def legacy_intervention_groups(data):
+    groups = []
+    if data.get('stress_score', 0) > 6 or data.get('anxiety_score', 0) > 6:
+        groups.append("Técnicas de Respiração Profunda")
+    if data.get('confidence_level', 10) < 6:
+        groups.append("Visualização Positiva")
+    if data.get('focus_ability', 10) < 6:
+        groups.append("Exercícios de Concentração")
+    if data.get('team_cohesion', 10) < 6:
+        groups.append("Atividades de Team Building")
+    return groups or ["Manutenção de Rotina Mental"]
+
+# Valores nas fronteiras e logo ao lado delas
+ACWR_VALUES = [0.0, 0.5, 0.79, 0.8, 0.8000001, 1.0, 1.3, 1.3000001, 1.45, 1.5, 1.5000001, 2.0, 3.5]
+SCORES = np.arange(0, 10.5, 0.5)
+
+def test_acwr_zones_match_legacy_chain():
+    for acwr in ACWR_VALUES:
+        assert interpret_acwr(acwr)[0] == legacy_acwr_zone(acwr), acwr
+    zones = classify_acwr(pd.Series(ACWR_VALUES))
+    assert zones.astype(str).tolist() == [legacy_acwr_zone(acwr) for acwr in ACWR_VALUES]
+    assert zones.cat.categories.tolist() == ACWR_ZONES
+
+def test_missing_acwr_falls_in_danger_zone():
+    # NaN < 0.8 e as demais comparações são falsas: a cadeia caía no else
+    assert interpret_acwr(float('nan'))[0] == legacy_acwr_zone(float('nan')) == "Zona de Perigo"
+
+def test_stress_anxiety_matches_legacy_chain():
+    grid = pd.DataFrame([(s, a) for s in SCORES for a in SCORES], columns=['stress_score', 'anxiety_score'])
+    expected = [legacy_stress_status(s, a) for s, a in grid.itertuples(index=False)]
+
+    assert [interpret_stress_anxiety(s, a)['status'] for s, a in grid.itertuples(index=False)] == expected
+    assert classify_stress_anxiety(grid).astype(str).tolist() == expected
+    assert classify_stress_anxiety(grid).cat.categories.tolist() == STRESS_ANXIETY_LEVELS
+
+def test_next_training_matches_legacy_chain():
+    cases = [{}, {'readiness_score': 9}, {'fatigue_level': 8}, {'readiness_score': 4.5, 'fatigue_level': 2}]
+    cases += [{'readiness_score': r, 'fatigue_level': f} for r in SCORES for f in SCORES]
+    for case in cases:
+        assert suggest_next_training(case)['tipo'] == legacy_next_training_type(case), case
+
+def test_interventions_match_legacy_chain():
+    rng = np.random.default_rng(15)
+    keys = ['stress_score', 'anxiety_score', 'confidence_level', 'focus_ability', 'team_cohesion']
+    records = [
+        {key: int(value) for key, value in zip(keys, rng.integers(1, 11, len(keys))) if rng.random() > 0.2}
+        for _ in range(300)
+    ]
+    expected = [legacy_intervention_groups(record) for record in records]
+
+    # O primeiro item de cada grupo identifica o ramo da cadeia original
+    def groups(interventions):
+        return interventions[::3]
+
+    assert [groups(suggest_psychological_interventions(record)) for record in records] == expected
+    bulk = suggest_psychological_interventions_bulk(pd.DataFrame(records, columns=keys))
+    assert [groups(interventions) for interventions in bulk] == expected
+
+def test_first_and_all_modes():
+    data = {'x': np.array([1, 5, 9])}
+    first = RuleSet([("x > 4", "médio"), ("x > 8", "alto")], default="baixo")
+    every = RuleSet([("x > 4", ["médio"]), ("x > 8", ["alto"])], default=[], mode="all")
+
+    assert first.evaluate(data) == ["baixo", "médio", "médio"]
+    assert first.match(data).tolist() == [2, 0, 0]
+    assert every.evaluate(data) == [[], ["médio"], ["médio", "alto"]]
+    assert every.masks(data).tolist() == [[False, True, True], [False, False, True]]
+
+def test_defaults_fill_missing_columns_and_nulls():
+    rules = RuleSet([("x > 4", "alto")], default="baixo", defaults={'x': 7})
+    assert rules.evaluate({'x': [1.0, np.nan]}) == ["baixo", "alto"]
+    assert rules.evaluate_one({}) == "alto"
+    assert rules.evaluate_one({'x': None}) == "alto"
+
+def test_evaluate_one_returns_a_copy():
+    rules = RuleSet([("x > 0", {"itens": ["a"]})], default={"itens": []})
+    rules.evaluate_one({'x': 1})["itens"].append("b")
+    assert rules.evaluate_one({'x': 1}) == {"itens": ["a"]}
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        RuleSet([], default=None, mode="any")
@@ -0,0 +1,360 @@
+"""
+Detecção de quedas atípicas em relação à linha de base do próprio atleta
+
+Cada métrica monitorada tem, por atleta, média e variância móveis
+exponenciais (migrations/007). Uma nova avaliação é comparada com a linha de
+base vigente (escore z) e depois incorporada a ela, em O(1). A versão em lote
+calcula as mesmas médias com pandas (ewm) sobre o histórico inteiro e
+regrava as avaliações sinalizadas.
+
+Enquanto a linha de base tem menos de WARMUP_ASSESSMENTS avaliações, nada é
+sinalizado.
+
+Gravações e recálculos de um mesmo atleta e domínio são serializados por um
+advisory lock (_lock). A leitura nunca recalcula: atletas com avaliações
+anteriores à migração 007 recebem a linha de base pelo comando abaixo,
+executado uma vez após aplicar as migrações.
+
+Uso:
+    python -m utils.anomaly --missing       # calcula só para quem ainda não tem linha de base
+    python -m utils.anomaly --rebuild-all   # recalcula linhas de base e sinalizações
+"""
+import argparse
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+from utils.database import advisory_xact_lock, connection, fetch_df, query_db
+
+BASELINE_SPAN = 28
+BASELINE_ALPHA = 2 / (BASELINE_SPAN + 1)
+WARMUP_ASSESSMENTS = 7
+Z_THRESHOLD = 2.0
+# Desvio mínimo (escalas de 1 a 10): evita alertas de atletas que sempre dão a mesma nota
+MIN_STD = 0.5
+RECENT_DAYS = 7
+
+# Por métrica: (sentido ruim: -1 queda / +1 aumento, rótulo, recomendação)
+ANOMALY_METRICS = {
+    'readiness': ('readiness_assessment', {
+        'readiness_score': (-1, "Prontidão", "Considere reduzir a intensidade do próximo treino."),
+        'sleep_quality': (-1, "Qualidade do sono", "Reveja a rotina de sono e de recuperação."),
+        'energy_level': (-1, "Nível de energia", "Verifique alimentação, hidratação e recuperação."),
+    }),
+    'training': ('training_assessment', {
+        'fatigue_level': (1, "Fadiga", "Recomenda-se período de recuperação."),
+        'performance_feeling': (-1, "Sensação de desempenho", "Revise a carga recente com o treinador."),
+    }),
+    'psychological': ('psychological_assessment', {
+        'stress_score': (1, "Estresse", "Considere técnicas de relaxamento."),
+        'anxiety_score': (1, "Ansiedade", "Recomenda-se consulta com psicólogo esportivo."),
+        'emotional_state': (-1, "Estado emocional", "Converse com o atleta sobre o momento atual."),
+        'confidence_level': (-1, "Confiança", "Reforce metas de curto prazo alcançáveis."),
+    }),
+}
+
+METRIC_INFO = {
+    metric: info
+    for _, metrics in ANOMALY_METRICS.values()
+    for metric, info in metrics.items()
+}
+
+def baseline_std(variance):
+    return max(float(np.sqrt(max(variance, 0.0))), MIN_STD)
+
+def anomaly_score(n, mean, variance, value):
+    """
+    Escore z de um valor em relação à linha de base
+
+    Returns:
+        float: (valor - média) / desvio, ou None durante o aquecimento
+    """
+    if n < WARMUP_ASSESSMENTS:
+        return None
+    return (value - mean) / baseline_std(variance)
+
+def is_anomaly(metric, z_score):
+    direction = METRIC_INFO[metric][0]
+    return z_score is not None and direction * z_score >= Z_THRESHOLD
+
+def update_baseline(n, mean, variance, value):
+    """
+    Incorpora um valor à média e variância exponenciais
+
+    Returns:
+        tuple: (n, média, variância) atualizados
+    """
+    if n == 0:
+        return 1, float(value), 0.0
+    diff = value - mean
+    increment = BASELINE_ALPHA * diff
+    return n + 1, mean + increment, (1 - BASELINE_ALPHA) * (variance + diff * increment)
+
+def baseline_series(values):
+    """
+    Linha de base vigente antes de cada valor, para o histórico inteiro
+
+    Args:
+        values: Series com os valores da métrica em ordem cronológica (sem nulos)
+
+    Returns:
+        DataFrame: n, média e desvio antes de cada valor e o escore z
+                   (NaN durante o aquecimento), com o índice de `values`
+    """
+    ewm = values.astype(float).ewm(alpha=BASELINE_ALPHA, adjust=False)
+    mean = ewm.mean().shift(1)
+    variance = ewm.var(bias=True).shift(1)
+    n = pd.Series(np.arange(len(values)), index=values.index)
+
+    std = np.sqrt(variance.clip(lower=0)).clip(lower=MIN_STD)
+    z_score = ((values - mean) / std).where(n >= WARMUP_ASSESSMENTS)
+    return pd.DataFrame({'n': n, 'mean': mean, 'std': std, 'z_score': z_score})
+
+def _lock(cur, user_id, domain):
+    # Mesma chave na gravação e no recálculo: um nunca sobrescreve o outro
+    advisory_xact_lock(cur, f"athlete_baseline:{domain}", user_id)
+
+def _flag(metric, day, value, mean, std, z_score):
+    direction, label, advice = METRIC_INFO[metric]
+    return {
+        'metric': metric, 'date': day, 'value': float(value),
+        'baseline_mean': float(mean), 'baseline_std': float(std),
+        'z_score': float(z_score), 'direction': direction,
+        'label': label, 'advice': advice
+    }
+
+def record_assessment_anomalies(cur, user_id, domain, data):
+    """
+    Compara uma nova avaliação com a linha de base do atleta e a atualiza
+
+    Roda no cursor de quem grava a avaliação, na mesma transação do INSERT, e
+    segura o lock do atleta e domínio até quem chama confirmar. Avaliações com data anterior à última
+    incorporada recalculam a linha de base do domínio a partir do histórico,
+    que já inclui a avaliação nova.
+
+    Args:
+        cur: Cursor da transação que grava a avaliação
+        user_id: ID do atleta
+        domain: 'readiness', 'training' ou 'psychological'
+        data: Dicionário da avaliação (com 'date' e as métricas do domínio)
+
+    Returns:
+        list: Sinalizações da avaliação (ver get_recent_anomalies)
+    """
+    _, metrics = ANOMALY_METRICS[domain]
+    flags = []
+    out_of_order = False
+    _lock(cur, user_id, domain)
+
+    for metric in metrics:
+        value = data.get(metric)
+        if value is None:
+            continue
+        value = float(value)
+        cur.execute("""
+            INSERT INTO athlete_baseline (user_id, metric) VALUES (%s, %s)
+            ON CONFLICT (user_id, metric) DO NOTHING
+        """, (user_id, metric))
+        cur.execute("""
+            SELECT n, mean, variance, last_date FROM athlete_baseline
+            WHERE user_id = %s AND metric = %s
+        """, (user_id, metric))
+        n, mean, variance, last_date = cur.fetchone()
+        if last_date is not None and data['date'] < last_date:
+            out_of_order = True
+            continue
+
+        z_score = anomaly_score(n, mean, variance, value)
+        if is_anomaly(metric, z_score):
+            flag = _flag(metric, data['date'], value, mean, baseline_std(variance), z_score)
+            cur.execute("""
+                INSERT INTO assessment_anomaly
+                (user_id, metric, date, value, baseline_mean, baseline_std, z_score)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ON CONFLICT (user_id, metric, date) DO UPDATE SET
+                    value = EXCLUDED.value,
+                    baseline_mean = EXCLUDED.baseline_mean,
+                    baseline_std = EXCLUDED.baseline_std,
+                    z_score = EXCLUDED.z_score
+            """, (user_id, metric, flag['date'], flag['value'],
+                  flag['baseline_mean'], flag['baseline_std'], flag['z_score']))
+            flags.append(flag)
+
+        n, mean, variance = update_baseline(n, mean, variance, value)
+        cur.execute("""
+            UPDATE athlete_baseline
+            SET n = %s, mean = %s, variance = %s, last_date = %s,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE user_id = %s AND metric = %s
+        """, (n, mean, variance, data['date'], user_id, metric))
+
+    if out_of_order:
+        flags = [
+            _flag(metric, day, value, mean, std, z_score)
+            for _, metric, day, value, mean, std, z_score in _rebuild_baselines(cur, user_id, domain)
+            if day == data['date']
+        ]
+    return flags
+
+def _rebuild_baselines(cur, user_id, domain):
+    # Lê o histórico e regrava linhas de base e sinalizações no mesmo cursor,
+    # sob o lock do atleta e domínio
+    table, metrics = ANOMALY_METRICS[domain]
+    _lock(cur, user_id, domain)
+    cur.execute(f"""
+        SELECT date, {', '.join(metrics)}
+        FROM {table}
+        WHERE user_id = %s
+        ORDER BY date, id
+    """, (user_id,))
+    history = fetch_df(cur)
+
+    baselines = []
+    flags = []
+    for metric in metrics:
+        observed = history[['date', metric]].dropna()
+        if observed.empty:
+            continue
+        values = observed[metric].astype(float).reset_index(drop=True)
+        series = baseline_series(values)
+
+        final = values.ewm(alpha=BASELINE_ALPHA, adjust=False)
+        baselines.append((
+            user_id, metric, len(values),
+            float(final.mean().iloc[-1]), float(final.var(bias=True).iloc[-1]),
+            observed['date'].iloc[-1].date()
+        ))
+
+        direction = METRIC_INFO[metric][0]
+        flagged = series[direction * series['z_score'] >= Z_THRESHOLD]
+        dates = observed['date'].dt.date.reset_index(drop=True)
+        # Uma sinalização por dia: vale a última avaliação sinalizada, como no registro online
+        by_day = {}
+        for position, row in flagged.iterrows():
+            by_day[dates[position]] = (user_id, metric, dates[position], float(values[position]),
+                                       float(row['mean']), float(row['std']), float(row['z_score']))
+        flags.extend(by_day.values())
+
+    cur.execute("DELETE FROM athlete_baseline WHERE user_id = %s AND metric = ANY(%s)",
+                (user_id, list(metrics)))
+    cur.execute("DELETE FROM assessment_anomaly WHERE user_id = %s AND metric = ANY(%s)",
+                (user_id, list(metrics)))
+    if baselines:
+        execute_values(cur, """
+            INSERT INTO athlete_baseline (user_id, metric, n, mean, variance, last_date)
+            VALUES %s
+        """, baselines)
+    if flags:
+        execute_values(cur, """
+            INSERT INTO assessment_anomaly
+            (user_id, metric, date, value, baseline_mean, baseline_std, z_score)
+            VALUES %s
+        """, flags)
+    return flags
+
+def rebuild_baselines(user_id, domain):
+    """
+    Recalcula linhas de base e sinalizações do domínio a partir do histórico
+
+    A leitura do histórico e a regravação acontecem em uma transação, sob o
+    mesmo lock das gravações. Usado após importações, re-pontuações ou para
+    preencher o histórico de quem já tinha avaliações (--missing).
+
+    Args:
+        user_id: ID do atleta
+        domain: 'readiness', 'training' ou 'psychological'
+    """
+    with connection() as conn:
+        with conn.cursor() as cur:
+            _rebuild_baselines(cur, user_id, domain)
+        conn.commit()
+
+def get_recent_anomalies(user_id, days=RECENT_DAYS, as_of=None):
+    """
+    Sinalizações do atleta nos últimos `days` dias, da mais recente para a mais antiga
+
+    Só lê: atletas sem linha de base não têm sinalizações até o --missing.
+
+    Returns:
+        list: Dicionários com metric, date, value, baseline_mean, baseline_std,
+              z_score, direction, label e advice
+    """
+    as_of = as_of or date.today()
+    rows = query_db("""
+        SELECT metric, date, value, baseline_mean, baseline_std, z_score
+        FROM assessment_anomaly
+        WHERE user_id = %s AND date BETWEEN %s AND %s
+        ORDER BY date DESC, metric
+    """, (user_id, as_of - timedelta(days=days - 1), as_of))
+    return [
+        _flag(row['metric'], row['date'], row['value'], row['baseline_mean'],
+              row['baseline_std'], row['z_score'])
+        for row in rows if row['metric'] in METRIC_INFO
+    ]
+
+def get_warming_up_metrics(user_id):
+    """
+    Métricas cuja linha de base ainda está em aquecimento
+
+    Returns:
+        dict: Rótulo -> número de avaliações incorporadas (menos de WARMUP_ASSESSMENTS)
+    """
+    rows = query_db("""
+        SELECT metric, n FROM athlete_baseline
+        WHERE user_id = %s AND n < %s
+    """, (user_id, WARMUP_ASSESSMENTS))
+    return {METRIC_INFO[row['metric']][1]: row['n'] for row in rows if row['metric'] in METRIC_INFO}
+
+def describe_anomaly(flag):
+    kind = "Queda atípica" if flag['direction'] < 0 else "Aumento atípico"
+    return (f"⚠️ {kind} de {flag['label'].lower()} em {flag['date']:%d/%m}: "
+            f"{flag['value']:.1f} (habitual {flag['baseline_mean']:.1f} ± {flag['baseline_std']:.1f}). "
+            f"{flag['advice']}")
+
+def missing_baselines():
+    """
+    Atletas e domínios com avaliações mas sem nenhuma linha de base
+
+    Returns:
+        list: Tuplas (user_id, domain)
+    """
+    pending = []
+    for domain, (table, metrics) in ANOMALY_METRICS.items():
+        rows = query_db(f"""
+            SELECT DISTINCT a.user_id FROM {table} a
+            WHERE NOT EXISTS (
+                SELECT 1 FROM athlete_baseline b
+                WHERE b.user_id = a.user_id AND b.metric = ANY(%s)
+            )
+            ORDER BY a.user_id
+        """, (list(metrics),))
+        pending.extend((row['user_id'], domain) for row in rows)
+    return pending
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalcula linhas de base e sinalizações de anomalias")
+    parser.add_argument('--rebuild-all', action='store_true', help="recalcula todos os atletas")
+    parser.add_argument('--missing', action='store_true',
+                        help="calcula só atletas e domínios sem linha de base")
+    parser.add_argument('--user-id', type=int)
+    args = parser.parse_args(argv)
+
+    if args.user_id is not None:
+        pending = [(args.user_id, domain) for domain in ANOMALY_METRICS]
+    elif args.rebuild_all:
+        pending = [(row['id'], domain) for row in query_db("SELECT id FROM athlete_users ORDER BY id")
+                   for domain in ANOMALY_METRICS]
+    elif args.missing:
+        pending = missing_baselines()
+    else:
+        parser.error("informe --user-id, --missing ou --rebuild-all")
+
+    for user_id, domain in pending:
+        rebuild_baselines(user_id, domain)
+    user_ids = sorted({user_id for user_id, _ in pending})
+    total = query_db("SELECT COUNT(*) AS n FROM assessment_anomaly WHERE user_id = ANY(%s)", (user_ids,))
+    print(f"Linhas de base recalculadas para {len(user_ids)} atleta(s); "
+          f"{total[0]['n']} avaliações sinalizadas.")
+
+if __name__ == "__main__":
+    main()
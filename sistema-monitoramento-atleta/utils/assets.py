@@ -0,0 +1,222 @@
+"""
+Imagens de cabeçalho servidas localmente
+
+As fotos do Pexels usadas no topo das páginas são baixadas uma vez, reduzidas
+às larguras de exibição e recomprimidas em WebP e JPEG dentro de static/img/.
+O Streamlit serve essa pasta em app/static/ (server.enableStaticServing em
+.streamlit/config.toml) e o navegador escolhe a largura e o formato pelo
+<picture>/srcset. Os nomes dos arquivos levam o hash do conteúdo, então uma
+imagem nova nunca reaproveita a URL antiga; o Streamlit envia ETag e
+Last-Modified, e um proxy na frente do app pode marcar app/static/img/ como
+imutável.
+
+O navegador nunca busca imagens fora do servidor. Se o deploy não executou o
+build, o primeiro hero_image o dispara uma vez, em segundo plano, no próprio
+servidor; até ele terminar a página é exibida sem a imagem.
+
+Build (a partir de sistema-monitoramento-atleta/):
+    python -m utils.assets                      # baixa só o que falta
+    python -m utils.assets --force              # refaz todas
+    python -m utils.assets --source originais/  # sem rede, a partir de <nome>.jpeg locais
+"""
+import argparse
+import functools
+import hashlib
+import html
+import io
+import json
+import logging
+import os
+import threading
+import urllib.request
+import streamlit as st
+
+logger = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STATIC_DIR = os.path.join(APP_DIR, "static", "img")
+MANIFEST_PATH = os.path.join(STATIC_DIR, "manifest.json")
+STATIC_URL = "app/static/img"
+
+HERO_IMAGES = {
+    'inicio': "https://images.pexels.com/photos/2294361/pexels-photo-2294361.jpeg",
+    'prontidao': "https://images.pexels.com/photos/864939/pexels-photo-864939.jpeg",
+    'treino': "https://images.pexels.com/photos/841130/pexels-photo-841130.jpeg",
+    'psicologico': "https://images.pexels.com/photos/3755761/pexels-photo-3755761.jpeg",
+    'dashboard': "https://images.pexels.com/photos/1552242/pexels-photo-1552242.jpeg",
+    'relatorios': "https://images.pexels.com/photos/669577/pexels-photo-669577.jpeg",
+}
+
+# Larguras em pixels: coluna estreita, layout "wide" e telas de alta densidade
+DISPLAY_WIDTHS = (640, 1280, 1920)
+FORMATS = {'webp': {'quality': 80, 'method': 6}, 'jpeg': {'quality': 82, 'optimize': True, 'progressive': True}}
+DOWNLOAD_TIMEOUT = 30
+
+@functools.lru_cache(maxsize=1)
+def _manifest(mtime):
+    # mtime entra na chave: um novo build é lido sem reiniciar o app
+    with open(MANIFEST_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+def load_manifest():
+    """
+    Arquivos gerados pelo build
+
+    Returns:
+        dict: {nome: {formato: {largura: arquivo}}}, vazio se o build não rodou
+    """
+    try:
+        return _manifest(os.path.getmtime(MANIFEST_PATH))
+    except (OSError, ValueError):
+        return {}
+
+def _srcset(files):
+    return ", ".join(f"{STATIC_URL}/{filename} {width}w" for width, filename in sorted(
+        files.items(), key=lambda item: int(item[0])
+    ))
+
+def hero_image(name, alt=""):
+    """
+    Exibe a imagem de cabeçalho da página a partir de static/img
+
+    Args:
+        name: Chave em HERO_IMAGES
+        alt: Texto alternativo
+    """
+    variants = load_manifest().get(name)
+    if not variants:
+        _start_background_build()
+        return
+
+    jpeg = variants['jpeg']
+    fallback = f"{STATIC_URL}/{jpeg[max(jpeg, key=int)]}"
+    st.html(
+        f'<picture>'
+        f'<source type="image/webp" srcset="{_srcset(variants["webp"])}" sizes="100vw">'
+        f'<img src="{fallback}" srcset="{_srcset(jpeg)}" sizes="100vw" alt="{html.escape(alt)}" '
+        f'style="width:100%;height:auto" decoding="async">'
+        f'</picture>'
+    )
+
+def _build_missing():
+    # Uma imagem por vez: uma falha de rede não impede as demais
+    for name in HERO_IMAGES:
+        try:
+            build_assets(names=[name])
+        except Exception:
+            logger.exception("Falha ao gerar a imagem '%s' em %s", name, STATIC_DIR)
+
+@st.cache_resource(show_spinner=False)
+def _start_background_build():
+    # Uma vez por processo; sem build no deploy, o primeiro acesso gera o que falta
+    logger.warning("static/img sem imagens geradas; executando python -m utils.assets em segundo plano")
+    thread = threading.Thread(target=_build_missing, name="hero-assets-build", daemon=True)
+    thread.start()
+    return thread
+
+def _download(url):
+    request = urllib.request.Request(url, headers={"User-Agent": "sistema-monitoramento-atleta"})
+    with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+        return response.read()
+
+def render_variants(name, original):
+    """
+    Reduz e recomprime uma imagem em todas as larguras e formatos
+
+    Args:
+        name: Chave da imagem
+        original: Bytes da imagem original
+
+    Returns:
+        dict: {formato: {largura: (arquivo, bytes)}}
+    """
+    from PIL import Image  # só o build precisa do Pillow
+
+    image = Image.open(io.BytesIO(original)).convert("RGB")
+    variants = {}
+    for fmt, options in FORMATS.items():
+        variants[fmt] = {}
+        for width in DISPLAY_WIDTHS:
+            # Nunca amplia: imagens menores que a largura ficam no tamanho original
+            target = min(width, image.width)
+            height = round(image.height * target / image.width)
+            resized = image.resize((target, height), Image.LANCZOS) if target != image.width else image
+            buffer = io.BytesIO()
+            resized.save(buffer, fmt.upper(), **options)
+            data = buffer.getvalue()
+            digest = hashlib.sha256(data).hexdigest()[:10]
+            extension = "jpg" if fmt == "jpeg" else fmt
+            variants[fmt][str(width)] = (f"{name}-{width}.{digest}.{extension}", data)
+    return variants
+
+def build_assets(force=False, source_dir=None, names=None):
+    """
+    Baixa as imagens de HERO_IMAGES e grava as variantes em static/img
+
+    Args:
+        force: Se True, refaz imagens que já estão no manifest
+        source_dir: Pasta com os originais (<nome>.jpeg), para builds sem rede
+        names: Imagens a processar (padrão: todas)
+
+    Returns:
+        dict: {nome: (bytes do original, bytes gravados)} das imagens processadas
+    """
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    manifest = dict(load_manifest())
+    results = {}
+
+    for name in names or HERO_IMAGES:
+        if name in manifest and not force:
+            continue
+        if source_dir:
+            with open(os.path.join(source_dir, f"{name}.jpeg"), "rb") as f:
+                original = f.read()
+        else:
+            original = _download(HERO_IMAGES[name])
+
+        variants = render_variants(name, original)
+        previous = manifest.get(name, {})
+        manifest[name] = {}
+        written = 0
+        for fmt, files in variants.items():
+            manifest[name][fmt] = {}
+            for width, (filename, data) in files.items():
+                with open(os.path.join(STATIC_DIR, filename), "wb") as f:
+                    f.write(data)
+                manifest[name][fmt][width] = filename
+                written += len(data)
+
+        # Remove as variantes antigas que não foram regeradas com o mesmo nome
+        current = {filename for files in manifest[name].values() for filename in files.values()}
+        for files in previous.values():
+            for filename in set(files.values()) - current:
+                try:
+                    os.remove(os.path.join(STATIC_DIR, filename))
+                except OSError:
+                    pass
+
+        results[name] = (len(original), written)
+
+    with open(MANIFEST_PATH, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera as imagens de cabeçalho em static/img")
+    parser.add_argument('--force', action='store_true', help="refaz imagens já geradas")
+    parser.add_argument('--source', help="pasta com os originais <nome>.jpeg (sem rede)")
+    parser.add_argument('names', nargs='*', help=f"imagens a gerar (padrão: todas): {', '.join(HERO_IMAGES)}")
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(HERO_IMAGES)
+    if unknown:
+        parser.error(f"imagens desconhecidas: {', '.join(sorted(unknown))}")
+
+    results = build_assets(args.force, args.source, args.names or None)
+    for name, (original, written) in results.items():
+        print(f"{name}: original {original / 1024:.0f} KB -> {len(DISPLAY_WIDTHS) * len(FORMATS)} "
+              f"variantes, {written / 1024:.0f} KB no total")
+    if not results:
+        print("Nada a fazer: todas as imagens já estão em static/img (use --force para refazer)")
+
+if __name__ == "__main__":
+    main()
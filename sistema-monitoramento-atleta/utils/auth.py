@@ -1,5 +1,3 @@
-import bcrypt
-import jwt
 import datetime
 import streamlit as st
 from utils.database import query_db
@@ -11,6 +9,9 @@ def hash_password(password):
     """
     Cria um hash seguro da senha
     """
+    # bcrypt e jwt são importados só quando usados (login e registro), não a cada página
+    import bcrypt
+
     try:
         return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
     except Exception as e:
@@ -21,6 +22,8 @@ def check_password(password, hashed):
     """
     Verifica se a senha corresponde ao hash
     """
+    import bcrypt
+
     try:
         return bcrypt.checkpw(password.encode('utf-8'), hashed)
     except Exception as e:
@@ -31,6 +34,8 @@ def create_token(user_id):
     """
     Cria um token JWT para o usuário
     """
+    import jwt
+
     try:
         payload = {
             'user_id': user_id,
@@ -45,6 +50,8 @@ def verify_token(token):
     """
     Verifica e decodifica um token JWT
     """
+    import jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])
         return payload['user_id']
@@ -150,3 +157,21 @@ def get_user_info(user_id):
     except Exception as e:
         st.error(f"Erro ao obter informações do usuário: {str(e)}")
         return None
+
+def is_admin(user_id):
+    """
+    Indica se o usuário pode ver o diagnóstico do banco de dados
+
+    Args:
+        user_id: ID do usuário
+
+    Returns:
+        bool: True se athlete_users.is_admin estiver marcado
+    """
+    if user_id is None:
+        return False
+    try:
+        result = query_db("SELECT is_admin FROM athlete_users WHERE id = %s", (user_id,))
+        return bool(result and result[0]['is_admin'])
+    except Exception:
+        return False
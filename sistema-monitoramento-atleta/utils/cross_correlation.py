@@ -0,0 +1,136 @@
+"""
+Correlação cruzada com defasagem entre séries diárias (ex.: carga -> prontidão)
+
+Para cada defasagem k = 0..max_lag calcula a correlação de Pearson entre
+x[t] e y[t + k], usando só os dias em que as duas séries têm valor. As
+somas necessárias (n, Σx, Σy, Σxy, Σx², Σy² por defasagem) são todas
+correlações cruzadas de séries com zeros nos dias sem dado, calculadas juntas
+por FFT em O(T log T), em vez de O(T x max_lag) com um laço por defasagem.
+
+As funções aceitam uma série (T) ou uma matriz atletas x dias (A x T): as
+linhas são processadas de uma vez, o que mantém o squad inteiro em uma única
+chamada.
+"""
+import numpy as np
+import pandas as pd
+from utils.timeline import get_athlete_timeline
+
+MAX_LAG_DAYS = 7
+MIN_PAIRS = 10
+
+# Respostas à carga de treino mostradas no relatório
+LAG_RESPONSES = {
+    'readiness_score': 'Prontidão',
+    'fatigue_level': 'Fadiga',
+    'stress_score': 'Estresse',
+}
+
+def _cross_sums(a, b, max_lag):
+    # Σ_t a[..., t] * b[..., t + k] para k = 0..max_lag, por FFT
+    length = a.shape[-1]
+    size = 1 << (2 * length - 1).bit_length()
+    spectrum = np.conj(np.fft.rfft(a, size)) * np.fft.rfft(b, size)
+    return np.fft.irfft(spectrum, size)[..., :max_lag + 1]
+
+def _mean(values, valid):
+    count = np.maximum(valid.sum(axis=-1, keepdims=True), 1)
+    return np.where(valid, values, 0.0).sum(axis=-1, keepdims=True) / count
+
+def lagged_correlation(x, y, max_lag=MAX_LAG_DAYS, min_pairs=MIN_PAIRS):
+    """
+    Correlação entre x[t] e y[t + k] para cada defasagem k
+
+    Args:
+        x: Série que antecede (T) ou matriz atletas x dias (A x T); NaN = sem dado
+        y: Série de resposta, com o mesmo formato de x
+        max_lag: Maior defasagem, em dias
+        min_pairs: Mínimo de dias pareados para a correlação ser calculada
+
+    Returns:
+        tuple: (correlações, pares), arrays (..., max_lag + 1); a correlação é
+               NaN com menos de min_pairs pares ou sem variação
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if x.shape != y.shape:
+        raise ValueError("As séries precisam ter o mesmo formato")
+    max_lag = min(max_lag, x.shape[-1] - 1)
+
+    valid_x = ~np.isnan(x)
+    valid_y = ~np.isnan(y)
+    # Centralizar antes das somas evita cancelamento; Pearson não muda com o deslocamento
+    x = np.where(valid_x, x - _mean(x, valid_x), 0.0)
+    y = np.where(valid_y, y - _mean(y, valid_y), 0.0)
+    mask_x = valid_x.astype(float)
+    mask_y = valid_y.astype(float)
+
+    # As seis correlações cruzadas em uma única chamada de FFT
+    left = np.stack([mask_x, x, mask_x, x, x * x, mask_x])
+    right = np.stack([mask_y, mask_y, y, y, mask_y, y * y])
+    n, sum_x, sum_y, sum_xy, sum_xx, sum_yy = _cross_sums(left, right, max_lag)
+
+    n = np.rint(n)
+    cov = n * sum_xy - sum_x * sum_y
+    var_x = n * sum_xx - sum_x ** 2
+    var_y = n * sum_yy - sum_y ** 2
+    scale = np.maximum(np.abs(n * sum_xx), np.abs(n * sum_yy))
+    # Variâncias no nível do erro de arredondamento da FFT contam como zero
+    tolerance = 1e-9 * np.maximum(scale, 1.0)
+    defined = (n >= min_pairs) & (var_x > tolerance) & (var_y > tolerance)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = cov / np.sqrt(var_x * var_y)
+    correlation = np.where(defined, np.clip(correlation, -1.0, 1.0), np.nan)
+    return correlation, n.astype(int)
+
+def timeline_lagged_correlation(timeline, driver, responses, max_lag=MAX_LAG_DAYS,
+                                min_pairs=MIN_PAIRS):
+    """
+    Correlações defasadas entre uma métrica e várias respostas da linha do tempo
+
+    Args:
+        timeline: Linha do tempo diária (get_athlete_timeline), um dia por linha
+        driver: Coluna que antecede (ex.: 'training_load')
+        responses: Colunas de resposta
+        max_lag: Maior defasagem, em dias
+
+    Returns:
+        DataFrame: Índice 'defasagem' (dias), uma coluna por resposta
+    """
+    x = timeline[driver].to_numpy(dtype=float, na_value=np.nan)
+    result = {}
+    for response in responses:
+        y = timeline[response].to_numpy(dtype=float, na_value=np.nan)
+        result[response] = lagged_correlation(x, y, max_lag, min_pairs)[0]
+    frame = pd.DataFrame(result)
+    frame.index.name = 'defasagem'
+    return frame
+
+def squad_lagged_correlation(timeline, driver, response, max_lag=MAX_LAG_DAYS,
+                             min_pairs=MIN_PAIRS):
+    """
+    Correlações defasadas de cada atleta do squad em uma única passada
+
+    Args:
+        timeline: Resultado de utils.squad.get_squad_timeline (uma linha por
+                  atleta e dia, ordenada por atleta e data)
+
+    Returns:
+        DataFrame: Uma linha por atleta (user_id), uma coluna por defasagem
+    """
+    athletes = pd.Index(timeline['user_id'].unique(), name='user_id')
+    if athletes.empty:
+        return pd.DataFrame()
+    x = timeline[driver].to_numpy(dtype=float, na_value=np.nan).reshape(len(athletes), -1)
+    y = timeline[response].to_numpy(dtype=float, na_value=np.nan).reshape(len(athletes), -1)
+    correlation, _ = lagged_correlation(x, y, max_lag, min_pairs)
+    return pd.DataFrame(correlation, index=athletes,
+                        columns=pd.RangeIndex(correlation.shape[-1], name='defasagem'))
+
+def get_lagged_correlation(user_id, start_date, end_date, driver='training_load',
+                           responses=tuple(LAG_RESPONSES), max_lag=MAX_LAG_DAYS):
+    """
+    Correlações defasadas do atleta no período (ver timeline_lagged_correlation)
+    """
+    timeline = get_athlete_timeline(user_id, start_date, end_date)
+    return timeline_lagged_correlation(timeline, driver, list(responses), max_lag)
@@ -1,30 +1,857 @@
+import io
 import os
+import sys
+import logging
+import re
+import time
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict, deque
+from contextlib import closing, contextmanager
+import numpy as np
+import pandas as pd
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
+from psycopg2.pool import PoolError
+from psycopg2.extras import RealDictCursor, execute_values
 from dotenv import load_dotenv
 
 load_dotenv()
 
-def get_connection():
-    conn = psycopg2.connect(
+logger = logging.getLogger(__name__)
+
+# Configuração do pool de conexões (compartilhado por todas as sessões do Streamlit)
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN", 1))
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX", 10))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+POOL_HEALTHCHECK_INTERVAL = float(os.getenv("DB_POOL_HEALTHCHECK_INTERVAL", 30))
+
+# Cache de resultados de consultas (query_db(..., cache=True))
+CACHE_MAX_ENTRIES = int(os.getenv("DB_CACHE_MAX_ENTRIES", 512))
+CACHE_TTL = float(os.getenv("DB_CACHE_TTL", 300))
+
+# Instrumentação das consultas
+SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", 200))
+QUERY_STATS_SAMPLES = int(os.getenv("DB_QUERY_STATS_SAMPLES", 1000))
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def _connect():
+    return psycopg2.connect(
         host=os.getenv("DB_HOST"),
         database=os.getenv("DB_NAME"),
         user=os.getenv("DB_USER"),
         password=os.getenv("DB_PASSWORD"),
         port=os.getenv("DB_PORT", 5432)
     )
-    return conn
 
-def query_db(query, params=None):
+class ConnectionPool:
+    """
+    Pool de conexões PostgreSQL seguro para threads
+
+    Mantém entre `min_size` e `max_size` conexões abertas, verifica a saúde
+    das conexões ociosas antes de entregá-las e bloqueia por até `timeout`
+    segundos quando todas estão em uso.
+    """
+
+    def __init__(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE,
+                 timeout=POOL_TIMEOUT, healthcheck_interval=POOL_HEALTHCHECK_INTERVAL):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("Tamanhos de pool inválidos")
+
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.healthcheck_interval = healthcheck_interval
+
+        self._idle = []  # lista de (conexão, instante em que foi devolvida)
+        self._in_use = set()
+        self._cond = threading.Condition()
+
+        self._checkouts = 0
+        self._timeouts = 0
+        self._discarded = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+        for _ in range(min_size):
+            self._idle.append((_connect(), time.monotonic()))
+
+    def _size(self):
+        return len(self._idle) + len(self._in_use)
+
+    def _is_healthy(self, conn, idle_since):
+        if conn.closed:
+            return False
+        if time.monotonic() - idle_since < self.healthcheck_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn):
+        self._discarded += 1
+        try:
+            conn.close()
+        except psycopg2.Error:
+            pass
+
+    def getconn(self):
+        """
+        Retira uma conexão do pool
+
+        Returns:
+            connection: Conexão psycopg2 pronta para uso
+
+        Raises:
+            PoolError: Se nenhuma conexão ficar disponível dentro do timeout
+        """
+        start = time.monotonic()
+        deadline = start + self.timeout
+
+        while True:
+            with self._cond:
+                while not self._idle and self._size() >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolError(
+                            f"Nenhuma conexão disponível após {self.timeout:.1f}s "
+                            f"({self.max_size} em uso)"
+                        )
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, idle_since = self._idle.pop()
+                else:
+                    conn, idle_since = None, None
+                # Reserva a vaga antes de sair do lock
+                slot = conn if conn is not None else object()
+                self._in_use.add(slot)
+
+            if conn is None:
+                try:
+                    conn = _connect()
+                except Exception:
+                    self._release_slot(slot)
+                    raise
+            elif not self._is_healthy(conn, idle_since):
+                self._release_slot(slot)
+                self._discard(conn)
+                continue
+
+            with self._cond:
+                self._in_use.discard(slot)
+                return self._checkout(conn, start)
+
+    def _release_slot(self, slot):
+        with self._cond:
+            self._in_use.discard(slot)
+            self._cond.notify()
+
+    def _checkout(self, conn, start):
+        wait = time.monotonic() - start
+        self._in_use.add(conn)
+        self._checkouts += 1
+        self._total_wait += wait
+        self._max_wait = max(self._max_wait, wait)
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """
+        Devolve uma conexão ao pool
+
+        Args:
+            conn: Conexão obtida com getconn()
+            discard: Se True, fecha a conexão em vez de reutilizá-la
+        """
+        if not discard and not conn.closed:
+            try:
+                # Garante que nenhuma transação pendente vaze para o próximo uso
+                conn.rollback()
+            except psycopg2.Error:
+                discard = True
+
+        with self._cond:
+            self._in_use.discard(conn)
+            if discard or conn.closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self):
+        with self._cond:
+            for conn, _ in self._idle:
+                conn.close()
+            self._idle = []
+
+    def stats(self):
+        """
+        Retorna estatísticas de uso do pool
+
+        Returns:
+            dict: Conexões em uso e ociosas, limites e tempos de espera (segundos)
+        """
+        with self._cond:
+            return {
+                'in_use': len(self._in_use),
+                'idle': len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self._checkouts,
+                'timeouts': self._timeouts,
+                'discarded': self._discarded,
+                'total_wait': self._total_wait,
+                'avg_wait': self._total_wait / self._checkouts if self._checkouts else 0.0,
+                'max_wait': self._max_wait,
+            }
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+# Pools herdados de um fork: mantidos referenciados para que o coletor de lixo
+# não os feche, o que encerraria no servidor as conexões do processo pai
+_inherited_pools = []
+
+def get_pool():
+    global _pool, _pool_pid
+    # Conexões não podem ser compartilhadas entre processos: um processo filho
+    # (ex.: ProcessPoolExecutor) abre um pool próprio na primeira consulta
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                if _pool is not None:
+                    _inherited_pools.append(_pool)
+                _pool = ConnectionPool()
+                _pool_pid = os.getpid()
+    return _pool
+
+def get_pool_stats():
+    return get_pool().stats()
+
+def get_connection():
+    return get_pool().getconn()
+
+def release_connection(conn, discard=False):
+    get_pool().putconn(conn, discard=discard)
+
+@contextmanager
+def connection():
+    """
+    Empresta uma conexão do pool pelo tempo do bloco `with`
+
+    Conexões que falharam (ex.: rede caiu) são descartadas em vez de voltarem ao pool.
+    """
     conn = get_connection()
+    broken = False
     try:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+        yield conn
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        broken = True
+        raise
+    finally:
+        release_connection(conn, discard=broken)
+
+def advisory_xact_lock(cur, name, key):
+    """
+    Bloqueio consultivo (pg_advisory_xact_lock) até o fim da transação do cursor
+
+    Serializa transações que recalculam o mesmo dado derivado (ex.: os
+    momentos de um atleta em um domínio) sem travar linhas nem tabelas.
+
+    Args:
+        cur: Cursor da transação
+        name: Nome do recurso; vira a primeira chave via hashtext
+        key: Chave inteira dentro do recurso (ex.: user_id)
+    """
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s), %s)", (name, key))
+
+_TABLE_PATTERN = re.compile(r"\b(?:from|join|into|update)\s+([a-z_][\w.]*)", re.IGNORECASE)
+
+def _tables_in(query):
+    return frozenset(name.lower().split(".")[-1] for name in _TABLE_PATTERN.findall(query))
+
+def _normalize_query(query):
+    return " ".join(query.split())
+
+def _freeze_params(params):
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return tuple(sorted(params.items()))
+    return tuple(params)
+
+class QueryCache:
+    """
+    Cache LRU com expiração (TTL) para resultados de SELECT
+
+    Cada entrada guarda as tabelas lidas pela consulta e, opcionalmente, o
+    atleta a que os dados pertencem, para que escritas invalidem apenas o
+    que foi afetado.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        # Incrementada a cada invalidação; impede que uma leitura iniciada
+        # antes de uma escrita grave no cache um resultado já desatualizado
+        self._generation = 0
+
+    @staticmethod
+    def make_key(query, params):
+        return (_normalize_query(query), _freeze_params(params))
+
+    def get(self, key):
+        """
+        Returns:
+            tuple: (encontrado, valor)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+            expires_at, value, _, _ = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self._misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return True, value
+
+    def generation(self):
+        with self._lock:
+            return self._generation
+
+    def set(self, key, value, tables, user_id=None, ttl=None, generation=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._entries[key] = (expires_at, value, tables, user_id)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, table=None, user_id=None):
+        """
+        Remove entradas que leem `table` e pertencem a `user_id`
+
+        Entradas sem atleta associado são removidas sempre que a tabela muda.
+        Sem argumentos, limpa o cache inteiro.
+
+        Returns:
+            int: Número de entradas removidas
+        """
+        with self._lock:
+            self._generation += 1
+            stale = [
+                key for key, (_, _, tables, owner) in self._entries.items()
+                if (table is None or table in tables)
+                and (user_id is None or owner is None or owner == user_id)
+            ]
+            for key in stale:
+                del self._entries[key]
+            self._invalidations += len(stale)
+            return len(stale)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+            }
+
+_cache = QueryCache()
+
+def get_cache_stats():
+    return _cache.stats()
+
+def invalidate_cache(table=None, user_id=None):
+    return _cache.invalidate(table, user_id)
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+class QueryStats:
+    """
+    Agrega tempos de execução por (chamador, consulta) e mantém o log de consultas lentas
+
+    Guarda as últimas `samples` medições de cada consulta para o cálculo de percentis.
+    """
+
+    def __init__(self, samples=QUERY_STATS_SAMPLES, slow_query_ms=SLOW_QUERY_MS):
+        self.samples = samples
+        self.slow_query_ms = slow_query_ms
+        self._stats = {}
+        self._slow = deque(maxlen=100)
+        self._lock = threading.Lock()
+
+    def _entry(self, caller, query):
+        key = (caller, query)
+        entry = self._stats.get(key)
+        if entry is None:
+            entry = self._stats[key] = {
+                'calls': 0,
+                'cache_hits': 0,
+                'rows': 0,
+                'total_ms': 0.0,
+                'acquire_ms': 0.0,
+                'durations': deque(maxlen=self.samples),
+            }
+        return entry
+
+    def record(self, caller, query, total_ms, acquire_ms, rows):
+        query = _normalize_query(query)
+        with self._lock:
+            entry = self._entry(caller, query)
+            entry['calls'] += 1
+            entry['rows'] += rows or 0
+            entry['total_ms'] += total_ms
+            entry['acquire_ms'] += acquire_ms
+            entry['durations'].append(total_ms)
+
+            if total_ms >= self.slow_query_ms:
+                self._slow.append({
+                    'timestamp': time.time(),
+                    'caller': caller,
+                    'query': query,
+                    'total_ms': total_ms,
+                    'acquire_ms': acquire_ms,
+                    'rows': rows,
+                })
+        if total_ms >= self.slow_query_ms:
+            logger.warning("Consulta lenta (%.1f ms, %s linhas) em %s: %s",
+                           total_ms, rows, caller, query)
+
+    def record_cache_hit(self, caller, query):
+        with self._lock:
+            self._entry(caller, _normalize_query(query))['cache_hits'] += 1
+
+    def summary(self):
+        """
+        Returns:
+            list: Um dicionário por consulta com chamadas, linhas e percentis (ms),
+            ordenado pelo tempo total gasto
+        """
+        with self._lock:
+            items = [(key, dict(entry, durations=sorted(entry['durations'])))
+                     for key, entry in self._stats.items()]
+
+        rows = []
+        for (caller, query), entry in items:
+            calls = entry['calls']
+            durations = entry['durations']
+            rows.append({
+                'caller': caller,
+                'query': query,
+                'calls': calls,
+                'cache_hits': entry['cache_hits'],
+                'avg_rows': entry['rows'] / calls if calls else 0.0,
+                'total_ms': entry['total_ms'],
+                'avg_acquire_ms': entry['acquire_ms'] / calls if calls else 0.0,
+                'p50_ms': _percentile(durations, 0.50),
+                'p95_ms': _percentile(durations, 0.95),
+                'p99_ms': _percentile(durations, 0.99),
+                'max_ms': durations[-1] if durations else 0.0,
+            })
+        return sorted(rows, key=lambda row: row['total_ms'], reverse=True)
+
+    def slow_queries(self):
+        with self._lock:
+            return list(self._slow)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+
+_query_stats = QueryStats()
+
+def get_query_stats():
+    return _query_stats.summary()
+
+def get_slow_queries():
+    return _query_stats.slow_queries()
+
+def reset_query_stats():
+    _query_stats.reset()
+
+def _find_caller():
+    """
+    Identifica a página/função que originou a consulta (primeiro frame fora deste módulo)
+    """
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code.co_filename == __file__:
+        frame = frame.f_back
+    if frame is None:
+        return "desconhecido"
+    filename = frame.f_code.co_filename
+    if filename.startswith(APP_DIR):
+        filename = os.path.relpath(filename, APP_DIR)
+    return f"{filename}:{frame.f_code.co_name}"
+
+def query_db(query, params=None, cache=False, user_id=None, ttl=None, tables=None):
+    """
+    Executa uma consulta usando uma conexão do pool
+
+    Args:
+        query: Comando SQL
+        params: Parâmetros do comando
+        cache: Se True, SELECTs são servidos do cache enquanto válidos
+        user_id: Atleta dono dos dados; restringe a invalidação a esse atleta
+        ttl: Validade da entrada no cache em segundos (padrão: DB_CACHE_TTL)
+        tables: Tabelas das quais o resultado depende, quando a consulta lê de
+            funções ou views (padrão: tabelas citadas no FROM/JOIN)
+
+    Returns:
+        list: Linhas (RealDictRow) para SELECT, None para os demais comandos
+    """
+    return _execute(query, params, cache, user_id, ttl, _find_caller(), tables=tables)
+
+# OIDs dos tipos PostgreSQL usados para tipar as colunas em query_df
+_DATE_OIDS = {1082, 1114, 1184}
+_INTEGER_OIDS = {20, 21, 23}
+_FLOAT_OIDS = {700, 701, 1700}
+
+def _integer_column(values):
+    if any(value is None for value in values):
+        array = pd.array(values, dtype="Int64")
+        valid = array.dropna()
+    else:
+        array = np.array(values, dtype=np.int64)
+        valid = array
+
+    if len(valid):
+        low, high = int(valid.min()), int(valid.max())
+        for bits in (8, 16, 32):
+            info = np.iinfo(f"int{bits}")
+            if info.min <= low and high <= info.max:
+                # Escalas de 1 a 10 cabem em int8: 1/8 da memória de int64
+                dtype = f"Int{bits}" if isinstance(array, pd.api.extensions.ExtensionArray) else f"int{bits}"
+                return array.astype(dtype)
+    return array
+
+def _column_array(values, type_code):
+    if type_code in _DATE_OIDS:
+        if type_code == 1184:
+            return pd.to_datetime(list(values), utc=True)
+        return np.array(values, dtype="datetime64[us]").astype("datetime64[ns]")
+    if type_code in _INTEGER_OIDS:
+        return _integer_column(values)
+    if type_code in _FLOAT_OIDS:
+        return np.array(values, dtype=np.float64)
+    return np.array(values, dtype=object)
+
+def _build_frame(description, rows):
+    columns = [column.name for column in description]
+    if not rows:
+        return pd.DataFrame({
+            column.name: _column_array((), column.type_code) for column in description
+        }, columns=columns)
+    # Transpõe as tuplas uma única vez e monta cada coluna já com o tipo final
+    return pd.DataFrame({
+        column.name: _column_array(values, column.type_code)
+        for column, values in zip(description, zip(*rows))
+    }, columns=columns)
+
+def fetch_df(cur):
+    """
+    Lê o resultado de um cursor já executado como DataFrame tipado
+
+    Mesma conversão de query_df, para consultas feitas dentro de uma
+    transação aberta pelo chamador (cursor padrão, linhas como tuplas).
+
+    Args:
+        cur: Cursor com um SELECT executado
+
+    Returns:
+        DataFrame: Resultado da consulta
+    """
+    return _build_frame(cur.description, cur.fetchall())
+
+def query_df(query, params=None, cache=False, user_id=None, ttl=None, tables=None):
+    """
+    Executa um SELECT e devolve um DataFrame com colunas já tipadas
+
+    As linhas são lidas como tuplas (sem um dicionário por linha) e cada coluna
+    é convertida de uma vez pelo tipo PostgreSQL: datas viram datetime64,
+    inteiros usam o menor dtype que comporta os valores (int8 para escalas 1-10,
+    Int8/Int16 anuláveis quando há NULL) e FLOAT/NUMERIC viram float64.
+
+    Args:
+        query, params, cache, user_id, ttl, tables: Mesmos de query_db
+
+    Returns:
+        DataFrame: Resultado da consulta (vazio, com as colunas, se não houver linhas)
+    """
+    return _execute(query, params, cache, user_id, ttl, _find_caller(), as_frame=True, tables=tables)
+
+def _execute(query, params, cache, user_id, ttl, caller, as_frame=False, tables=None):
+    is_select = query.strip().lower().startswith("select")
+
+    if is_select and cache:
+        key = QueryCache.make_key(query, params) + (as_frame,)
+        hit, value = _cache.get(key)
+        if hit:
+            _query_stats.record_cache_hit(caller, query)
+            return value.copy() if as_frame else list(value)
+        generation = _cache.generation()
+
+    start = time.perf_counter()
+    with connection() as conn:
+        acquired = time.perf_counter()
+        cursor_factory = None if as_frame else RealDictCursor
+        with conn.cursor(cursor_factory=cursor_factory) as cur:
             cur.execute(query, params)
-            if query.strip().lower().startswith("select"):
+            if is_select:
                 result = cur.fetchall()
+                rows = len(result)
+                if as_frame:
+                    result = _build_frame(cur.description, result)
             else:
                 conn.commit()
                 result = None
-        return result
-    finally:
-        conn.close()
+                rows = cur.rowcount
+        finished = time.perf_counter()
+
+    _query_stats.record(caller, query, (finished - start) * 1000, (acquired - start) * 1000, rows)
+
+    if is_select and cache:
+        cached = result.copy() if as_frame else tuple(result)
+        _cache.set(key, cached, frozenset(tables) if tables else _tables_in(query),
+                   user_id, ttl, generation)
+    elif not is_select:
+        for table in _tables_in(query):
+            _cache.invalidate(table, user_id)
+
+    return result
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=POOL_MAX_SIZE, thread_name_prefix="query_db")
+    return _executor
+
+def query_many(queries, cache=False, user_id=None, ttl=None, as_frame=False):
+    """
+    Executa várias consultas independentes em paralelo
+
+    Cada consulta usa sua própria conexão do pool, de modo que o tempo total
+    é o da consulta mais lenta e não a soma de todas.
+
+    Args:
+        queries: Lista de pares (query, params)
+        cache, user_id, ttl: Mesmas opções de query_db, aplicadas a todas as consultas
+        as_frame: Se True, cada resultado é um DataFrame tipado como em query_df
+
+    Returns:
+        list: Resultados, na mesma ordem das consultas
+    """
+    caller = _find_caller()
+    options = (cache, user_id, ttl, caller, as_frame)
+
+    if len(queries) <= 1:
+        return [_execute(query, params, *options) for query, params in queries]
+
+    futures = [_get_executor().submit(_execute, query, params, *options) for query, params in queries]
+    return [future.result() for future in futures]
+
+def query_db_iter(query, params=None, itersize=2000):
+    """
+    Executa um SELECT com cursor nomeado (server-side) e devolve as linhas sob demanda
+
+    Apenas `itersize` linhas ficam em memória por vez, o que permite percorrer
+    históricos grandes sem materializar o resultado inteiro. A conexão fica
+    emprestada do pool até o gerador ser esgotado ou fechado: quem pode parar
+    no meio (erro ao processar uma linha, break) deve chamar close() em um
+    finally, ou usar contextlib.closing, para devolvê-la na hora.
+
+    Args:
+        query: Consulta SELECT
+        params: Parâmetros da consulta
+        itersize: Linhas buscadas no servidor a cada ida e volta
+
+    Yields:
+        RealDictRow: Uma linha por vez
+    """
+    with connection() as conn:
+        name = f"iter_{uuid.uuid4().hex}"
+        with conn.cursor(name=name, cursor_factory=RealDictCursor) as cur:
+            cur.itersize = itersize
+            cur.execute(query, params)
+            for row in cur:
+                yield row
+
+def query_db_chunks(query, params=None, chunksize=2000):
+    """
+    Como query_db_iter, mas agrupa as linhas em listas de até `chunksize` itens
+
+    Yields:
+        list: Bloco de linhas
+    """
+    chunk = []
+    # Fechar este gerador fecha também o cursor de query_db_iter
+    with closing(query_db_iter(query, params, itersize=chunksize)) as rows:
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunksize:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+def _copy_value(value):
+    if value is None:
+        return "\\N"
+    return (str(value)
+            .replace("\\", "\\\\")
+            .replace("\t", "\\t")
+            .replace("\n", "\\n")
+            .replace("\r", "\\r"))
+
+def bulk_insert(table, columns, rows, method="values", page_size=1000, upsert_on=None):
+    """
+    Insere muitas linhas em uma única transação
+
+    Args:
+        table: Nome da tabela de destino
+        columns: Lista de colunas, na mesma ordem dos valores de cada linha
+        rows: Iterável de tuplas/listas com os valores
+        method: "values" (execute_values) ou "copy" (COPY FROM STDIN)
+        page_size: Linhas por comando INSERT no método "values"
+        upsert_on: Colunas de uma chave única; se informado, linhas que já
+                   existem têm as demais colunas atualizadas (apenas "values")
+
+    Returns:
+        int: Número de linhas inseridas ou atualizadas
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    if upsert_on and method != "values":
+        raise ValueError("upsert_on só é suportado pelo método 'values'")
+
+    target = sql.SQL("{} ({})").format(
+        sql.Identifier(table),
+        sql.SQL(", ").join(map(sql.Identifier, columns))
+    )
+
+    with connection() as conn:
+        with conn.cursor() as cur:
+            if method == "values":
+                statement = sql.SQL("INSERT INTO {} VALUES %s").format(target)
+                if upsert_on:
+                    updates = [c for c in columns if c not in upsert_on]
+                    action = sql.SQL("DO UPDATE SET {}").format(sql.SQL(", ").join(
+                        sql.SQL("{} = EXCLUDED.{}").format(sql.Identifier(c), sql.Identifier(c))
+                        for c in updates
+                    )) if updates else sql.SQL("DO NOTHING")
+                    statement += sql.SQL(" ON CONFLICT ({}) {}").format(
+                        sql.SQL(", ").join(map(sql.Identifier, upsert_on)), action
+                    )
+                execute_values(cur, statement.as_string(conn), rows, page_size=page_size)
+            elif method == "copy":
+                buffer = io.StringIO()
+                for row in rows:
+                    buffer.write("\t".join(_copy_value(v) for v in row))
+                    buffer.write("\n")
+                buffer.seek(0)
+                statement = sql.SQL("COPY {} FROM STDIN").format(target)
+                cur.copy_expert(statement.as_string(conn), buffer)
+            else:
+                raise ValueError(f"Método de inserção desconhecido: {method}")
+        conn.commit()
+
+    _cache.invalidate(table)
+    return len(rows)
+
+# Tipo de cada coluna como no DDL (ex.: numeric(4,2)), para os casts de bulk_update
+COLUMN_TYPES_QUERY = """
+    SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+    FROM pg_attribute a
+    WHERE a.attrelid = %s::regclass AND a.attnum > 0 AND NOT a.attisdropped
+"""
+
+def bulk_update(table, key_column, columns, rows, page_size=1000):
+    """
+    Atualiza muitas linhas em uma única transação
+
+    Cada página vira um único UPDATE ... FROM (VALUES ...), em vez de um
+    comando por linha. Cada valor é convertido para o tipo da coluna de
+    destino: sem isso o Postgres infere o tipo da lista VALUES pelos
+    literais (NULL vira text, 7 vira integer, Decimal vira numeric) e o SET
+    falha ou compara mal quando ele difere do da coluna.
+
+    Args:
+        table: Nome da tabela de destino
+        key_column: Coluna que identifica a linha (ex.: "id")
+        columns: Colunas a atualizar
+        rows: Iterável de tuplas (chave, *valores), na ordem de `columns`
+        page_size: Linhas por comando UPDATE
+
+    Returns:
+        int: Número de linhas atualizadas
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    statement = sql.SQL(
+        "UPDATE {table} AS t SET {assignments} "
+        "FROM (VALUES %s) AS v ({names}) WHERE t.{key} = v.{key}"
+    ).format(
+        table=sql.Identifier(table),
+        assignments=sql.SQL(", ").join(
+            sql.SQL("{} = v.{}").format(sql.Identifier(c), sql.Identifier(c)) for c in columns
+        ),
+        names=sql.SQL(", ").join(map(sql.Identifier, [key_column] + list(columns))),
+        key=sql.Identifier(key_column)
+    )
+
+    updated = 0
+    with connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(COLUMN_TYPES_QUERY, (sql.Identifier(table).as_string(conn),))
+            types = dict(cur.fetchall())
+            template = sql.SQL("({})").format(sql.SQL(", ").join(
+                sql.SQL("%s::{}").format(sql.SQL(types[c])) for c in [key_column] + list(columns)
+            ))
+            query = statement.as_string(conn)
+            template = template.as_string(conn)
+            for start in range(0, len(rows), page_size):
+                execute_values(cur, query, rows[start:start + page_size],
+                               template=template, page_size=page_size)
+                updated += cur.rowcount
+        conn.commit()
+
+    _cache.invalidate(table)
+    return updated
@@ -1,82 +1,127 @@
 import io
+import datetime
+import itertools
 import pandas as pd
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+
+def _peek_rows(data):
+    """
+    Retorna (primeira linha, iterador com todas as linhas) ou (None, None) se vazio
+    """
+    if data is None:
+        return None, None
+    rows = iter(data)
+    try:
+        first = next(rows)
+    except StopIteration:
+        return None, None
+    return first, itertools.chain([first], rows)
+
+def _write_sheet(workbook, sheet_name, data, header_format, date_format):
+    first, rows = _peek_rows(data)
+    if first is None:
+        return
+
+    worksheet = workbook.add_worksheet(sheet_name)
+    columns = list(first.keys())
+    worksheet.write_row(0, 0, columns, header_format)
+
+    # Escreve linha a linha: com constant_memory só a linha atual fica em memória
+    for row_num, row in enumerate(rows, start=1):
+        for col_num, column in enumerate(columns):
+            value = row[column]
+            if isinstance(value, (datetime.date, datetime.datetime)):
+                worksheet.write_datetime(row_num, col_num, value, date_format)
+            else:
+                worksheet.write(row_num, col_num, value)
 
 def export_to_excel(readiness_data, training_data, psychological_data):
     """
     Exporta os dados para um arquivo Excel com múltiplas abas
-    
+
+    Cada argumento pode ser uma lista de dicionários ou um iterável de linhas
+    (ex.: query_db_iter), consumido em fluxo sem materializar o resultado.
+    Iteráveis com close() são fechados ao final, mesmo em caso de erro.
+
     Args:
-        readiness_data: Lista de dicionários com dados de prontidão
-        training_data: Lista de dicionários com dados de treino
-        psychological_data: Lista de dicionários com dados psicológicos
-    
+        readiness_data: Linhas com dados de prontidão
+        training_data: Linhas com dados de treino
+        psychological_data: Linhas com dados psicológicos
+
     Returns:
         bytes: Arquivo Excel em formato de bytes
     """
+    # Importado só na exportação, para não pesar no carregamento da página
+    import xlsxwriter
+
     output = io.BytesIO()
-    
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        # Aba de Prontidão
-        if readiness_data:
-            df_readiness = pd.DataFrame(readiness_data)
-            df_readiness.to_excel(writer, sheet_name='Prontidão', index=False)
-            
-            # Formatação
-            workbook = writer.book
-            worksheet = writer.sheets['Prontidão']
-            header_format = workbook.add_format({
-                'bold': True,
-                'bg_color': '#D3D3D3',
-                'border': 1
-            })
-            
-            for col_num, value in enumerate(df_readiness.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-        
-        # Aba de Treino
-        if training_data:
-            df_training = pd.DataFrame(training_data)
-            df_training.to_excel(writer, sheet_name='Treino', index=False)
-            
-            worksheet = writer.sheets['Treino']
-            for col_num, value in enumerate(df_training.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-        
-        # Aba de Avaliação Psicológica
-        if psychological_data:
-            df_psych = pd.DataFrame(psychological_data)
-            df_psych.to_excel(writer, sheet_name='Psicológico', index=False)
-            
-            worksheet = writer.sheets['Psicológico']
-            for col_num, value in enumerate(df_psych.columns.values):
-                worksheet.write(0, col_num, value, header_format)
-    
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+
+    header_format = workbook.add_format({
+        'bold': True,
+        'bg_color': '#D3D3D3',
+        'border': 1
+    })
+    date_format = workbook.add_format({'num_format': 'yyyy-mm-dd'})
+
+    try:
+        _write_sheet(workbook, 'Prontidão', readiness_data, header_format, date_format)
+        _write_sheet(workbook, 'Treino', training_data, header_format, date_format)
+        _write_sheet(workbook, 'Psicológico', psychological_data, header_format, date_format)
+    finally:
+        # Um erro no meio da planilha deixaria o gerador de query_db_iter
+        # suspenso, com a conexão emprestada do pool; close() a devolve
+        for data in (readiness_data, training_data, psychological_data):
+            if hasattr(data, 'close'):
+                data.close()
+
+    if not workbook.worksheets():
+        workbook.add_worksheet('Vazio')
+
+    workbook.close()
     output.seek(0)
     return output.getvalue()
 
+def _as_frame(data):
+    """
+    Converte lista de dicionários ou DataFrame em DataFrame; None se não houver linhas
+    """
+    if data is None:
+        return None
+    df = data.copy() if isinstance(data, pd.DataFrame) else pd.DataFrame(data)
+    if df.empty:
+        return None
+    for column in df.select_dtypes(include='datetime').columns:
+        df[column] = df[column].dt.date
+    return df
+
 def export_to_pdf(readiness_data, training_data, psychological_data, summary):
     """
     Exporta os dados para um arquivo PDF formatado
     
     Args:
-        readiness_data: Lista de dicionários com dados de prontidão
-        training_data: Lista de dicionários com dados de treino
-        psychological_data: Lista de dicionários com dados psicológicos
+        readiness_data: Lista de dicionários ou DataFrame com dados de prontidão
+        training_data: Lista de dicionários ou DataFrame com dados de treino
+        psychological_data: Lista de dicionários ou DataFrame com dados psicológicos
         summary: Dicionário com métricas resumidas
     
     Returns:
         bytes: Arquivo PDF em formato de bytes
     """
+    # reportlab é a dependência mais lenta de importar; só entra ao gerar o PDF
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+
     buffer = io.BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
     styles = getSampleStyleSheet()
     elements = []
     
+    df_readiness = _as_frame(readiness_data)
+    df_training = _as_frame(training_data)
+    df_psych = _as_frame(psychological_data)
+    
     # Título
     title_style = ParagraphStyle(
         'CustomTitle',
@@ -109,11 +154,10 @@ def export_to_pdf(readiness_data, training_data, psychological_data, summary):
         elements.append(Spacer(1, 20))
     
     # Dados de Prontidão
-    if readiness_data:
+    if df_readiness is not None:
         elements.append(Paragraph("Dados de Prontidão", styles['Heading2']))
         elements.append(Spacer(1, 12))
         
-        df_readiness = pd.DataFrame(readiness_data)
         data = [df_readiness.columns.tolist()] + df_readiness.values.tolist()
         
         table = Table(data)
@@ -135,11 +179,10 @@ def export_to_pdf(readiness_data, training_data, psychological_data, summary):
         elements.append(Spacer(1, 20))
     
     # Dados de Treino
-    if training_data:
+    if df_training is not None:
         elements.append(Paragraph("Dados de Treino", styles['Heading2']))
         elements.append(Spacer(1, 12))
         
-        df_training = pd.DataFrame(training_data)
         data = [df_training.columns.tolist()] + df_training.values.tolist()
         
         table = Table(data)
@@ -161,11 +204,10 @@ def export_to_pdf(readiness_data, training_data, psychological_data, summary):
         elements.append(Spacer(1, 20))
     
     # Dados Psicológicos
-    if psychological_data:
+    if df_psych is not None:
         elements.append(Paragraph("Dados Psicológicos", styles['Heading2']))
         elements.append(Spacer(1, 12))
         
-        df_psych = pd.DataFrame(psychological_data)
         data = [df_psych.columns.tolist()] + df_psych.values.tolist()
         
         table = Table(data)
@@ -0,0 +1,139 @@
+"""
+Importação em lote do histórico de avaliações a partir de planilhas
+
+Uso:
+    python -m utils.importer readiness 42 historico_prontidao.xlsx
+    python -m utils.importer training 42 treinos.csv --method values
+"""
+import argparse
+import time
+import pandas as pd
+from utils.database import bulk_insert
+from utils.moments import rebuild_moments
+from utils.anomaly import rebuild_baselines
+from utils.readiness_utils import calculate_readiness_scores
+from utils.training_utils import calculate_training_load
+
+ASSESSMENT_TABLES = {
+    'readiness': ('readiness_assessment', [
+        'date', 'sleep_quality', 'sleep_duration', 'stress_level',
+        'muscle_soreness', 'energy_level', 'motivation', 'nutrition_quality',
+        'hydration', 'readiness_score', 'notes'
+    ]),
+    'training': ('training_assessment', [
+        'date', 'training_load', 'training_duration', 'rpe',
+        'intensity_zone', 'training_type', 'fatigue_level',
+        'performance_feeling', 'notes'
+    ]),
+    'psychological': ('psychological_assessment', [
+        'date', 'depression_score', 'anxiety_score', 'stress_score',
+        'intrinsic_motivation', 'extrinsic_motivation', 'amotivation',
+        'flow_score', 'confidence_level', 'focus_ability',
+        'emotional_state', 'pre_competition_anxiety',
+        'satisfaction_with_training', 'team_cohesion', 'notes'
+    ]),
+}
+
+def load_spreadsheet(path):
+    """
+    Lê uma planilha CSV ou Excel com o histórico de avaliações
+
+    Args:
+        path: Caminho do arquivo (.csv, .xlsx ou .xls)
+
+    Returns:
+        DataFrame: Dados brutos da planilha
+    """
+    if str(path).lower().endswith('.csv'):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+def prepare_records(kind, user_id, df):
+    """
+    Normaliza o histórico e calcula os campos derivados ausentes
+
+    Args:
+        kind: 'readiness', 'training' ou 'psychological'
+        user_id: ID do atleta dono dos registros
+        df: DataFrame com uma linha por avaliação
+
+    Returns:
+        tuple: (colunas, lista de tuplas prontas para inserção)
+    """
+    if kind not in ASSESSMENT_TABLES:
+        raise ValueError(f"Tipo de avaliação desconhecido: {kind}")
+    _, columns = ASSESSMENT_TABLES[kind]
+
+    df = df.copy()
+    if 'date' not in df.columns:
+        raise ValueError("A planilha precisa de uma coluna 'date'")
+    df['date'] = pd.to_datetime(df['date']).dt.date
+
+    for column in columns:
+        if column not in df.columns:
+            df[column] = None
+
+    if kind == 'readiness':
+        missing = df['readiness_score'].isna()
+        if missing.any():
+            df.loc[missing, 'readiness_score'] = calculate_readiness_scores(df.loc[missing])
+    elif kind == 'training':
+        missing = df['training_load'].isna()
+        df.loc[missing, 'training_load'] = calculate_training_load(
+            df.loc[missing, 'training_duration'], df.loc[missing, 'rpe']
+        )
+
+    # Planilhas com células vazias viram float; COPY não aceita "7.0" em colunas INTEGER
+    for column in columns:
+        values = df[column]
+        if pd.api.types.is_float_dtype(values) and (values.dropna() % 1 == 0).all():
+            df[column] = values.astype('Int64')
+
+    df = df[columns].astype(object).where(df[columns].notna(), None)
+    rows = [(user_id, *values) for values in df.itertuples(index=False, name=None)]
+    return ['user_id'] + columns, rows
+
+def import_history(kind, user_id, df, method='copy'):
+    """
+    Importa o histórico de um atleta em uma única transação
+
+    Args:
+        kind: 'readiness', 'training' ou 'psychological'
+        user_id: ID do atleta
+        df: DataFrame com o histórico
+        method: 'copy' (COPY FROM STDIN) ou 'values' (execute_values)
+
+    Returns:
+        dict: Linhas inseridas, duração em segundos e taxa (linhas/s)
+    """
+    table, _ = ASSESSMENT_TABLES[kind]
+    columns, rows = prepare_records(kind, user_id, df)
+
+    start = time.perf_counter()
+    inserted = bulk_insert(table, columns, rows, method=method)
+    elapsed = time.perf_counter() - start
+
+    rebuild_moments(user_id, kind)
+    rebuild_baselines(user_id, kind)
+
+    return {
+        'rows': inserted,
+        'seconds': elapsed,
+        'rows_per_sec': inserted / elapsed if elapsed > 0 else 0.0
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa histórico de avaliações de uma planilha")
+    parser.add_argument('kind', choices=sorted(ASSESSMENT_TABLES))
+    parser.add_argument('user_id', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--method', choices=['copy', 'values'], default='copy')
+    args = parser.parse_args(argv)
+
+    df = load_spreadsheet(args.path)
+    report = import_history(args.kind, args.user_id, df, method=args.method)
+    print(f"{report['rows']} linhas importadas em {report['seconds']:.2f}s "
+          f"({report['rows_per_sec']:.0f} linhas/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Seções das páginas renderizadas sob demanda
+
+st.tabs executa o corpo de todas as abas a cada rerun, mesmo as que não
+estão visíveis. Aqui um seletor escolhe a seção visível e a página executa
+só o bloco dela:
+
+    section = section_selector(["Nova Avaliação", "Histórico"], key="readiness_section")
+    with timed_section("Prontidão", section):
+        if section == "Nova Avaliação":
+            ...
+        elif section == "Histórico":
+            ...
+
+O tempo de cada seção fica registrado na sessão e aparece em Configurações.
+"""
+import time
+from contextlib import contextmanager
+import streamlit as st
+
+SECTION_TIMINGS_KEY = "_section_timings"
+
+def section_selector(labels, key):
+    """
+    Seletor horizontal de seções, no lugar de st.tabs
+
+    Args:
+        labels: Nomes das seções, na ordem de exibição
+        key: Chave do widget (mantém a seção escolhida entre reruns)
+
+    Returns:
+        str: Seção selecionada
+    """
+    return st.radio("Seção", labels, key=key, horizontal=True, label_visibility="collapsed")
+
+@contextmanager
+def timed_section(page, section):
+    """
+    Mede o tempo de renderização de uma seção e guarda na sessão
+
+    Args:
+        page: Nome da página
+        section: Nome da seção renderizada
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = st.session_state.setdefault(SECTION_TIMINGS_KEY, {})
+        timings[(page, section)] = (time.perf_counter() - start) * 1000
+
+def get_section_timings():
+    """
+    Último tempo medido de cada seção nesta sessão
+
+    Returns:
+        list: Dicionários com página, seção e ms
+    """
+    timings = st.session_state.get(SECTION_TIMINGS_KEY, {})
+    return [
+        {'página': page, 'seção': section, 'ms': elapsed}
+        for (page, section), elapsed in sorted(timings.items())
+    ]
@@ -0,0 +1,136 @@
+"""
+Métricas de carga de treino calculadas sobre séries diárias completas
+
+Versões vetorizadas de calculate_acute_load, calculate_acwr,
+calculate_monotony e calculate_strain: uma única passada sobre a série
+diária devolve o valor de cada janela, para gráficos de temporada e análises.
+Dias sem treino entram como carga zero, assim como os dias anteriores ao
+início da série, seguindo o estado persistido de utils.load_state.
+"""
+import numpy as np
+import pandas as pd
+from utils.database import query_df
+from utils.training_utils import (
+    ACUTE_WINDOW_DAYS, CHRONIC_WINDOW_DAYS,
+    EWMA_ACUTE_LAMBDA, EWMA_CHRONIC_LAMBDA
+)
+
+DAILY_LOADS_QUERY = """
+SELECT date, training_load_sum AS training_load
+FROM athlete_daily_summary
+WHERE user_id = %s AND date BETWEEN %s AND %s AND training_sessions > 0
+ORDER BY date
+"""
+
+def daily_load_series(training_data, start_date=None, end_date=None,
+                      date_column='date', load_column='training_load'):
+    """
+    Soma a carga por dia e preenche os dias de descanso com zero
+
+    Args:
+        training_data: DataFrame com uma linha por treino
+        start_date: Primeiro dia da série (padrão: primeiro treino)
+        end_date: Último dia da série (padrão: último treino)
+        date_column: Coluna com a data do treino
+        load_column: Coluna com a carga do treino
+
+    Returns:
+        Series: Carga total por dia (float), com índice diário contínuo
+    """
+    dates = pd.to_datetime(training_data[date_column]).dt.normalize()
+    loads = pd.to_numeric(training_data[load_column]).astype(float).fillna(0.0)
+    daily = loads.groupby(dates).sum()
+
+    start = pd.Timestamp(start_date) if start_date is not None else daily.index.min()
+    end = pd.Timestamp(end_date) if end_date is not None else daily.index.max()
+    if pd.isna(start) or pd.isna(end):
+        return pd.Series([], index=pd.DatetimeIndex([], name='date'), dtype=float, name='training_load')
+
+    index = pd.date_range(start, end, freq='D', name='date')
+    return daily.reindex(index, fill_value=0.0).rename('training_load')
+
+def _window_sums(values, window):
+    # Soma móvel por diferença de somas acumuladas, com zeros antes do início
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    end = np.arange(1, len(values) + 1)
+    return cumulative[end] - cumulative[np.maximum(end - window, 0)]
+
+def _ewma(values, alpha):
+    # O zero prefixado faz a média partir de zero, e não da primeira carga
+    padded = pd.Series(np.concatenate(([0.0], values)))
+    return padded.ewm(alpha=alpha, adjust=False).mean().to_numpy()[1:]
+
+def _ratio(numerator, denominator):
+    # Como em calculate_acwr e calculate_monotony: denominador zero devolve 0
+    result = np.zeros_like(numerator)
+    np.divide(numerator, denominator, out=result, where=denominator > 0)
+    return result
+
+def load_metrics_series(daily_loads):
+    """
+    Calcula carga aguda, carga crônica, ACWR, monotonia e strain para cada dia
+
+    Args:
+        daily_loads: Series diária contínua (ex.: de daily_load_series) ou array
+
+    Returns:
+        DataFrame: Uma linha por dia com as colunas
+            acute_load: Soma dos últimos 7 dias
+            chronic_load: Média semanal dos últimos 28 dias
+            acwr: acute_load / chronic_load
+            ewma_acute, ewma_chronic: Médias exponenciais da carga diária
+            acwr_ewma: ewma_acute / ewma_chronic
+            monotony: Média / desvio padrão das cargas dos últimos 7 dias
+            strain: acute_load * monotony
+    """
+    index = daily_loads.index if isinstance(daily_loads, pd.Series) else None
+    values = np.nan_to_num(np.asarray(daily_loads, dtype=float))
+
+    acute = _window_sums(values, ACUTE_WINDOW_DAYS)
+    chronic = _window_sums(values, CHRONIC_WINDOW_DAYS) / (CHRONIC_WINDOW_DAYS / ACUTE_WINDOW_DAYS)
+
+    ewma_acute = _ewma(values, EWMA_ACUTE_LAMBDA)
+    ewma_chronic = _ewma(values, EWMA_CHRONIC_LAMBDA)
+
+    # Desvio padrão populacional de cada semana, como em calculate_monotony
+    padded = np.concatenate((np.zeros(ACUTE_WINDOW_DAYS - 1), values))
+    weeks = np.lib.stride_tricks.sliding_window_view(padded, ACUTE_WINDOW_DAYS)
+    monotony = _ratio(weeks.mean(axis=1), weeks.std(axis=1))
+
+    return pd.DataFrame({
+        'acute_load': acute,
+        'chronic_load': chronic,
+        'acwr': _ratio(acute, chronic),
+        'ewma_acute': ewma_acute,
+        'ewma_chronic': ewma_chronic,
+        'acwr_ewma': _ratio(ewma_acute, ewma_chronic),
+        'monotony': monotony,
+        'strain': acute * monotony,
+    }, index=index)
+
+def get_load_metrics_history(user_id, start_date, end_date, cache=True):
+    """
+    Lê as cargas diárias do resumo diário e calcula as métricas do período
+
+    Os 27 dias anteriores ao início também são lidos, para que as primeiras
+    janelas do período já estejam completas.
+
+    Args:
+        user_id: ID do atleta
+        start_date: Data inicial (inclusive)
+        end_date: Data final (inclusive)
+        cache: Se True, usa o cache de consultas
+
+    Returns:
+        DataFrame: Métricas de load_metrics_series, indexadas por dia
+    """
+    warmup_start = pd.Timestamp(start_date) - pd.Timedelta(days=CHRONIC_WINDOW_DAYS - 1)
+    df = query_df(
+        DAILY_LOADS_QUERY,
+        (user_id, warmup_start.date(), end_date),
+        cache=cache,
+        user_id=user_id,
+        tables=('training_assessment',)
+    )
+    daily = daily_load_series(df, warmup_start, end_date)
+    return load_metrics_series(daily).loc[pd.Timestamp(start_date):]
@@ -0,0 +1,126 @@
+"""
+Estado de carga de treino persistido por atleta (migrations/004)
+
+Cada atleta tem uma janela com a carga total de cada um dos últimos 28 dias.
+A janela é mantida pelo trigger do resumo diário (migrations/011 e 013):
+qualquer INSERT, UPDATE ou DELETE em training_assessment a recalcula na mesma
+transação, lendo 28 dias do resumo. O último dia de treino vem do estado e dos
+dias tocados; só a remoção do treino desse dia faz uma busca pelo índice.
+ACWR, monotonia e strain são calculados a partir dessa janela na leitura.
+
+Uso:
+    python -m utils.load_state 42   # reconstrói o estado de um atleta
+"""
+import argparse
+from datetime import date
+from utils.database import connection, query_db
+from utils.training_utils import (
+    ACUTE_WINDOW_DAYS, CHRONIC_WINDOW_DAYS,
+    calculate_acwr, calculate_monotony, calculate_strain, interpret_acwr
+)
+
+def shift_window(daily_loads, days):
+    """
+    Avança a janela em `days` dias, descartando os mais antigos
+
+    Args:
+        daily_loads: Cargas diárias, da mais recente para a mais antiga
+        days: Número de dias a avançar (>= 0)
+
+    Returns:
+        list: Nova janela com o mesmo tamanho, com zeros nos dias novos
+    """
+    size = len(daily_loads)
+    days = min(days, size)
+    return [0.0] * days + list(daily_loads[:size - days])
+
+def compute_load_metrics(daily_loads):
+    """
+    Calcula as métricas de carga a partir da janela de 28 dias
+
+    Args:
+        daily_loads: Cargas diárias, da mais recente para a mais antiga
+
+    Returns:
+        dict: Carga aguda, carga crônica (média semanal), ACWR, monotonia,
+              strain, zona e recomendação
+    """
+    week = daily_loads[:ACUTE_WINDOW_DAYS]
+    acute_load = sum(week)
+    chronic_load = sum(daily_loads[:CHRONIC_WINDOW_DAYS]) / (CHRONIC_WINDOW_DAYS / ACUTE_WINDOW_DAYS)
+    acwr = calculate_acwr(acute_load, chronic_load)
+    # Dias de descanso entram como carga zero, como na monotonia de Foster
+    monotony = calculate_monotony([{'training_load': load} for load in week])
+    zone, recommendation = interpret_acwr(acwr)
+
+    return {
+        'carga_aguda': acute_load,
+        'carga_crônica': chronic_load,
+        'acwr': acwr,
+        'monotonia': monotony,
+        'strain': calculate_strain(acute_load, monotony),
+        'zona': zone,
+        'recomendação': recommendation
+    }
+
+def rebuild_load_state(user_id):
+    """
+    Reconstrói o estado de carga a partir do resumo diário
+
+    O trigger já mantém o estado a cada escrita; isto serve para reparos
+    manuais e sempre busca o último dia de treino no resumo, sem confiar no
+    estado guardado. Um atleta sem treinos restantes fica sem linha de estado.
+
+    Args:
+        user_id: ID do atleta
+    """
+    with connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT refresh_load_state(%s)", ([user_id],))
+        conn.commit()
+
+def get_load_metrics(user_id, as_of=None):
+    """
+    Lê as métricas de carga atuais do atleta
+
+    Args:
+        user_id: ID do atleta
+        as_of: Data de referência (padrão: hoje); dias sem treino desde o
+               último registro contam como carga zero
+
+    Returns:
+        dict: Métricas de compute_load_metrics e a data do último treino,
+              ou None se o atleta ainda não tem treinos
+    """
+    result = query_db(
+        "SELECT last_date, daily_loads FROM athlete_load_state WHERE user_id = %s",
+        (user_id,)
+    )
+    if not result:
+        return None
+
+    last_date = result[0]['last_date']
+    daily_loads = result[0]['daily_loads']
+    as_of = as_of or date.today()
+    if as_of > last_date:
+        daily_loads = shift_window(daily_loads, (as_of - last_date).days)
+
+    metrics = compute_load_metrics(daily_loads)
+    metrics['último_treino'] = last_date
+    return metrics
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconstrói o estado de carga de um atleta")
+    parser.add_argument('user_id', type=int)
+    args = parser.parse_args(argv)
+
+    rebuild_load_state(args.user_id)
+    metrics = get_load_metrics(args.user_id)
+    if metrics is None:
+        print("Atleta sem treinos registrados.")
+        return
+    print(f"ACWR {metrics['acwr']:.2f} ({metrics['zona']}), "
+          f"monotonia {metrics['monotonia']:.2f}, strain {metrics['strain']:.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Executor de migrações versionadas do banco de dados
+
+Cada arquivo em migrations/ segue o padrão NNN_descricao.sql e é aplicado
+uma única vez, em ordem, dentro de sua própria transação. As versões
+aplicadas ficam registradas na tabela schema_migrations.
+
+Uso:
+    python -m utils.migrations          # aplica as migrações pendentes
+    python -m utils.migrations --list   # mostra o estado de cada migração
+"""
+import argparse
+import re
+from pathlib import Path
+from utils.database import connection
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+MIGRATION_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+# Chave arbitrária para o advisory lock que impede duas execuções simultâneas
+MIGRATION_LOCK_KEY = 727001
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """
+    Lista os arquivos de migração disponíveis
+
+    Args:
+        directory: Diretório com os arquivos .sql
+
+    Returns:
+        list: Tuplas (versão, nome, caminho) ordenadas pela versão
+    """
+    migrations = []
+    for path in Path(directory).glob("*.sql"):
+        match = MIGRATION_PATTERN.match(path.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), path))
+
+    versions = [version for version, _, _ in migrations]
+    duplicates = {v for v in versions if versions.count(v) > 1}
+    if duplicates:
+        raise ValueError(f"Versões de migração duplicadas: {sorted(duplicates)}")
+
+    return sorted(migrations)
+
+def _ensure_migrations_table(cur):
+    cur.execute("""
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name VARCHAR(255) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """)
+
+def get_applied_versions(cur):
+    _ensure_migrations_table(cur)
+    cur.execute("SELECT version FROM schema_migrations")
+    return {row[0] for row in cur.fetchall()}
+
+def migrate(directory=MIGRATIONS_DIR):
+    """
+    Aplica todas as migrações pendentes
+
+    Args:
+        directory: Diretório com os arquivos .sql
+
+    Returns:
+        list: Tuplas (versão, nome) das migrações aplicadas nesta execução
+    """
+    applied_now = []
+    with connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+            try:
+                applied = get_applied_versions(cur)
+                conn.commit()
+
+                for version, name, path in discover_migrations(directory):
+                    if version in applied:
+                        continue
+                    try:
+                        cur.execute(path.read_text(encoding="utf-8"))
+                        cur.execute(
+                            "INSERT INTO schema_migrations (version, name) VALUES (%s, %s)",
+                            (version, name)
+                        )
+                        conn.commit()
+                    except Exception:
+                        conn.rollback()
+                        raise
+                    applied_now.append((version, name))
+            finally:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+                conn.commit()
+    return applied_now
+
+def migration_status(directory=MIGRATIONS_DIR):
+    """
+    Returns:
+        list: Tuplas (versão, nome, aplicada) para cada migração disponível
+    """
+    with connection() as conn:
+        with conn.cursor() as cur:
+            applied = get_applied_versions(cur)
+        conn.commit()
+    return [(version, name, version in applied)
+            for version, name, _ in discover_migrations(directory)]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aplica as migrações do banco de dados")
+    parser.add_argument("--list", action="store_true", help="apenas lista o estado das migrações")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for version, name, applied in migration_status():
+            print(f"{version:03d}_{name}: {'aplicada' if applied else 'pendente'}")
+        return
+
+    applied_now = migrate()
+    if not applied_now:
+        print("Nenhuma migração pendente.")
+    for version, name in applied_now:
+        print(f"Aplicada {version:03d}_{name}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,322 @@
+"""
+Correlações a partir de momentos acumulados por atleta (migrations/006)
+
+Para cada atleta e domínio são guardados n, as médias e a matriz de
+co-desvios das métricas, no histórico completo ('all') e por mês
+('YYYY-MM'). Cada nova avaliação atualiza os momentos com o algoritmo de
+Welford; períodos são combinados com a fórmula de Chan et al. A matriz de
+correlação sai em O(k²) (ou O(meses x k²) para janelas), qualquer que seja o
+tamanho do histórico.
+
+Só entram avaliações com todas as métricas do domínio preenchidas.
+
+Gravações e recálculos de um mesmo atleta e domínio são serializados por um
+advisory lock (_lock). A leitura nunca recalcula: atletas com avaliações
+anteriores à migração 006 recebem os momentos pelo comando abaixo, executado
+uma vez após aplicar as migrações.
+
+Uso:
+    python -m utils.moments --missing       # calcula só para quem ainda não tem momentos
+    python -m utils.moments --rebuild-all   # recalcula os momentos de todos os atletas
+"""
+import argparse
+from datetime import date
+import numpy as np
+import pandas as pd
+from psycopg2.extras import execute_values
+from utils.database import advisory_xact_lock, connection, query_db
+
+MOMENT_COLUMNS = {
+    'readiness': ('readiness_assessment', [
+        'sleep_quality', 'energy_level', 'motivation', 'readiness_score'
+    ]),
+    'training': ('training_assessment', [
+        'training_load', 'rpe', 'fatigue_level', 'performance_feeling'
+    ]),
+    'psychological': ('psychological_assessment', [
+        'depression_score', 'anxiety_score', 'stress_score',
+        'intrinsic_motivation', 'confidence_level', 'emotional_state'
+    ]),
+}
+
+ALL_BUCKET = 'all'
+
+# Janelas oferecidas nas páginas: None = histórico completo, senão meses
+CORRELATION_WINDOWS = {
+    "Todo o histórico": None,
+    "Últimos 3 meses": 3,
+    "Últimos 12 meses": 12,
+}
+
+def _bucket(day):
+    return day.strftime('%Y-%m')
+
+def _lock(cur, user_id, domain):
+    # Mesma chave na gravação e no recálculo: um nunca sobrescreve o outro
+    advisory_xact_lock(cur, f"assessment_moments:{domain}", user_id)
+
+def _empty(k):
+    return 0, np.zeros(k), np.zeros((k, k))
+
+def welford_update(n, mean, comoments, x):
+    """
+    Acrescenta uma observação aos momentos (Welford)
+
+    Args:
+        n: Número de observações até agora
+        mean: Vetor de médias (k)
+        comoments: Matriz k x k de somas de co-desvios
+        x: Nova observação (k)
+
+    Returns:
+        tuple: (n, mean, comoments) atualizados
+    """
+    n += 1
+    delta = x - mean
+    mean = mean + delta / n
+    comoments = comoments + np.outer(delta, x - mean)
+    return n, mean, comoments
+
+def merge_moments(a, b):
+    """
+    Combina os momentos de dois conjuntos disjuntos (Chan et al.)
+
+    Args:
+        a, b: Tuplas (n, mean, comoments)
+
+    Returns:
+        tuple: (n, mean, comoments) do conjunto unido
+    """
+    n_a, mean_a, c_a = a
+    n_b, mean_b, c_b = b
+    n = n_a + n_b
+    if n_a == 0:
+        return b
+    if n_b == 0:
+        return a
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    comoments = c_a + c_b + np.outer(delta, delta) * (n_a * n_b / n)
+    return n, mean, comoments
+
+def moments_to_correlation(moments, columns):
+    """
+    Converte momentos em matriz de correlação de Pearson
+
+    Returns:
+        DataFrame: Correlações k x k (NaN para métricas sem variação ou n < 2);
+                   o número de avaliações fica em .attrs['n']
+    """
+    n, _, comoments = moments
+    variance = np.diag(comoments).copy()
+    std = np.sqrt(np.where(variance > 0, variance, np.nan))
+    if n < 2:
+        std[:] = np.nan
+    correlation = comoments / np.outer(std, std)
+    np.fill_diagonal(correlation, np.where(np.isnan(std), np.nan, 1.0))
+
+    frame = pd.DataFrame(np.clip(correlation, -1.0, 1.0), index=columns, columns=columns)
+    frame.attrs['n'] = int(n)
+    return frame
+
+def _row_to_moments(row, k):
+    return (
+        int(row['n']),
+        np.asarray(row['means'], dtype=float),
+        np.asarray(row['comoments'], dtype=float).reshape(k, k)
+    )
+
+def record_assessment_moments(cur, user_id, domain, data):
+    """
+    Atualiza os momentos do atleta com uma nova avaliação
+
+    Atualiza o histórico completo e o mês da avaliação. Roda no cursor de
+    quem grava a avaliação, na mesma transação do INSERT, e segura o lock do
+    atleta e domínio até quem chama confirmar a transação.
+
+    Args:
+        cur: Cursor da transação que grava a avaliação
+        user_id: ID do atleta
+        domain: 'readiness', 'training' ou 'psychological'
+        data: Dicionário da avaliação (com 'date' e as métricas do domínio)
+    """
+    _, columns = MOMENT_COLUMNS[domain]
+    values = [data.get(column) for column in columns]
+    if any(value is None for value in values):
+        return
+    x = np.asarray(values, dtype=float)
+    k = len(columns)
+    _lock(cur, user_id, domain)
+
+    for bucket in sorted((ALL_BUCKET, _bucket(data['date']))):
+        cur.execute("""
+            INSERT INTO assessment_moments (user_id, domain, bucket, columns, n, means, comoments)
+            VALUES (%s, %s, %s, %s, 0, %s, %s)
+            ON CONFLICT (user_id, domain, bucket) DO NOTHING
+        """, (user_id, domain, bucket, columns, [0.0] * k, [0.0] * (k * k)))
+        cur.execute("""
+            SELECT columns, n, means, comoments FROM assessment_moments
+            WHERE user_id = %s AND domain = %s AND bucket = %s
+        """, (user_id, domain, bucket))
+        stored_columns, n, means, comoments = cur.fetchone()
+        # Momentos de outra versão das colunas só são refeitos por --rebuild-all
+        if list(stored_columns) != columns:
+            continue
+
+        n, mean, comoments = welford_update(
+            int(n), np.asarray(means, dtype=float),
+            np.asarray(comoments, dtype=float).reshape(k, k), x
+        )
+        cur.execute("""
+            UPDATE assessment_moments
+            SET n = %s, means = %s, comoments = %s, updated_at = CURRENT_TIMESTAMP
+            WHERE user_id = %s AND domain = %s AND bucket = %s
+        """, (n, mean.tolist(), comoments.ravel().tolist(), user_id, domain, bucket))
+
+def _rebuild_moments(cur, user_id, domain):
+    # Agregação e substituição na transação de `cur`, sob o lock do atleta e domínio
+    table, columns = MOMENT_COLUMNS[domain]
+    k = len(columns)
+    _lock(cur, user_id, domain)
+
+    averages = ", ".join(f"AVG({c})" for c in columns)
+    covariances = ", ".join(f"covar_pop({a}, {b})" for a in columns for b in columns)
+    complete = " AND ".join(f"{c} IS NOT NULL" for c in columns)
+    cur.execute(f"""
+        SELECT to_char(date, 'YYYY-MM') AS bucket, COUNT(*) AS n,
+               ARRAY[{averages}] AS means, ARRAY[{covariances}] AS covariances
+        FROM {table}
+        WHERE user_id = %s AND {complete}
+        GROUP BY 1
+        ORDER BY 1
+    """, (user_id,))
+
+    buckets = {}
+    total = _empty(k)
+    for bucket, n, means, covariances in cur.fetchall():
+        n = int(n)
+        moments = (
+            n,
+            np.asarray(means, dtype=float),
+            np.asarray(covariances, dtype=float).reshape(k, k) * n
+        )
+        buckets[bucket] = moments
+        total = merge_moments(total, moments)
+    buckets[ALL_BUCKET] = total
+
+    records = [
+        (user_id, domain, bucket, columns, n, mean.tolist(), comoments.ravel().tolist())
+        for bucket, (n, mean, comoments) in buckets.items()
+    ]
+    cur.execute(
+        "DELETE FROM assessment_moments WHERE user_id = %s AND domain = %s",
+        (user_id, domain)
+    )
+    execute_values(cur, """
+        INSERT INTO assessment_moments (user_id, domain, bucket, columns, n, means, comoments)
+        VALUES %s
+    """, records)
+
+def rebuild_moments(user_id, domain):
+    """
+    Recalcula os momentos do atleta a partir das avaliações
+
+    Uma consulta agrega cada mês (COUNT, AVG e covar_pop de cada par); o
+    histórico completo é a combinação dos meses. A leitura e a substituição
+    acontecem em uma transação, sob o mesmo lock das gravações: uma avaliação
+    salva durante o recálculo espera por ele e é somada ao resultado. Usado
+    após importações, re-pontuações ou quando as colunas do domínio mudam.
+
+    Args:
+        user_id: ID do atleta
+        domain: 'readiness', 'training' ou 'psychological'
+    """
+    with connection() as conn:
+        with conn.cursor() as cur:
+            _rebuild_moments(cur, user_id, domain)
+        conn.commit()
+
+def get_correlation_matrix(user_id, domain, months=None, as_of=None):
+    """
+    Matriz de correlação das métricas do domínio a partir dos momentos
+
+    Args:
+        user_id: ID do atleta
+        domain: 'readiness', 'training' ou 'psychological'
+        months: Se informado, usa só os últimos `months` meses (incluindo o atual)
+        as_of: Data de referência da janela (padrão: hoje)
+
+    Returns:
+        DataFrame: Correlações k x k, com o número de avaliações em .attrs['n']
+    """
+    _, columns = MOMENT_COLUMNS[domain]
+    k = len(columns)
+    as_of = as_of or date.today()
+    first_bucket = last_bucket = ALL_BUCKET
+    if months is not None:
+        first_month = (as_of.year * 12 + as_of.month - 1) - (months - 1)
+        first_bucket = f"{first_month // 12:04d}-{first_month % 12 + 1:02d}"
+        last_bucket = _bucket(as_of)
+
+    rows = query_db("""
+        SELECT bucket, columns, n, means, comoments FROM assessment_moments
+        WHERE user_id = %s AND domain = %s AND (bucket = %s OR bucket BETWEEN %s AND %s)
+    """, (user_id, domain, ALL_BUCKET, first_bucket, last_bucket))
+    summary = next((row for row in rows if row['bucket'] == ALL_BUCKET), None)
+
+    # Sem momentos (ou de outra versão das colunas): nada a correlacionar até o
+    # --missing / --rebuild-all; uma página não grava no banco
+    if summary is None or list(summary['columns']) != columns:
+        moments = _empty(k)
+    elif months is None:
+        moments = _row_to_moments(summary, k)
+    else:
+        moments = _empty(k)
+        for row in rows:
+            if row['bucket'] != ALL_BUCKET:
+                moments = merge_moments(moments, _row_to_moments(row, k))
+    return moments_to_correlation(moments, columns)
+
+def missing_moments():
+    """
+    Atletas e domínios com avaliações mas sem momentos válidos
+
+    Returns:
+        list: Tuplas (user_id, domain)
+    """
+    pending = []
+    for domain, (table, columns) in MOMENT_COLUMNS.items():
+        rows = query_db(f"""
+            SELECT DISTINCT a.user_id FROM {table} a
+            LEFT JOIN assessment_moments m
+              ON m.user_id = a.user_id AND m.domain = %s AND m.bucket = %s
+            WHERE m.user_id IS NULL OR m.columns <> %s::text[]
+            ORDER BY a.user_id
+        """, (domain, ALL_BUCKET, columns))
+        pending.extend((row['user_id'], domain) for row in rows)
+    return pending
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalcula os momentos usados nas correlações")
+    parser.add_argument('--rebuild-all', action='store_true', help="recalcula todos os atletas")
+    parser.add_argument('--missing', action='store_true',
+                        help="calcula só atletas e domínios sem momentos (ou de outra versão das colunas)")
+    parser.add_argument('--user-id', type=int)
+    args = parser.parse_args(argv)
+
+    if args.user_id is not None:
+        pending = [(args.user_id, domain) for domain in MOMENT_COLUMNS]
+    elif args.rebuild_all:
+        pending = [(row['id'], domain) for row in query_db("SELECT id FROM athlete_users ORDER BY id")
+                   for domain in MOMENT_COLUMNS]
+    elif args.missing:
+        pending = missing_moments()
+    else:
+        parser.error("informe --user-id, --missing ou --rebuild-all")
+
+    for user_id, domain in pending:
+        rebuild_moments(user_id, domain)
+    print(f"Momentos recalculados para {len({user_id for user_id, _ in pending})} atleta(s).")
+
+if __name__ == "__main__":
+    main()
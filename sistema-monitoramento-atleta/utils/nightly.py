@@ -0,0 +1,214 @@
+"""
+Job noturno: pré-calcula as métricas derivadas de todos os atletas
+
+Os atletas são divididos em blocos distribuídos entre processos
+(ProcessPoolExecutor). Cada processo lê a linha do tempo dos últimos 28 dias
+do seu bloco em uma consulta, calcula as métricas com as funções de
+readiness_utils, training_utils, load_state e psychological_utils e grava o
+bloco em athlete_nightly_metrics (migrations/008) com um único upsert.
+
+Cada bloco é confirmado separadamente: se o job for interrompido, executá-lo
+de novo processa só os atletas que ainda não têm métricas na data.
+
+A tabela é a saída do job para consumo fora do app (consultas e exportações
+da comissão técnica). As páginas continuam lendo os dados vivos, que já são
+baratos (athlete_load_state, resumo diário) e refletem a última gravação.
+
+Uso:
+    python -m utils.nightly                         # hoje, um processo por CPU
+    python -m utils.nightly --date 2024-05-01 --workers 4 --force
+
+Escala sem banco: benchmarks/bench_nightly.py.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+import pandas as pd
+from utils.database import bulk_insert, query_db, query_df
+from utils.load_state import compute_load_metrics
+from utils.psychological_utils import (
+    NEGATIVE_INDICATORS, POSITIVE_INDICATORS,
+    calculate_psychological_status, interpret_stress_anxiety, suggest_psychological_interventions
+)
+from utils.readiness_utils import interpret_readiness_score
+from utils.training_utils import CHRONIC_WINDOW_DAYS, suggest_next_training
+
+RESULTS_TABLE = "athlete_nightly_metrics"
+RESULT_COLUMNS = [
+    'user_id', 'as_of', 'readiness_score', 'readiness_interpretation',
+    'acute_load', 'chronic_load', 'acwr', 'acwr_zone', 'monotony', 'strain',
+    'psychological_status', 'stress_status',
+    'next_training_type', 'next_training_intensity', 'next_training_duration',
+    'interventions'
+]
+CHUNK_SIZE = 50
+
+PSYCHOLOGICAL_COLUMNS = POSITIVE_INDICATORS + NEGATIVE_INDICATORS
+
+BATCH_TIMELINE_QUERY = """
+SELECT u.id AS user_id, t.*
+FROM unnest(%s::integer[]) AS u(id)
+CROSS JOIN LATERAL athlete_timeline(u.id, %s, %s) AS t
+ORDER BY u.id, t.date
+"""
+
+PENDING_QUERY = """
+SELECT u.id FROM athlete_users u
+WHERE NOT EXISTS (
+    SELECT 1 FROM athlete_nightly_metrics m
+    WHERE m.user_id = u.id AND m.as_of = %s
+)
+ORDER BY u.id
+"""
+
+def _latest(timeline, column):
+    rows = timeline[timeline[column].notna()]
+    return rows.iloc[-1] if not rows.empty else None
+
+def compute_athlete_metrics(timeline):
+    """
+    Calcula as métricas derivadas de um atleta
+
+    Args:
+        timeline: Linha do tempo diária do atleta (28 dias, em ordem de data)
+
+    Returns:
+        tuple: Valores na ordem de RESULT_COLUMNS, sem user_id e as_of
+    """
+    readiness = _latest(timeline, 'readiness_score')
+    training = _latest(timeline, 'fatigue_level')
+    psych = _latest(timeline, 'stress_score')
+
+    readiness_score = float(readiness['readiness_score']) if readiness is not None else None
+    # Janela de cargas do mais recente para o mais antigo, como em athlete_load_state
+    daily_loads = timeline['training_load'].fillna(0).to_numpy(dtype=float)[::-1].tolist()
+    load = compute_load_metrics(daily_loads)
+
+    next_training = suggest_next_training({
+        'readiness_score': readiness_score,
+        'fatigue_level': float(training['fatigue_level']) if training is not None else None,
+    })
+
+    psychological_status = stress_status = interventions = None
+    if psych is not None:
+        psych_data = {column: float(psych[column]) for column in PSYCHOLOGICAL_COLUMNS
+                      if column in psych and pd.notna(psych[column])}
+        psychological_status = calculate_psychological_status(psych_data)
+        stress_status = interpret_stress_anxiety(
+            psych_data.get('stress_score'), psych_data.get('anxiety_score')
+        )['status']
+        interventions = suggest_psychological_interventions(psych_data)
+
+    return (
+        readiness_score,
+        interpret_readiness_score(readiness_score) if readiness_score is not None else None,
+        load['carga_aguda'], load['carga_crônica'], load['acwr'], load['zona'],
+        load['monotonia'], load['strain'],
+        psychological_status, stress_status,
+        next_training['tipo'], next_training['intensidade'], next_training['duração'],
+        interventions
+    )
+
+def compute_chunk_rows(timeline, as_of):
+    """
+    Linhas de athlete_nightly_metrics de um bloco de atletas
+
+    Args:
+        timeline: Linhas do tempo do bloco, no formato de BATCH_TIMELINE_QUERY
+        as_of: Data de referência
+
+    Returns:
+        list: Tuplas na ordem de RESULT_COLUMNS
+    """
+    return [
+        (int(user_id), as_of, *compute_athlete_metrics(athlete))
+        for user_id, athlete in timeline.groupby('user_id', sort=False)
+    ]
+
+def _process_chunk(user_ids, as_of):
+    # Executado nos processos do pool; cada processo abre suas próprias conexões
+    start = as_of - timedelta(days=CHRONIC_WINDOW_DAYS - 1)
+    timeline = query_df(BATCH_TIMELINE_QUERY, (list(user_ids), start, as_of))
+    rows = compute_chunk_rows(timeline, as_of)
+    bulk_insert(RESULTS_TABLE, RESULT_COLUMNS, rows, upsert_on=['user_id', 'as_of'])
+    return len(rows)
+
+def pending_athletes(as_of, resume=True):
+    """
+    Atletas a processar na data
+
+    Args:
+        as_of: Data de referência
+        resume: Se True, ignora atletas que já têm métricas na data
+
+    Returns:
+        list: IDs dos atletas
+    """
+    if resume:
+        rows = query_db(PENDING_QUERY, (as_of,))
+    else:
+        rows = query_db("SELECT id FROM athlete_users ORDER BY id")
+    return [row['id'] for row in rows]
+
+def run_nightly(as_of=None, workers=None, chunk_size=CHUNK_SIZE, resume=True,
+                progress=None, athletes=None, process_chunk=_process_chunk):
+    """
+    Calcula e grava as métricas derivadas de todos os atletas
+
+    Args:
+        as_of: Data de referência (padrão: hoje)
+        workers: Número de processos (padrão: um por CPU)
+        chunk_size: Atletas por bloco (uma consulta e um upsert por bloco)
+        resume: Se True, pula atletas já processados na data
+        progress: Função chamada a cada bloco concluído com (processados, total)
+        athletes: IDs a processar (padrão: pending_athletes)
+        process_chunk: Função de módulo (ids, as_of) -> atletas processados,
+                       executada nos processos; o benchmark usa uma sem banco
+
+    Returns:
+        dict: Atletas, processados, duração em segundos e taxa (atletas/s)
+    """
+    as_of = as_of or date.today()
+    workers = workers or os.cpu_count() or 1
+    if athletes is None:
+        athletes = pending_athletes(as_of, resume)
+    chunks = [athletes[i:i + chunk_size] for i in range(0, len(athletes), chunk_size)]
+
+    processed = 0
+    start = time.perf_counter()
+    if chunks:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(process_chunk, chunk, as_of) for chunk in chunks]
+            # Um bloco com erro interrompe o job; os blocos já gravados ficam
+            for future in as_completed(futures):
+                processed += future.result()
+                if progress:
+                    progress(processed, len(athletes))
+
+    elapsed = time.perf_counter() - start
+    return {
+        'athletes': len(athletes),
+        'processed': processed,
+        'seconds': elapsed,
+        'rate': processed / elapsed if elapsed > 0 else 0.0
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pré-calcula as métricas derivadas de todos os atletas")
+    parser.add_argument('--date', type=date.fromisoformat, help="data de referência (padrão: hoje)")
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--force', action='store_true', help="recalcula atletas já processados")
+    args = parser.parse_args(argv)
+
+    def report(processed, total):
+        print(f"{processed}/{total} atletas processados", flush=True)
+
+    result = run_nightly(args.date, args.workers, args.chunk_size, not args.force, progress=report)
+    print(f"{result['processed']} atletas em {result['seconds']:.2f}s "
+          f"({result['rate']:.0f} atletas/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+Camada de dados das páginas, com cache do Streamlit por atleta
+
+Cada função devolve DataFrames (ou dicionários) já tipados e guardados com
+st.cache_data, de modo que reruns causados por widgets (sliders, abas,
+seletores) não voltam ao banco. A chave do cache inclui uma versão por
+atleta, mantida com st.cache_resource e compartilhada entre sessões:
+invalidate(user_id), chamada quando um formulário salva, muda a versão e
+todas as leituras daquele atleta são refeitas na próxima execução.
+
+Gravações fora do app (importador, jobs) aparecem após CACHE_TTL segundos.
+
+Uso nas páginas:
+    from utils import page_data
+    df = page_data.training_history(st.session_state.user_id)
+"""
+import functools
+import threading
+import streamlit as st
+from utils.database import CACHE_MAX_ENTRIES, CACHE_TTL, query_df, query_many
+from utils.anomaly import get_recent_anomalies, get_warming_up_metrics
+from utils.load_series import get_load_metrics_history
+from utils.load_state import get_load_metrics
+from utils.moments import get_correlation_matrix
+from utils.summary import get_period_summary, get_summary_metrics
+from utils.timeline import get_athlete_timeline
+
+READINESS_HISTORY_QUERY = """
+SELECT date, readiness_score, sleep_quality, energy_level, motivation
+FROM readiness_assessment
+WHERE user_id = %s
+ORDER BY date DESC
+LIMIT 10
+"""
+
+TRAINING_HISTORY_QUERY = """
+SELECT date, training_load, training_duration, rpe, training_type, fatigue_level,
+       performance_feeling
+FROM training_assessment
+WHERE user_id = %s
+ORDER BY date DESC
+LIMIT 10
+"""
+
+PSYCHOLOGICAL_HISTORY_QUERY = """
+SELECT date, depression_score, anxiety_score, stress_score,
+       intrinsic_motivation, extrinsic_motivation, amotivation,
+       flow_score, confidence_level, focus_ability,
+       emotional_state, pre_competition_anxiety,
+       satisfaction_with_training, team_cohesion
+FROM psychological_assessment
+WHERE user_id = %s
+ORDER BY date DESC
+LIMIT 10
+"""
+
+RECENT_READINESS_QUERY = """
+SELECT date, readiness_score, sleep_quality, energy_level
+FROM readiness_assessment
+WHERE user_id = %s AND date >= %s
+ORDER BY date DESC
+"""
+
+RECENT_TRAINING_QUERY = """
+SELECT date, training_load, rpe, fatigue_level
+FROM training_assessment
+WHERE user_id = %s AND date >= %s
+ORDER BY date DESC
+"""
+
+RECENT_PSYCHOLOGICAL_QUERY = """
+SELECT date, stress_score, anxiety_score, confidence_level, emotional_state
+FROM psychological_assessment
+WHERE user_id = %s AND date >= %s
+ORDER BY date DESC
+"""
+
+READINESS_QUERY = """
+SELECT date, readiness_score, sleep_quality, sleep_duration,
+       stress_level, muscle_soreness, energy_level, motivation,
+       nutrition_quality, hydration, notes
+FROM readiness_assessment
+WHERE user_id = %s AND date BETWEEN %s AND %s
+ORDER BY date
+"""
+
+TRAINING_QUERY = """
+SELECT date, training_load, training_duration, rpe,
+       intensity_zone, training_type, fatigue_level,
+       performance_feeling, notes
+FROM training_assessment
+WHERE user_id = %s AND date BETWEEN %s AND %s
+ORDER BY date
+"""
+
+PSYCHOLOGICAL_QUERY = """
+SELECT date, depression_score, anxiety_score, stress_score,
+       intrinsic_motivation, extrinsic_motivation, amotivation,
+       flow_score, confidence_level, focus_ability,
+       emotional_state, pre_competition_anxiety,
+       satisfaction_with_training, team_cohesion, notes
+FROM psychological_assessment
+WHERE user_id = %s AND date BETWEEN %s AND %s
+ORDER BY date
+"""
+
+@st.cache_resource
+def _data_versions():
+    # Um único registro por processo, compartilhado por todas as sessões
+    return {'lock': threading.Lock(), 'versions': {}}
+
+def data_version(user_id):
+    return _data_versions()['versions'].get(user_id, 0)
+
+def invalidate(user_id):
+    """
+    Descarta os dados em cache do atleta (chamada após salvar um formulário)
+
+    Args:
+        user_id: ID do atleta
+    """
+    registry = _data_versions()
+    with registry['lock']:
+        registry['versions'][user_id] = registry['versions'].get(user_id, 0) + 1
+
+def _per_user(func):
+    # func(user_id, version, ...): `version` entra na chave do cache (parâmetros
+    # com "_" no início seriam ignorados pelo st.cache_data) e é preenchida aqui
+    cached = st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)(func)
+
+    @functools.wraps(func)
+    def wrapper(user_id, *args, **kwargs):
+        return cached(user_id, data_version(user_id), *args, **kwargs)
+    return wrapper
+
+@_per_user
+def readiness_history(user_id, version):
+    """Últimas 10 avaliações de prontidão"""
+    return query_df(READINESS_HISTORY_QUERY, (user_id,))
+
+@_per_user
+def training_history(user_id, version):
+    """Últimos 10 treinos"""
+    return query_df(TRAINING_HISTORY_QUERY, (user_id,))
+
+@_per_user
+def psychological_history(user_id, version):
+    """Últimas 10 avaliações psicológicas"""
+    return query_df(PSYCHOLOGICAL_HISTORY_QUERY, (user_id,))
+
+@_per_user
+def recent_assessments(user_id, version, since):
+    """
+    Avaliações dos três domínios desde `since`, da mais recente para a mais antiga
+
+    Returns:
+        tuple: (prontidão, treino, psicológico) como DataFrames
+    """
+    params = (user_id, since)
+    return tuple(query_many([
+        (RECENT_READINESS_QUERY, params),
+        (RECENT_TRAINING_QUERY, params),
+        (RECENT_PSYCHOLOGICAL_QUERY, params)
+    ], as_frame=True))
+
+@_per_user
+def assessments_in_range(user_id, version, start_date, end_date):
+    """
+    Avaliações completas dos três domínios no período, em ordem de data
+
+    Returns:
+        tuple: (prontidão, treino, psicológico) como DataFrames
+    """
+    params = (user_id, start_date, end_date)
+    return tuple(query_many([
+        (READINESS_QUERY, params),
+        (TRAINING_QUERY, params),
+        (PSYCHOLOGICAL_QUERY, params)
+    ], as_frame=True))
+
+@_per_user
+def timeline(user_id, version, start_date, end_date):
+    """Linha do tempo diária (ver utils.timeline.get_athlete_timeline)"""
+    return get_athlete_timeline(user_id, start_date, end_date, cache=False)
+
+@_per_user
+def summary_metrics(user_id, version, start_date, end_date):
+    """Médias e totais do período (ver utils.summary.get_summary_metrics)"""
+    return get_summary_metrics(user_id, start_date, end_date, cache=False)
+
+@_per_user
+def period_summary(user_id, version, start_date, end_date, period='week'):
+    """Resumo por semana ou mês (ver utils.summary.get_period_summary)"""
+    return get_period_summary(user_id, start_date, end_date, period, cache=False)
+
+@_per_user
+def load_metrics(user_id, version, as_of):
+    """Métricas de carga atuais (ver utils.load_state.get_load_metrics)"""
+    return get_load_metrics(user_id, as_of)
+
+@_per_user
+def load_metrics_history(user_id, version, start_date, end_date):
+    """ACWR, monotonia e strain diários (ver utils.load_series)"""
+    return get_load_metrics_history(user_id, start_date, end_date, cache=False)
+
+@_per_user
+def correlation_matrix(user_id, version, domain, months, as_of):
+    """Correlações do domínio (ver utils.moments.get_correlation_matrix)"""
+    return get_correlation_matrix(user_id, domain, months, as_of)
+
+@_per_user
+def recent_anomalies(user_id, version, as_of):
+    """Sinalizações dos últimos dias (ver utils.anomaly.get_recent_anomalies)"""
+    return get_recent_anomalies(user_id, as_of=as_of)
+
+@_per_user
+def warming_up_metrics(user_id, version):
+    """Métricas com linha de base em aquecimento (ver utils.anomaly)"""
+    return get_warming_up_metrics(user_id)
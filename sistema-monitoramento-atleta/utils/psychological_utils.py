@@ -1,3 +1,152 @@
+import numpy as np
+import pandas as pd
+from utils.rules import RuleSet
+
+# Indicadores do status psicológico geral; ausentes valem 5 (meio da escala)
+POSITIVE_INDICATORS = [
+    'intrinsic_motivation', 'flow_score', 'confidence_level',
+    'focus_ability', 'satisfaction_with_training', 'team_cohesion'
+]
+NEGATIVE_INDICATORS = [
+    'depression_score', 'anxiety_score', 'stress_score',
+    'amotivation', 'pre_competition_anxiety'
+]
+
+# Pesos para a prontidão para competição
+COMPETITION_READINESS_WEIGHTS = {
+    'confidence_level': 0.25,
+    'focus_ability': 0.20,
+    'emotional_state': 0.15,
+    'pre_competition_anxiety': -0.20,
+    'stress_score': -0.20
+}
+
+# Categorias dos status, da pior para a melhor situação
+PSYCHOLOGICAL_STATUS_LEVELS = ["Requer Atenção", "Regular", "Bom", "Excelente"]
+STRESS_ANXIETY_LEVELS = ["Normal", "Moderado", "Elevado", "Crítico"]
+COMPETITION_READINESS_LEVELS = [
+    "Requer Preparação Adicional", "Moderadamente Pronto", "Pronto para Competição"
+]
+MOTIVATION_PROFILES = [
+    "Altamente Auto-Motivado", "Moderadamente Auto-Motivado",
+    "Motivação Externa Forte", "Motivação Mista"
+]
+MOTIVATION_PROFILE_LEVELS = MOTIVATION_PROFILES + [
+    f"{profile} (Risco de Burnout)" for profile in MOTIVATION_PROFILES
+]
+
+# Regras de interpretação: avaliadas em ordem, vale a primeira verdadeira
+STRESS_ANXIETY_RULES = RuleSet([
+    ("(stress_score + anxiety_score) / 2 >= 8", {
+        "status": "Crítico",
+        "recomendações": [
+            "Consulta imediata com psicólogo esportivo",
+            "Redução temporária da carga de treino",
+            "Implementação de técnicas de relaxamento",
+            "Foco em atividades de recuperação mental"
+        ]
+    }),
+    ("(stress_score + anxiety_score) / 2 >= 6", {
+        "status": "Elevado",
+        "recomendações": [
+            "Monitoramento próximo dos níveis de estresse",
+            "Prática regular de técnicas de respiração",
+            "Considerar ajustes no planejamento de treino",
+            "Aumentar atividades de lazer e recuperação"
+        ]
+    }),
+    ("(stress_score + anxiety_score) / 2 >= 4", {
+        "status": "Moderado",
+        "recomendações": [
+            "Manter rotina de auto-monitoramento",
+            "Prática de mindfulness",
+            "Manter comunicação com equipe técnica"
+        ]
+    }),
+], default={
+    "status": "Normal",
+    "recomendações": [
+        "Continuar com as práticas atuais",
+        "Manter registro regular das emoções",
+        "Praticar técnicas preventivas de gestão do estresse"
+    ]
+}, defaults={'stress_score': 5, 'anxiety_score': 5})
+
+# Perfil predominante, na mesma ordem de MOTIVATION_PROFILES
+MOTIVATION_PROFILE_RULES = RuleSet([
+    ("(intrinsic_motivation > extrinsic_motivation) & (intrinsic_motivation >= 7)", {
+        "perfil": "Altamente Auto-Motivado",
+        "recomendações": [
+            "Manter autonomia nas decisões de treino",
+            "Focar em objetivos de desenvolvimento pessoal",
+            "Estimular criatividade nos treinos"
+        ]
+    }),
+    ("intrinsic_motivation > extrinsic_motivation", {
+        "perfil": "Moderadamente Auto-Motivado",
+        "recomendações": [
+            "Reforçar conexão com objetivos pessoais",
+            "Variar atividades para manter interesse",
+            "Estabelecer metas de desenvolvimento"
+        ]
+    }),
+    ("extrinsic_motivation >= 7", {
+        "perfil": "Motivação Externa Forte",
+        "recomendações": [
+            "Desenvolver motivação intrínseca",
+            "Identificar valores pessoais no esporte",
+            "Reduzir foco em recompensas externas"
+        ]
+    }),
+], default={
+    "perfil": "Motivação Mista",
+    "recomendações": [
+        "Equilibrar objetivos internos e externos",
+        "Desenvolver auto-consciência",
+        "Estabelecer metas de curto e longo prazo"
+    ]
+}, defaults={'intrinsic_motivation': 5, 'extrinsic_motivation': 5})
+
+# Desmotivação: acrescenta o alerta de burnout ao perfil
+BURNOUT_RULES = RuleSet([
+    ("amotivation >= 6", [
+        "Intervenção psicológica recomendada",
+        "Reavaliação de objetivos e expectativas",
+        "Possível período de descanso necessário"
+    ]),
+], default=[], mode="all", defaults={'amotivation': 5})
+
+# Intervenções: todas as regras verdadeiras contribuem
+INTERVENTION_RULES = RuleSet([
+    ("(stress_score > 6) | (anxiety_score > 6)", [
+        "Técnicas de Respiração Profunda",
+        "Meditação Mindfulness",
+        "Relaxamento Muscular Progressivo"
+    ]),
+    ("confidence_level < 6", [
+        "Visualização Positiva",
+        "Diário de Sucessos",
+        "Estabelecimento de Metas Progressivas"
+    ]),
+    ("focus_ability < 6", [
+        "Exercícios de Concentração",
+        "Técnicas de Ancoragem",
+        "Rotinas Pré-Performance"
+    ]),
+    ("team_cohesion < 6", [
+        "Atividades de Team Building",
+        "Comunicação Assertiva",
+        "Definição de Papéis e Responsabilidades"
+    ]),
+], default=[
+    "Manutenção de Rotina Mental",
+    "Prática Regular de Mindfulness",
+    "Auto-Monitoramento Emocional"
+], mode="all", defaults={
+    'stress_score': 0, 'anxiety_score': 0,
+    'confidence_level': 10, 'focus_ability': 10, 'team_cohesion': 10
+})
+
 def calculate_psychological_status(data):
     """
     Calcula o status psicológico geral com base em múltiplos indicadores
@@ -9,24 +158,11 @@ def calculate_psychological_status(data):
         str: Status psicológico geral
     """
     # Calcular média dos indicadores positivos
-    positive_indicators = [
-        data.get('intrinsic_motivation', 5),
-        data.get('flow_score', 5),
-        data.get('confidence_level', 5),
-        data.get('focus_ability', 5),
-        data.get('satisfaction_with_training', 5),
-        data.get('team_cohesion', 5)
-    ]
+    positive_indicators = [data.get(key, 5) for key in POSITIVE_INDICATORS]
     positive_score = sum(positive_indicators) / len(positive_indicators)
     
     # Calcular média dos indicadores negativos
-    negative_indicators = [
-        data.get('depression_score', 5),
-        data.get('anxiety_score', 5),
-        data.get('stress_score', 5),
-        data.get('amotivation', 5),
-        data.get('pre_competition_anxiety', 5)
-    ]
+    negative_indicators = [data.get(key, 5) for key in NEGATIVE_INDICATORS]
     negative_score = sum(negative_indicators) / len(negative_indicators)
     
     # Calcular score final (positivos - negativos + 5 para normalizar em escala de 0-10)
@@ -52,46 +188,10 @@ def interpret_stress_anxiety(stress_score, anxiety_score):
     Returns:
         dict: Interpretação e recomendações
     """
-    combined_score = (stress_score + anxiety_score) / 2
-    
-    if combined_score >= 8:
-        return {
-            "status": "Crítico",
-            "recomendações": [
-                "Consulta imediata com psicólogo esportivo",
-                "Redução temporária da carga de treino",
-                "Implementação de técnicas de relaxamento",
-                "Foco em atividades de recuperação mental"
-            ]
-        }
-    elif combined_score >= 6:
-        return {
-            "status": "Elevado",
-            "recomendações": [
-                "Monitoramento próximo dos níveis de estresse",
-                "Prática regular de técnicas de respiração",
-                "Considerar ajustes no planejamento de treino",
-                "Aumentar atividades de lazer e recuperação"
-            ]
-        }
-    elif combined_score >= 4:
-        return {
-            "status": "Moderado",
-            "recomendações": [
-                "Manter rotina de auto-monitoramento",
-                "Prática de mindfulness",
-                "Manter comunicação com equipe técnica"
-            ]
-        }
-    else:
-        return {
-            "status": "Normal",
-            "recomendações": [
-                "Continuar com as práticas atuais",
-                "Manter registro regular das emoções",
-                "Praticar técnicas preventivas de gestão do estresse"
-            ]
-        }
+    return STRESS_ANXIETY_RULES.evaluate_one({
+        'stress_score': stress_score,
+        'anxiety_score': anxiety_score
+    })
 
 def analyze_motivation(intrinsic_motivation, extrinsic_motivation, amotivation):
     """
@@ -105,51 +205,19 @@ def analyze_motivation(intrinsic_motivation, extrinsic_motivation, amotivation):
     Returns:
         dict: Análise do perfil motivacional e recomendações
     """
-    motivation_profile = {
-        "perfil": "",
-        "recomendações": []
+    scores = {
+        'intrinsic_motivation': intrinsic_motivation,
+        'extrinsic_motivation': extrinsic_motivation,
+        'amotivation': amotivation
     }
-    
     # Determinar perfil predominante
-    if intrinsic_motivation > extrinsic_motivation:
-        if intrinsic_motivation >= 7:
-            motivation_profile["perfil"] = "Altamente Auto-Motivado"
-            motivation_profile["recomendações"] = [
-                "Manter autonomia nas decisões de treino",
-                "Focar em objetivos de desenvolvimento pessoal",
-                "Estimular criatividade nos treinos"
-            ]
-        else:
-            motivation_profile["perfil"] = "Moderadamente Auto-Motivado"
-            motivation_profile["recomendações"] = [
-                "Reforçar conexão com objetivos pessoais",
-                "Variar atividades para manter interesse",
-                "Estabelecer metas de desenvolvimento"
-            ]
-    else:
-        if extrinsic_motivation >= 7:
-            motivation_profile["perfil"] = "Motivação Externa Forte"
-            motivation_profile["recomendações"] = [
-                "Desenvolver motivação intrínseca",
-                "Identificar valores pessoais no esporte",
-                "Reduzir foco em recompensas externas"
-            ]
-        else:
-            motivation_profile["perfil"] = "Motivação Mista"
-            motivation_profile["recomendações"] = [
-                "Equilibrar objetivos internos e externos",
-                "Desenvolver auto-consciência",
-                "Estabelecer metas de curto e longo prazo"
-            ]
+    motivation_profile = MOTIVATION_PROFILE_RULES.evaluate_one(scores)
     
     # Verificar desmotivação
-    if amotivation >= 6:
+    burnout = BURNOUT_RULES.evaluate_one(scores)
+    if burnout:
         motivation_profile["perfil"] += " (Risco de Burnout)"
-        motivation_profile["recomendações"].extend([
-            "Intervenção psicológica recomendada",
-            "Reavaliação de objetivos e expectativas",
-            "Possível período de descanso necessário"
-        ])
+        motivation_profile["recomendações"].extend(burnout)
     
     return motivation_profile
 
@@ -163,17 +231,8 @@ def evaluate_competition_readiness(data):
     Returns:
         dict: Avaliação de prontidão e recomendações
     """
-    # Pesos para diferentes fatores
-    weights = {
-        'confidence_level': 0.25,
-        'focus_ability': 0.20,
-        'emotional_state': 0.15,
-        'pre_competition_anxiety': -0.20,
-        'stress_score': -0.20
-    }
-    
     # Calcular score ponderado
-    weighted_score = sum(data.get(key, 5) * weight for key, weight in weights.items())
+    weighted_score = sum(data.get(key, 5) * weight for key, weight in COMPETITION_READINESS_WEIGHTS.items())
     normalized_score = (weighted_score + 10) / 2  # Normalizar para escala 0-10
     
     if normalized_score >= 8:
@@ -217,43 +276,133 @@ def suggest_psychological_interventions(data):
     Returns:
         list: Lista de intervenções sugeridas
     """
-    interventions = []
-    
-    # Verificar diferentes aspectos e adicionar intervenções relevantes
-    if data.get('stress_score', 0) > 6 or data.get('anxiety_score', 0) > 6:
-        interventions.extend([
-            "Técnicas de Respiração Profunda",
-            "Meditação Mindfulness",
-            "Relaxamento Muscular Progressivo"
-        ])
-    
-    if data.get('confidence_level', 10) < 6:
-        interventions.extend([
-            "Visualização Positiva",
-            "Diário de Sucessos",
-            "Estabelecimento de Metas Progressivas"
-        ])
-    
-    if data.get('focus_ability', 10) < 6:
-        interventions.extend([
-            "Exercícios de Concentração",
-            "Técnicas de Ancoragem",
-            "Rotinas Pré-Performance"
-        ])
-    
-    if data.get('team_cohesion', 10) < 6:
-        interventions.extend([
-            "Atividades de Team Building",
-            "Comunicação Assertiva",
-            "Definição de Papéis e Responsabilidades"
-        ])
-    
-    # Adicionar intervenções gerais se lista estiver vazia
-    if not interventions:
-        interventions = [
-            "Manutenção de Rotina Mental",
-            "Prática Regular de Mindfulness",
-            "Auto-Monitoramento Emocional"
-        ]
-    
-    return interventions
+    return INTERVENTION_RULES.evaluate_one(data)
+
+def _column(data, name, default=5):
+    # Coluna como float; ausente ou nula vale `default`, como no .get das funções escalares
+    if name not in data:
+        return np.full(len(data), float(default))
+    values = pd.to_numeric(pd.Series(data[name]), errors='coerce')
+    values = values.to_numpy(dtype=float, na_value=np.nan)
+    return np.where(np.isnan(values), float(default), values)
+
+def _categorical(codes, levels, index, ordered=True):
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=levels, ordered=ordered),
+        index=index
+    )
+
+def calculate_psychological_scores(data):
+    """
+    Calcula o score psicológico geral de cada avaliação
+
+    Args:
+        data: DataFrame com uma avaliação por linha
+
+    Returns:
+        ndarray: Score (positivos - negativos / 2) de cada linha
+    """
+    positive = np.zeros(len(data))
+    for key in POSITIVE_INDICATORS:
+        positive += _column(data, key)
+    negative = np.zeros(len(data))
+    for key in NEGATIVE_INDICATORS:
+        negative += _column(data, key)
+    return positive / len(POSITIVE_INDICATORS) - (negative / len(NEGATIVE_INDICATORS)) / 2
+
+def calculate_psychological_statuses(data):
+    """
+    Versão vetorizada de calculate_psychological_status
+
+    Args:
+        data: DataFrame com uma avaliação por linha
+
+    Returns:
+        Series: Status categórico ordenado (PSYCHOLOGICAL_STATUS_LEVELS)
+    """
+    score = calculate_psychological_scores(data)
+    codes = np.select([score >= 8, score >= 6, score >= 4], [3, 2, 1], default=0)
+    return _categorical(codes, PSYCHOLOGICAL_STATUS_LEVELS, data.index)
+
+def classify_stress_anxiety(data):
+    """
+    Versão vetorizada do status de interpret_stress_anxiety
+
+    Args:
+        data: DataFrame com as colunas stress_score e anxiety_score
+
+    Returns:
+        Series: Status categórico ordenado (STRESS_ANXIETY_LEVELS)
+    """
+    return STRESS_ANXIETY_RULES.categorical(data, "status", STRESS_ANXIETY_LEVELS)
+
+def classify_motivation(data):
+    """
+    Versão vetorizada do perfil de analyze_motivation
+
+    Args:
+        data: DataFrame com as colunas intrinsic_motivation,
+              extrinsic_motivation e amotivation
+
+    Returns:
+        Series: Perfil categórico (MOTIVATION_PROFILE_LEVELS)
+    """
+    codes = MOTIVATION_PROFILE_RULES.match(data)
+    # Os perfis com risco de burnout ficam 4 posições adiante
+    codes = codes + np.where(BURNOUT_RULES.masks(data)[0], len(MOTIVATION_PROFILES), 0)
+    return _categorical(codes, MOTIVATION_PROFILE_LEVELS, data.index, ordered=False)
+
+def evaluate_competition_readiness_scores(data):
+    """
+    Versão vetorizada de evaluate_competition_readiness
+
+    Args:
+        data: DataFrame com uma avaliação por linha
+
+    Returns:
+        DataFrame: Colunas 'score' e 'status' (COMPETITION_READINESS_LEVELS)
+    """
+    weighted = np.zeros(len(data))
+    for key, weight in COMPETITION_READINESS_WEIGHTS.items():
+        weighted += _column(data, key) * weight
+    score = (weighted + 10) / 2
+
+    codes = np.select([score >= 8, score >= 6], [2, 1], default=0)
+    return pd.DataFrame({
+        'score': score,
+        'status': _categorical(codes, COMPETITION_READINESS_LEVELS, data.index)
+    }, index=data.index)
+
+def suggest_psychological_interventions_bulk(data):
+    """
+    Versão vetorizada de suggest_psychological_interventions
+
+    Args:
+        data: DataFrame com uma avaliação por linha
+
+    Returns:
+        Series: Lista de intervenções sugeridas para cada linha
+    """
+    return pd.Series(INTERVENTION_RULES.evaluate(data), index=data.index, dtype=object)
+
+def classify_psychological_history(data):
+    """
+    Classifica todo o histórico de uma vez, para tabelas e gráficos de status
+
+    Args:
+        data: DataFrame com uma avaliação por linha (de um ou vários atletas)
+
+    Returns:
+        DataFrame: Colunas score_psicológico, status_psicológico,
+                   status_estresse, perfil_motivacional,
+                   score_competição e prontidão_competição
+    """
+    competition = evaluate_competition_readiness_scores(data)
+    return pd.DataFrame({
+        'score_psicológico': calculate_psychological_scores(data),
+        'status_psicológico': calculate_psychological_statuses(data),
+        'status_estresse': classify_stress_anxiety(data),
+        'perfil_motivacional': classify_motivation(data),
+        'score_competição': competition['score'],
+        'prontidão_competição': competition['status'],
+    }, index=data.index)
@@ -1,13 +1,54 @@
+import numpy as np
+import pandas as pd
+
+# Peso de cada fator no escore de prontidão (escalas de 0 a 10)
+READINESS_WEIGHTS = {
+    'sleep_quality': 0.2,
+    'sleep_duration': 0.1,
+    'stress_level': 0.2,
+    'muscle_soreness': 0.2,
+    'energy_level': 0.2,
+    'motivation': 0.1,
+}
+
+# Fatores em que valores altos reduzem a prontidão: contam como (10 - valor)
+INVERTED_FACTORS = {'stress_level', 'muscle_soreness'}
+
 def calculate_readiness_score(data):
-    # Placeholder for readiness score calculation logic
     score = 0
-    # Example: weighted sum of factors
-    score += data.get('sleep_quality', 0) * 0.2
-    score += data.get('sleep_duration', 0) * 0.1
-    score += (10 - data.get('stress_level', 0)) * 0.2
-    score += (10 - data.get('muscle_soreness', 0)) * 0.2
-    score += data.get('energy_level', 0) * 0.2
-    score += data.get('motivation', 0) * 0.1
+    # Weighted sum of factors
+    for factor, weight in READINESS_WEIGHTS.items():
+        value = data.get(factor, 0)
+        score += (10 - value) * weight if factor in INVERTED_FACTORS else value * weight
+    return score
+
+def calculate_readiness_scores(data):
+    """
+    Calcula o escore de prontidão de muitas avaliações de uma vez
+
+    Mesmo resultado de calculate_readiness_score aplicada a cada linha:
+    fatores ausentes ou nulos valem 0.
+
+    Args:
+        data: DataFrame ou array estruturado com as colunas dos fatores
+
+    Returns:
+        ndarray: Escore (float64) de cada linha
+    """
+    if isinstance(data, np.ndarray):
+        names = data.dtype.names or ()
+        columns = {name: data[name] for name in names}
+    else:
+        columns = data
+
+    score = np.zeros(len(data))
+    for factor, weight in READINESS_WEIGHTS.items():
+        if factor in columns:
+            value = pd.to_numeric(pd.Series(columns[factor]), errors='coerce')
+            value = np.nan_to_num(value.to_numpy(dtype=float, na_value=np.nan), nan=0.0)
+        else:
+            value = np.zeros(len(data))
+        score += (10 - value) * weight if factor in INVERTED_FACTORS else value * weight
     return score
 
 def interpret_readiness_score(score):
@@ -0,0 +1,111 @@
+"""
+Recalcula readiness_score de todas as avaliações com os pesos atuais
+
+As avaliações são lidas em blocos paginados pela chave primária (sem OFFSET),
+pontuadas de forma vetorizada e apenas as linhas cujo escore mudou são
+atualizadas, um UPDATE em lote por bloco. A memória usada depende só do
+tamanho do bloco, e cada bloco é confirmado separadamente: se o job for
+interrompido, basta executá-lo de novo. Logo após confirmar um bloco, os
+momentos das correlações e as linhas de base dos atletas alterados nele são
+recalculados. Uma nova execução não refaz esses dados (as linhas já não
+mudam), então uma interrupção deixa no máximo os atletas do bloco em curso
+por recalcular, com --user-id em utils.moments e utils.anomaly.
+
+Uso:
+    python -m utils.rescore                      # todos os atletas
+    python -m utils.rescore --user-id 42 --chunk-size 10000
+    python -m utils.rescore --dry-run            # só conta o que mudaria
+"""
+import argparse
+import time
+import numpy as np
+from utils.database import bulk_update, query_df
+from utils.anomaly import rebuild_baselines
+from utils.moments import rebuild_moments
+from utils.readiness_utils import READINESS_WEIGHTS, calculate_readiness_scores
+
+CHUNK_QUERY = """
+SELECT id, user_id, readiness_score, {factors}
+FROM readiness_assessment
+WHERE id > %s {user_filter}
+ORDER BY id
+LIMIT %s
+"""
+
+def _chunks(chunk_size, user_id=None):
+    query = CHUNK_QUERY.format(
+        factors=", ".join(READINESS_WEIGHTS),
+        user_filter="AND user_id = %s" if user_id is not None else ""
+    )
+    last_id = 0
+    while True:
+        params = (last_id, user_id, chunk_size) if user_id is not None else (last_id, chunk_size)
+        chunk = query_df(query, params)
+        if chunk.empty:
+            return
+        yield chunk
+        last_id = int(chunk['id'].iloc[-1])
+
+def rescore_readiness(chunk_size=5000, user_id=None, dry_run=False, progress=None):
+    """
+    Recalcula e grava o escore de prontidão em blocos
+
+    Args:
+        chunk_size: Avaliações lidas e atualizadas por bloco
+        user_id: Restringe a um atleta (padrão: todos)
+        dry_run: Se True, apenas conta as linhas que mudariam
+        progress: Função chamada após cada bloco com (lidas, atualizadas)
+
+    Returns:
+        dict: Linhas lidas, linhas atualizadas, duração em segundos e taxa (linhas/s)
+    """
+    scanned = 0
+    updated = 0
+    start = time.perf_counter()
+
+    for chunk in _chunks(chunk_size, user_id):
+        scores = calculate_readiness_scores(chunk)
+        current = chunk['readiness_score'].to_numpy(dtype=float)
+        changed = ~np.isclose(scores, current, rtol=0, atol=1e-9)
+
+        if changed.any() and not dry_run:
+            ids = chunk['id'].to_numpy()[changed]
+            bulk_update(
+                'readiness_assessment', 'id', ['readiness_score'],
+                zip(ids.tolist(), scores[changed].tolist())
+            )
+            # Momentos das correlações e linhas de base usam readiness_score.
+            # Um atleta presente em vários blocos é recalculado em cada um deles
+            for affected in sorted(set(chunk['user_id'].to_numpy()[changed].tolist())):
+                rebuild_moments(affected, 'readiness')
+                rebuild_baselines(affected, 'readiness')
+        scanned += len(chunk)
+        updated += int(changed.sum())
+        if progress:
+            progress(scanned, updated)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': scanned,
+        'updated': updated,
+        'seconds': elapsed,
+        'rows_per_sec': scanned / elapsed if elapsed > 0 else 0.0
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalcula o escore de prontidão das avaliações")
+    parser.add_argument('--user-id', type=int)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+
+    def report(scanned, updated):
+        print(f"{scanned} avaliações lidas, {updated} com escore alterado", flush=True)
+
+    result = rescore_readiness(args.chunk_size, args.user_id, args.dry_run, progress=report)
+    action = "seriam atualizadas" if args.dry_run else "atualizadas"
+    print(f"{result['updated']} de {result['rows']} avaliações {action} em "
+          f"{result['seconds']:.2f}s ({result['rows_per_sec']:.0f} linhas/s)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Motor de regras declarativas para recomendações e classificações
+
+Um RuleSet é uma lista ordenada de (condição, resultado). As condições são
+expressões sobre colunas, escritas com operadores elemento a elemento do
+NumPy (ex.: "(stress_score > 6) | (anxiety_score > 6)"). Cada expressão é
+compilada uma única vez e avaliada sobre colunas inteiras: classificar um
+atleta ou o histórico de um clube inteiro custa o mesmo número de operações
+vetorizadas.
+
+Modos:
+    first: o resultado é o da primeira regra verdadeira (cadeia if/elif)
+    all:   os resultados de todas as regras verdadeiras são concatenados
+"""
+import copy
+import numpy as np
+import pandas as pd
+
+class RuleSet:
+    """
+    Conjunto ordenado de regras compiladas
+
+    Args:
+        rules: Lista de tuplas (expressão, resultado)
+        default: Resultado quando nenhuma regra é verdadeira
+        mode: "first" ou "all"
+        defaults: Valor usado para colunas ausentes ou nulas, por coluna;
+                  colunas sem valor padrão ficam NaN (toda comparação é falsa)
+    """
+
+    def __init__(self, rules, default, mode="first", defaults=None):
+        if mode not in ("first", "all"):
+            raise ValueError(f"Modo de regras desconhecido: {mode}")
+        self.mode = mode
+        self.default = default
+        self.defaults = dict(defaults or {})
+        self.conditions = [condition for condition, _ in rules]
+        self.outputs = [output for _, output in rules]
+        self._compiled = [compile(condition, f"<regra: {condition}>", "eval")
+                          for condition in self.conditions]
+        self.columns = sorted({name for code in self._compiled for name in code.co_names})
+
+    def _namespace(self, data, length):
+        namespace = {}
+        for name in self.columns:
+            if name in data:
+                values = pd.to_numeric(pd.Series(data[name]), errors='coerce')
+                values = values.to_numpy(dtype=float, na_value=np.nan)
+            else:
+                values = np.full(length, np.nan)
+            if name in self.defaults:
+                values = np.where(np.isnan(values), float(self.defaults[name]), values)
+            namespace[name] = values
+        return namespace
+
+    def masks(self, data):
+        """
+        Avalia todas as condições
+
+        Args:
+            data: DataFrame ou dicionário de colunas (arrays de mesmo tamanho)
+
+        Returns:
+            ndarray: Matriz booleana (regras x linhas)
+        """
+        length = len(data) if isinstance(data, pd.DataFrame) else len(next(iter(data.values()), ()))
+        namespace = self._namespace(data, length)
+        if not self._compiled:
+            return np.zeros((0, length), dtype=bool)
+        return np.vstack([
+            np.broadcast_to(np.asarray(eval(code, {"__builtins__": {}}, namespace), dtype=bool), (length,))
+            for code in self._compiled
+        ])
+
+    def match(self, data):
+        """
+        Índice da primeira regra verdadeira de cada linha (modo "first")
+
+        Returns:
+            ndarray: Índices; len(rules) quando vale o resultado padrão
+        """
+        masks = self.masks(data)
+        return np.select(list(masks), np.arange(len(masks)), default=len(masks))
+
+    def evaluate(self, data):
+        """
+        Aplica as regras a todas as linhas
+
+        Returns:
+            list: Um resultado por linha; no modo "all", a concatenação dos
+                  resultados das regras verdadeiras (ou o padrão)
+        """
+        if self.mode == "first":
+            outputs = self.outputs + [self.default]
+            return [outputs[index] for index in self.match(data)]
+
+        masks = self.masks(data)
+        results = []
+        for row in masks.T:
+            matched = [item for output, hit in zip(self.outputs, row) if hit for item in output]
+            results.append(matched or list(self.default))
+        return results
+
+    def evaluate_one(self, record):
+        """
+        Aplica as regras a um único registro (dicionário)
+
+        Returns:
+            Resultado da regra (cópia, pode ser alterado pelo chamador)
+        """
+        data = {name: [np.nan if record.get(name) is None else record[name]]
+                for name in self.columns}
+        return copy.deepcopy(self.evaluate(data)[0])
+
+    def categorical(self, data, field, categories, ordered=True, index=None):
+        """
+        Devolve um campo do resultado como coluna categórica (modo "first")
+
+        Args:
+            data: DataFrame ou dicionário de colunas
+            field: Chave/posição do resultado usada como rótulo, ou None
+                   quando o próprio resultado é o rótulo
+            categories: Lista de categorias, na ordem desejada
+            ordered: Se as categorias têm ordem
+            index: Índice da Series (padrão: o do DataFrame)
+
+        Returns:
+            Series: Rótulo categórico de cada linha
+        """
+        outputs = self.outputs + [self.default]
+        labels = [output if field is None else output[field] for output in outputs]
+        lookup = np.array([categories.index(label) for label in labels])
+        codes = lookup[self.match(data)]
+        if index is None and isinstance(data, pd.DataFrame):
+            index = data.index
+        return pd.Series(
+            pd.Categorical.from_codes(codes, categories=categories, ordered=ordered),
+            index=index
+        )
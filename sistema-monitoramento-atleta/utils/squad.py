@@ -0,0 +1,240 @@
+"""
+Análise de equipes: métricas de todos os atletas de um squad de uma vez
+
+Uma única consulta traz a linha do tempo diária (athlete_timeline) de todos
+os membros que aceitaram o convite; como cada atleta tem exatamente uma linha por dia, as cargas
+formam uma matriz atletas x dias e as métricas são calculadas por operações
+vetorizadas e groupby, sem laços por atleta.
+"""
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+from utils.database import query_db, query_df
+from utils.psychological_utils import calculate_psychological_statuses, classify_stress_anxiety
+from utils.rules import RuleSet
+from utils.timeline import TIMELINE_TABLES
+from utils.training_utils import ACUTE_WINDOW_DAYS, CHRONIC_WINDOW_DAYS, classify_acwr
+
+SQUAD_TABLES = TIMELINE_TABLES + ('squad_member', 'athlete_users')
+
+SQUAD_TIMELINE_QUERY = """
+SELECT m.user_id, u.name, t.*
+FROM squad_member m
+JOIN athlete_users u ON u.id = m.user_id
+CROSS JOIN LATERAL athlete_timeline(m.user_id, %s, %s) AS t
+WHERE m.squad_id = %s AND m.status = 'accepted'
+ORDER BY m.user_id, t.date
+"""
+
+# Alertas da equipe: todas as regras verdadeiras entram na lista do atleta
+SQUAD_ALERT_RULES = RuleSet([
+    ("acwr > 1.5", ["ACWR em zona de perigo"]),
+    ("readiness_score < 5", ["Prontidão baixa"]),
+    ("(stress_score + anxiety_score) / 2 >= 6", ["Estresse/ansiedade elevados"]),
+    ("monotony > 2", ["Monotonia elevada"]),
+], default=[], mode="all")
+
+def get_coach_squads(coach_id):
+    return query_db(
+        "SELECT id, name FROM squad WHERE coach_id = %s ORDER BY name",
+        (coach_id,), cache=True, user_id=coach_id
+    )
+
+def create_squad(name, coach_id):
+    query_db("INSERT INTO squad (name, coach_id) VALUES (%s, %s)", (name, coach_id), user_id=coach_id)
+
+def add_squad_member(squad_id, coach_id, email):
+    """
+    Convida um atleta para o squad pelo email
+
+    O atleta só passa a fazer parte da equipe (e a ter seus dados exibidos
+    ao treinador) depois de aceitar o convite em respond_to_invitation.
+
+    Args:
+        squad_id: ID do squad
+        coach_id: ID do treinador; o squad precisa pertencer a ele
+        email: Email do atleta
+
+    Returns:
+        bool: False se não existe atleta com esse email
+    """
+    result = query_db("SELECT id FROM athlete_users WHERE email = %s", (email,))
+    if not result:
+        return False
+    query_db("""
+        INSERT INTO squad_member (squad_id, user_id)
+        SELECT id, %s FROM squad WHERE id = %s AND coach_id = %s
+        ON CONFLICT DO NOTHING
+    """, (result[0]['id'], squad_id, coach_id))
+    return True
+
+def get_pending_invitations(user_id):
+    """
+    Convites de equipe ainda não respondidos pelo atleta
+
+    Returns:
+        list: Dicionários com squad_id, squad (nome) e coach (nome do treinador)
+    """
+    return query_db("""
+        SELECT s.id AS squad_id, s.name AS squad, c.name AS coach
+        FROM squad_member m
+        JOIN squad s ON s.id = m.squad_id
+        JOIN athlete_users c ON c.id = s.coach_id
+        WHERE m.user_id = %s AND m.status = 'pending'
+        ORDER BY m.joined_at
+    """, (user_id,))
+
+def get_athlete_squads(user_id):
+    """
+    Equipes das quais o atleta faz parte (convites aceitos)
+
+    Returns:
+        list: Dicionários com squad_id, squad (nome) e coach (nome do treinador)
+    """
+    return query_db("""
+        SELECT s.id AS squad_id, s.name AS squad, c.name AS coach
+        FROM squad_member m
+        JOIN squad s ON s.id = m.squad_id
+        JOIN athlete_users c ON c.id = s.coach_id
+        WHERE m.user_id = %s AND m.status = 'accepted'
+        ORDER BY s.name
+    """, (user_id,))
+
+def get_pending_members(squad_id):
+    """
+    Nomes dos atletas convidados que ainda não aceitaram
+    """
+    result = query_db("""
+        SELECT u.name FROM squad_member m
+        JOIN athlete_users u ON u.id = m.user_id
+        WHERE m.squad_id = %s AND m.status = 'pending'
+        ORDER BY u.name
+    """, (squad_id,))
+    return [row['name'] for row in result]
+
+def respond_to_invitation(squad_id, user_id, accept):
+    """
+    Aceita ou recusa um convite pendente
+
+    Args:
+        squad_id: ID do squad
+        user_id: ID do atleta convidado
+        accept: True para entrar na equipe, False para recusar
+    """
+    if accept:
+        query_db("""
+            UPDATE squad_member SET status = 'accepted', accepted_at = CURRENT_TIMESTAMP
+            WHERE squad_id = %s AND user_id = %s AND status = 'pending'
+        """, (squad_id, user_id))
+    else:
+        query_db("""
+            DELETE FROM squad_member
+            WHERE squad_id = %s AND user_id = %s AND status = 'pending'
+        """, (squad_id, user_id))
+
+def remove_squad_member(squad_id, user_id):
+    query_db("DELETE FROM squad_member WHERE squad_id = %s AND user_id = %s", (squad_id, user_id))
+
+def get_squad_timeline(squad_id, as_of=None, cache=True):
+    """
+    Lê os últimos 28 dias de todos os atletas do squad em uma consulta
+
+    Só entram os atletas que aceitaram o convite.
+
+    Args:
+        squad_id: ID do squad
+        as_of: Último dia da janela (padrão: hoje)
+        cache: Se True, usa o cache de consultas
+
+    Returns:
+        DataFrame: Linhas de athlete_timeline com user_id e name, ordenadas
+                   por atleta e data
+    """
+    as_of = as_of or date.today()
+    start = as_of - timedelta(days=CHRONIC_WINDOW_DAYS - 1)
+    return query_df(
+        SQUAD_TIMELINE_QUERY,
+        (start, as_of, squad_id),
+        cache=cache,
+        tables=SQUAD_TABLES
+    )
+
+def _latest(frame, athletes, column):
+    # Última linha de cada atleta com `column` preenchida
+    rows = frame[frame[column].notna()].groupby('user_id', sort=False).tail(1)
+    return rows.set_index('user_id').reindex(athletes)
+
+def compute_squad_metrics(timeline):
+    """
+    Calcula as métricas de cada atleta e ordena a equipe por risco
+
+    Args:
+        timeline: Resultado de get_squad_timeline (uma linha por atleta e dia)
+
+    Returns:
+        DataFrame: Uma linha por atleta (índice user_id), da posição 1 (mais
+                   alertas, maior ACWR) em diante
+    """
+    athletes = pd.Index(timeline['user_id'].unique(), name='user_id')
+    if athletes.empty:
+        return pd.DataFrame()
+
+    # Uma linha por dia e por atleta: a carga vira uma matriz atletas x dias
+    loads = timeline['training_load'].to_numpy(dtype=float).reshape(len(athletes), -1)
+    week = loads[:, -ACUTE_WINDOW_DAYS:]
+    acute = week.sum(axis=1)
+    chronic = loads[:, -CHRONIC_WINDOW_DAYS:].sum(axis=1) / (CHRONIC_WINDOW_DAYS / ACUTE_WINDOW_DAYS)
+    acwr = np.divide(acute, chronic, out=np.zeros_like(acute), where=chronic > 0)
+    std = week.std(axis=1)
+    monotony = np.divide(week.mean(axis=1), std, out=np.zeros_like(acute), where=std > 0)
+
+    grouped = timeline.groupby('user_id', sort=False)
+    last_week = timeline['date'] > timeline['date'].max() - pd.Timedelta(days=ACUTE_WINDOW_DAYS)
+    recent = timeline[last_week].groupby('user_id', sort=False)
+
+    readiness = _latest(timeline, athletes, 'readiness_score')
+    psych = _latest(timeline, athletes, 'stress_score')
+
+    squad = pd.DataFrame({
+        'atleta': grouped['name'].first(),
+        'acwr': acwr,
+        'zona_acwr': classify_acwr(pd.Series(acwr, index=athletes)),
+        'carga_aguda': acute,
+        'carga_crônica': chronic,
+        'monotonia': monotony,
+        'strain': acute * monotony,
+        'prontidão_atual': readiness['readiness_score'],
+        'prontidão_7d': recent['readiness_score'].mean(),
+        'tendência_prontidão': recent['readiness_score'].mean() - grouped['readiness_score'].mean(),
+        'fadiga_7d': recent['fatigue_level'].mean(),
+        'status_psicológico': calculate_psychological_statuses(psych).where(psych['stress_score'].notna()),
+        'status_estresse': classify_stress_anxiety(psych).where(psych['stress_score'].notna()),
+    }, index=athletes)
+
+    alert_inputs = {
+        'acwr': acwr,
+        'readiness_score': squad['prontidão_atual'],
+        'stress_score': psych['stress_score'],
+        'anxiety_score': psych['anxiety_score'],
+        'monotony': monotony,
+    }
+    squad['alertas'] = SQUAD_ALERT_RULES.evaluate(alert_inputs)
+    squad['n_alertas'] = SQUAD_ALERT_RULES.masks(alert_inputs).sum(axis=0)
+
+    squad = squad.sort_values(['n_alertas', 'acwr'], ascending=False, kind='stable')
+    squad.insert(0, 'posição', np.arange(1, len(squad) + 1))
+    return squad
+
+def get_squad_table(squad_id, as_of=None, cache=True):
+    """
+    Tabela ordenada com as métricas atuais de todos os atletas do squad
+
+    Args:
+        squad_id: ID do squad
+        as_of: Data de referência (padrão: hoje)
+        cache: Se True, usa o cache de consultas
+
+    Returns:
+        DataFrame: Ver compute_squad_metrics
+    """
+    return compute_squad_metrics(get_squad_timeline(squad_id, as_of, cache))
@@ -0,0 +1,106 @@
+from utils.database import query_df
+
+# A tabela athlete_daily_summary (migrations/003) é mantida por triggers nas
+# tabelas de avaliação; são as escritas nelas que devem invalidar o cache
+SUMMARY_TABLES = ('readiness_assessment', 'training_assessment', 'psychological_assessment')
+
+PERIODS = ('week', 'month')
+
+# Médias exatas a partir de somas e contagens: dias com várias avaliações
+# pesam pelo número de avaliações, como na média das linhas brutas
+_SUMMARY_COLUMNS = """
+    COALESCE(SUM(readiness_n), 0) AS readiness_n,
+    SUM(readiness_score_sum) / NULLIF(SUM(readiness_score_n), 0) AS readiness_score,
+    SUM(sleep_quality_sum) / NULLIF(SUM(sleep_quality_n), 0) AS sleep_quality,
+    SUM(energy_level_sum) / NULLIF(SUM(energy_level_n), 0) AS energy_level,
+    COALESCE(SUM(training_sessions), 0) AS training_sessions,
+    SUM(training_load_sum) AS training_load,
+    SUM(training_duration_sum) AS training_duration,
+    SUM(rpe_sum) / NULLIF(SUM(rpe_n), 0) AS rpe,
+    COALESCE(SUM(psychological_n), 0) AS psychological_n,
+    SUM(stress_score_sum) / NULLIF(SUM(stress_score_n), 0) AS stress_score,
+    SUM(intrinsic_motivation_sum) / NULLIF(SUM(intrinsic_motivation_n), 0) AS intrinsic_motivation,
+    SUM(confidence_level_sum) / NULLIF(SUM(confidence_level_n), 0) AS confidence_level
+"""
+
+SUMMARY_QUERY = f"""
+SELECT {_SUMMARY_COLUMNS}
+FROM athlete_daily_summary
+WHERE user_id = %s AND date BETWEEN %s AND %s
+"""
+
+PERIOD_SUMMARY_QUERY = f"""
+SELECT date_trunc(%s, date)::date AS period_start, {_SUMMARY_COLUMNS}
+FROM athlete_daily_summary
+WHERE user_id = %s AND date BETWEEN %s AND %s
+GROUP BY 1
+ORDER BY 1
+"""
+
+def get_summary_metrics(user_id, start_date, end_date, cache=True):
+    """
+    Calcula as métricas resumidas de um período a partir do resumo diário
+
+    Lê no máximo uma linha pré-agregada por dia, sem percorrer as avaliações.
+
+    Args:
+        user_id: ID do atleta
+        start_date: Data inicial (inclusive)
+        end_date: Data final (inclusive)
+        cache: Se True, usa o cache de consultas
+
+    Returns:
+        dict: Métricas do período; cada domínio só aparece se houver avaliações
+    """
+    df = query_df(
+        SUMMARY_QUERY,
+        (user_id, start_date, end_date),
+        cache=cache,
+        user_id=user_id,
+        tables=SUMMARY_TABLES
+    )
+    row = df.iloc[0]
+    summary = {}
+
+    if row['readiness_n'] > 0:
+        summary['média_prontidão'] = row['readiness_score']
+        summary['média_sono'] = row['sleep_quality']
+        summary['média_energia'] = row['energy_level']
+
+    if row['training_sessions'] > 0:
+        summary['carga_total'] = row['training_load']
+        summary['média_rpe'] = row['rpe']
+        summary['total_minutos'] = row['training_duration']
+
+    if row['psychological_n'] > 0:
+        summary['média_estresse'] = row['stress_score']
+        summary['média_motivação'] = row['intrinsic_motivation']
+        summary['média_confiança'] = row['confidence_level']
+
+    return summary
+
+def get_period_summary(user_id, start_date, end_date, period='week', cache=True):
+    """
+    Agrega o resumo diário por semana ou mês
+
+    Args:
+        user_id: ID do atleta
+        start_date: Data inicial (inclusive)
+        end_date: Data final (inclusive)
+        period: 'week' (semanas iniciando na segunda-feira) ou 'month'
+        cache: Se True, usa o cache de consultas
+
+    Returns:
+        DataFrame: Uma linha por período com dados, indexada por 'period_start'
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Período desconhecido: {period}")
+
+    df = query_df(
+        PERIOD_SUMMARY_QUERY,
+        (period, user_id, start_date, end_date),
+        cache=cache,
+        user_id=user_id,
+        tables=SUMMARY_TABLES
+    )
+    return df.set_index('period_start')
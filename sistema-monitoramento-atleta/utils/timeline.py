@@ -0,0 +1,30 @@
+from utils.database import query_df
+
+# Tabelas lidas pela função athlete_timeline (migrations/002), usadas para invalidar o cache
+TIMELINE_TABLES = ('readiness_assessment', 'training_assessment', 'psychological_assessment')
+
+TIMELINE_QUERY = "SELECT * FROM athlete_timeline(%s, %s, %s)"
+
+def get_athlete_timeline(user_id, start_date, end_date, cache=True):
+    """
+    Obtém a linha do tempo diária do atleta em uma única consulta
+
+    Cada dia do intervalo aparece uma vez, com as métricas de prontidão,
+    treino e psicológicas já alinhadas pela data.
+
+    Args:
+        user_id: ID do atleta
+        start_date: Data inicial (inclusive)
+        end_date: Data final (inclusive)
+        cache: Se True, usa o cache de consultas
+
+    Returns:
+        DataFrame: Uma linha por dia, com a coluna 'date' em datetime64
+    """
+    return query_df(
+        TIMELINE_QUERY,
+        (user_id, start_date, end_date),
+        cache=cache,
+        user_id=user_id,
+        tables=TIMELINE_TABLES
+    )
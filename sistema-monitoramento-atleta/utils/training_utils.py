@@ -1,3 +1,46 @@
+from utils.rules import RuleSet
+
+# Janelas do ACWR: carga aguda (7 dias) contra a média semanal dos últimos 28 dias
+ACUTE_WINDOW_DAYS = 7
+CHRONIC_WINDOW_DAYS = 28
+
+# Decaimentos do ACWR por EWMA (Williams et al., 2017): lambda = 2 / (N + 1)
+EWMA_ACUTE_LAMBDA = 2 / (ACUTE_WINDOW_DAYS + 1)
+EWMA_CHRONIC_LAMBDA = 2 / (CHRONIC_WINDOW_DAYS + 1)
+
+ACWR_ZONES = ["Subcarga", "Zona Segura", "Zona de Alerta", "Zona de Perigo"]
+
+# Zonas do ACWR; ACWR ausente (NaN) cai na zona de perigo, como na cadeia original
+ACWR_RULES = RuleSet([
+    ("acwr < 0.8", ("Subcarga",
+        "O atleta está em subcarga. Considere aumentar gradualmente a intensidade dos treinos.")),
+    ("(acwr >= 0.8) & (acwr <= 1.3)", ("Zona Segura",
+        "O atleta está em uma zona segura de carga. Continue com o planejamento atual.")),
+    ("(acwr > 1.3) & (acwr <= 1.5)", ("Zona de Alerta",
+        "O atleta está entrando em uma zona de risco. Monitore de perto e considere reduzir a carga.")),
+], default=("Zona de Perigo",
+    "Risco elevado de lesão. Reduza a carga imediatamente e implemente recuperação ativa."))
+
+NEXT_TRAINING_RULES = RuleSet([
+    ("(readiness_score < 5) | (fatigue_level > 7)", {
+        "tipo": "Recuperação",
+        "intensidade": "Z1 - Recuperação",
+        "duração": 30,
+        "observações": "Foco em recuperação devido à fadiga elevada"
+    }),
+    ("readiness_score >= 8", {
+        "tipo": "Intenso",
+        "intensidade": "Z4 - Limiar",
+        "duração": 75,
+        "observações": "Bom momento para treino de alta intensidade"
+    }),
+], default={
+    "tipo": "Normal",
+    "intensidade": "Z3 - Moderado",
+    "duração": 60,
+    "observações": "Manter intensidade moderada para desenvolvimento"
+}, defaults={'readiness_score': 7, 'fatigue_level': 5})
+
 def calculate_training_load(duration, rpe):
     """
     Calcula a carga de treino usando o método RPE de Foster
@@ -69,18 +112,20 @@ def interpret_acwr(acwr):
     Returns:
         tuple: (status, recomendação)
     """
-    if acwr < 0.8:
-        return ("Subcarga", 
-                "O atleta está em subcarga. Considere aumentar gradualmente a intensidade dos treinos.")
-    elif 0.8 <= acwr <= 1.3:
-        return ("Zona Segura", 
-                "O atleta está em uma zona segura de carga. Continue com o planejamento atual.")
-    elif 1.3 < acwr <= 1.5:
-        return ("Zona de Alerta", 
-                "O atleta está entrando em uma zona de risco. Monitore de perto e considere reduzir a carga.")
-    else:
-        return ("Zona de Perigo", 
-                "Risco elevado de lesão. Reduza a carga imediatamente e implemente recuperação ativa.")
+    return ACWR_RULES.evaluate_one({'acwr': acwr})
+
+def classify_acwr(acwr):
+    """
+    Versão vetorizada da zona de interpret_acwr
+
+    Args:
+        acwr: Series ou array de valores de ACWR
+
+    Returns:
+        Series: Zona categórica ordenada (ACWR_ZONES)
+    """
+    index = acwr.index if hasattr(acwr, 'index') else None
+    return ACWR_RULES.categorical({'acwr': acwr}, 0, ACWR_ZONES, index=index)
 
 def calculate_monotony(training_data):
     """
@@ -180,27 +225,4 @@ def suggest_next_training(recent_data):
             "observações": "Começar com intensidade moderada para avaliação"
         }
     
-    readiness = recent_data.get('readiness_score', 7)
-    fatigue = recent_data.get('fatigue_level', 5)
-    
-    if readiness < 5 or fatigue > 7:
-        return {
-            "tipo": "Recuperação",
-            "intensidade": "Z1 - Recuperação",
-            "duração": 30,
-            "observações": "Foco em recuperação devido à fadiga elevada"
-        }
-    elif readiness >= 8:
-        return {
-            "tipo": "Intenso",
-            "intensidade": "Z4 - Limiar",
-            "duração": 75,
-            "observações": "Bom momento para treino de alta intensidade"
-        }
-    else:
-        return {
-            "tipo": "Normal",
-            "intensidade": "Z3 - Moderado",
-            "duração": 60,
-            "observações": "Manter intensidade moderada para desenvolvimento"
-        }
+    return NEXT_TRAINING_RULES.evaluate_one(recent_data)
@@ -1,6 +1,4 @@
 import pandas as pd
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 
 def plot_weekly_metrics(df, date_column, metrics, titles):
     """
@@ -12,6 +10,10 @@ def plot_weekly_metrics(df, date_column, metrics, titles):
         metrics: Lista de colunas de métricas para plotar
         titles: Lista de títulos para cada métrica
     """
+    # plotly é importado na primeira chamada, não ao carregar as páginas
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
     df[date_column] = pd.to_datetime(df[date_column])
     weekly_data = df.resample('W', on=date_column)[metrics].mean()
     
@@ -42,6 +44,8 @@ def create_correlation_heatmap(df, columns, labels):
         columns: Lista de colunas para correlação
         labels: Lista de rótulos para as colunas
     """
+    import plotly.graph_objects as go
+    
     corr_matrix = df[columns].corr()
     
     fig = go.Figure(data=go.Heatmap(
@@ -68,6 +72,8 @@ def plot_training_distribution(df, type_column='training_type'):
         df: DataFrame com os dados
         type_column: Nome da coluna com os tipos de treino
     """
+    import plotly.graph_objects as go
+    
     training_dist = df[type_column].value_counts()
     
     fig = go.Figure(data=[go.Pie(
@@ -89,6 +95,8 @@ def plot_readiness_components(df):
     Args:
         df: DataFrame com os dados mais recentes de prontidão
     """
+    import plotly.graph_objects as go
+    
     components = [
         'sleep_quality', 'sleep_duration', 'stress_level',
         'muscle_soreness', 'energy_level', 'motivation',
@@ -123,6 +131,8 @@ def plot_psychological_profile(df):
     Args:
         df: DataFrame com os dados psicológicos mais recentes
     """
+    import plotly.graph_objects as go
+    
     components = [
         'confidence_level', 'focus_ability', 'emotional_state',
         'intrinsic_motivation', 'flow_score', 'team_cohesion'
@@ -158,6 +168,8 @@ def plot_training_load_trend(df, date_column='date', load_column='training_load'
         date_column: Nome da coluna de data
         load_column: Nome da coluna de carga
     """
+    import plotly.graph_objects as go
+    
     df[date_column] = pd.to_datetime(df[date_column])
     
     fig = go.Figure()